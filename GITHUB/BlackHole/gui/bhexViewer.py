@@ -1,20 +1,39 @@
 # --- BlackHole .bhex Inspector Suite ---
 # Version: 4.2
 # Adds FFT-style entropy summary and symbol analysis
+# Reads binary (v2), streaming (BHXS) and JSON .bhex packages.
+# Run from the project root with:  python -m gui.bhexViewer
 
 import tkinter as tk
 from tkinter import filedialog, messagebox, ttk
 from tkinter.scrolledtext import ScrolledText
+import io
 import json
-import statistics
 import base64
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from Crypto.Cipher import AES
-from Crypto.Util.Padding import unpad
-import hashlib
 import os
-from collections import Counter
+
+from src.utils.drift_model import compute_drift_vector
+from src.utils.entropy_tools import CipherMetrics, iter_chunks, score_chunks
+from src.utils.package_utils import FORMAT_BINARY, FORMAT_STREAM, detect_format, open_bhex, read_binary_envelope, read_stream
+
+def cipher_bytes(cipher):
+    # Binary packages hand over a memoryview; JSON packages carry base64 text
+    return cipher if isinstance(cipher, memoryview) else base64.b64decode(cipher)
+
+def open_stream_package(raw, password):
+    """
+    Verify and decrypt every chunk of a streaming container and merge them
+    into one package view (cipher text joined, shift logs concatenated).
+    """
+    ciphers, shift_log, chunks = [], [], 0
+    for payload in read_stream(io.BytesIO(raw), password):
+        chunk = json.loads(payload)
+        ciphers.append(chunk.get("sep", "") + chunk["cipher"])
+        shift_log.extend(chunk.get("shift_log", []))
+        chunks += 1
+    return {"format": "stream", "chunks": chunks, "cipher": "".join(ciphers), "shift_log": shift_log}
 
 class BhexInspector:
     def __init__(self, root):
@@ -39,14 +58,29 @@ class BhexInspector:
         self.load_button.pack(pady=5)
 
         self.current_data = None
+        self.current_raw = None
 
     def load_bhex(self):
         file_path = filedialog.askopenfilename(filetypes=[("BlackHole Encrypted Files", "*.bhex")])
         if not file_path:
             return
         try:
-            with open(file_path, 'r') as f:
-                data = json.load(f)
+            with open(file_path, 'rb') as f:
+                raw = f.read()
+            fmt = detect_format(raw[:4])
+            if fmt == FORMAT_STREAM:
+                # Every chunk is encrypted and authenticated on its own; the stats cover the whole container
+                data = {"iv": "per chunk", "hmac": "per chunk", "cipher": memoryview(raw),
+                        "metadata": {"format": "stream (BHXS)", "size": f"{len(raw)} bytes",
+                                     "note": "Shift log and symbols are encrypted per chunk; use the Decrypt tab."}}
+            elif fmt == FORMAT_BINARY:
+                # Header fields only; the ciphertext stays a view into `raw`
+                envelope = read_binary_envelope(raw)
+                data = {"iv": envelope["iv"], "cipher": envelope["cipher"], "hmac": envelope["hmac"],
+                        "metadata": {"format": f"binary v{envelope['version']}", "size": f"{len(raw)} bytes"}}
+            else:
+                data = json.loads(raw)
+            self.current_raw = raw
             self.current_data = data
 
             self.display_metadata(data.get("metadata"))
@@ -88,10 +122,12 @@ class BhexInspector:
             return
         box.insert(tk.END, f"Length: {len(shift_log)}\n")
         try:
-            avg = round(statistics.mean(shift_log), 2)
-            stddev = round(statistics.stdev(shift_log), 2) if len(shift_log) > 1 else 0
-            drift_range = max(shift_log) - min(shift_log)
-            box.insert(tk.END, f"Average Drift: {avg}\nVolatility: {stddev}\nSpread: {drift_range}\n\n")
+            drift = compute_drift_vector(shift_log)
+            rolling = drift["rolling"]
+            box.insert(tk.END, f"Average Drift: {round(drift['mean'], 2)}\nVolatility: {round(drift['volatility'], 2)}\n"
+                               f"Spread: {drift['spread']}\n"
+                               f"Peak Rolling Volatility ({rolling['window']}): {round(float(rolling['volatility'].max()), 2)}\n"
+                               f"Drift Bar: {drift['drift_bar'][:120]}\n\n")
         except:
             pass
         box.insert(tk.END, f"Shift Values:\n{shift_log}")
@@ -115,10 +151,11 @@ class BhexInspector:
         box.delete("1.0", tk.END)
         iv_present = 'iv' in data
         hmac_present = 'hmac' in data
-        cipher_len = len(data.get("cipher", ""))
+        cipher = data.get("cipher", "")
+        unit = "bytes" if isinstance(cipher, memoryview) else "characters"
         box.insert(tk.END, f"IV Present: {'Yes' if iv_present else 'No'}\n")
         box.insert(tk.END, f"HMAC Present: {'Yes' if hmac_present else 'No'}\n")
-        box.insert(tk.END, f"Ciphertext Length: {cipher_len} characters\n")
+        box.insert(tk.END, f"Ciphertext Length: {len(cipher)} {unit}\n")
 
     def display_cipher_stats(self, cipher):
         box = self.tabs["Cipher Tools"]
@@ -127,15 +164,16 @@ class BhexInspector:
             box.insert(tk.END, "[!] No ciphertext present.")
             return
         try:
-            raw = base64.b64decode(cipher)
-            byte_freq = {b: raw.count(b) for b in set(raw)}
-            unique_bytes = len(byte_freq)
-            entropy_est = round(statistics.stdev(raw), 2) if len(raw) > 1 else 0
-            box.insert(tk.END, f"Unique Bytes: {unique_bytes}\nEstimated Byte-Level StdDev: {entropy_est}\n\n")
+            metrics = CipherMetrics(compression=False)
+            for chunk in iter_chunks(cipher_bytes(cipher)):
+                metrics.update(chunk)
+            stats = metrics.result()
+            box.insert(tk.END, f"Unique Bytes: {stats['distinct_bytes']}\nEstimated Byte-Level StdDev: {round(stats['byte_stddev'], 2)}\n\n")
             box.insert(tk.END, "Byte Frequency Snapshot (top 10):\n")
-            top_bytes = sorted(byte_freq.items(), key=lambda x: x[1], reverse=True)[:10]
-            for b, count in top_bytes:
-                box.insert(tk.END, f"Byte {b}: {count}\n")
+            counts = metrics.histogram.result().tolist()
+            top_bytes = sorted((b for b in range(256) if counts[b]), key=lambda b: counts[b], reverse=True)[:10]
+            for b in top_bytes:
+                box.insert(tk.END, f"Byte {b}: {counts[b]}\n")
         except Exception as e:
             box.insert(tk.END, f"Error decoding cipher: {e}")
 
@@ -146,17 +184,16 @@ class BhexInspector:
             box.insert(tk.END, "[!] No ciphertext to analyze.")
             return
         try:
-            text = base64.b64decode(cipher).decode('utf-8', errors='ignore')
-            counter = Counter(text)
-            total = sum(counter.values())
-            entropy = -sum((freq / total) * (statistics.log(freq / total, 2)) for freq in counter.values())
-            unique = len(counter)
-            skew = round(max(counter.values()) / (total / unique), 2) if unique else 0
-            box.insert(tk.END, f"Word Count: ~{len(text.split())}\n")
-            box.insert(tk.END, f"Symbol Count: {total}\n")
-            box.insert(tk.END, f"Unique Symbols: {unique}\n")
-            box.insert(tk.END, f"Shannon Entropy: {round(entropy, 4)}\n")
-            box.insert(tk.END, f"Symbol Frequency Skew: {skew}\n")
+            # Byte-level scores over the real ciphertext, in one streaming pass
+            raw = cipher_bytes(cipher)
+            stats = score_chunks(iter_chunks(raw))
+            box.insert(tk.END, f"Word Count: ~{len(bytes(raw).split())}\n")
+            box.insert(tk.END, f"Symbol Count: {stats['bytes']}\n")
+            box.insert(tk.END, f"Unique Symbols: {stats['distinct_bytes']}\n")
+            box.insert(tk.END, f"Shannon Entropy: {round(stats['entropy'], 4)}\n")
+            box.insert(tk.END, f"Symbol Frequency Skew: {round(stats['peak_ratio'], 2)}\n")
+            box.insert(tk.END, f"Bit Balance: {round(stats['bit_ratio'], 4)} | Runs: {stats['bit_runs']}\n")
+            box.insert(tk.END, f"Compression Ratio: {round(stats['compression_ratio'], 3)}\n")
         except Exception as e:
             box.insert(tk.END, f"Error in entropy analysis: {e}")
 
@@ -173,19 +210,20 @@ class BhexInspector:
 
         def attempt():
             try:
-                key = hashlib.sha256(entry.get().encode()).digest()
-                iv = base64.b64decode(self.current_data["iv"])
-                ct = base64.b64decode(self.current_data["cipher"])
-                cipher = AES.new(key, AES.MODE_CBC, iv)
-                pt = unpad(cipher.decrypt(ct), AES.block_size)
-                decrypted = json.loads(pt.decode('utf-8'))
+                if detect_format(self.current_raw[:4]) == FORMAT_STREAM:
+                    decrypted = open_stream_package(self.current_raw, entry.get())
+                    summary = {"format": "stream", "chunks": decrypted["chunks"], "cipher_characters": len(decrypted["cipher"])}
+                else:
+                    decrypted = open_bhex(self.current_raw, entry.get())
+                    summary = {k: v for k, v in decrypted.items() if k not in ("shift_log", "symbol_table")}
+                shift_log = [int(s) for s in decrypted.get("shift_log", [])]
 
-                messagebox.showinfo("Decrypted", pt.decode('utf-8'))
+                messagebox.showinfo("Decrypted", json.dumps(summary, indent=2, ensure_ascii=False))
 
                 self.display_key_profile(decrypted.get("key_profile"))
-                self.display_shift_log(decrypted.get("shift_log"))
+                self.display_shift_log(shift_log)
                 self.display_oracle_log(decrypted.get("subconscious"), decrypted.get("fusion_metadata"))
-                self.plot_drift(decrypted.get("shift_log"))
+                self.plot_drift(shift_log)
 
             except Exception as e:
                 messagebox.showerror("Decryption Failed", str(e))
@@ -2,24 +2,88 @@
 """
 BlackHole Launcher Script
 This script allows CLI-based encryption and decryption of messages using the V6 engine.
+`main.py batch` processes whole directories across a process pool.
 """
 
 import argparse
+import json
+import time
 from src import blackhole_v6
+from src.utils.trace import JsonLinesSink, set_debug, tracer
 
-parser = argparse.ArgumentParser(description="BlackHole Encryption CLI Tool")
-parser.add_argument('--mode', choices=['encrypt', 'decrypt'], required=True, help="Mode to run: encrypt or decrypt")
-parser.add_argument('--message', type=str, help="Plaintext or .bhex file path depending on mode")
-parser.add_argument('--password', type=str, required=True, help="Password for encryption/decryption")
+def run_batch_command(args):
+    from src import blackhole_batch
 
-args = parser.parse_args()
+    results = []
+    started = time.perf_counter()
+    for result in blackhole_batch.run_batch(args.in_dir, args.out_dir, args.mode, args.password,
+                                            workers=args.workers, max_in_flight=args.max_in_flight,
+                                            state_dir=args.state_dir, debug=args.debug, state_mode=args.state):
+        results.append(result)
+        # Same MB/s as the stage benchmark: bytes / 2**20 / seconds
+        mb_per_sec = result['bytes'] / (1 << 20) / result['seconds'] if result['seconds'] > 0 else 0.0
+        line = (f"[{result['status'].upper()}] {result['src']} -> {result['dst']} "
+                f"({result['bytes']} B, {result['seconds'] * 1000:.1f} ms, {mb_per_sec:.3f} MB/s)")
+        if result["error"]:
+            line += f" {result['error']}"
+        print(line)
+    summary = blackhole_batch.summarize(results, time.perf_counter() - started)
 
-if args.mode == 'encrypt':
-    result = blackhole_v6.encrypt_message(args.message, args.password)
-    print("\n[Encrypted Output]\n", result)
+    print("\n[Batch Summary]")
+    print(f"Files:      {summary['succeeded']}/{summary['files']} ok, {summary['failed']} failed")
+    print(f"Bytes:      {summary['bytes']}")
+    print(f"Elapsed:    {summary['elapsed']} s")
+    print(f"Throughput: {summary['files_per_sec']} files/s | {summary['mb_per_sec']} MB/s")
+    return 1 if summary["failed"] else 0
 
-elif args.mode == 'decrypt':
-    with open(args.message, 'r') as f:
-        bhex_data = f.read()
-    result = blackhole_v6.decrypt_message(bhex_data, args.password)
-    print("\n[Decrypted Output]\n", result)
\ No newline at end of file
+# Guarded so process-pool workers can re-import this module safely
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="BlackHole Encryption CLI Tool")
+    parser.add_argument('--mode', choices=['encrypt', 'decrypt'], help="Mode to run: encrypt or decrypt")
+    parser.add_argument('--message', type=str, help="Plaintext or .bhex file path depending on mode")
+    parser.add_argument('--password', type=str, help="Password for encryption/decryption")
+    parser.add_argument('--out', type=str, help="Encrypt mode: write a binary .bhex package here instead of printing JSON")
+    parser.add_argument('--debug', action='store_true', help="Print engine debug messages and stage timings")
+    parser.add_argument('--trace', type=str, help="Append engine trace records (JSON lines) to this file")
+
+    commands = parser.add_subparsers(dest='command')
+    batch = commands.add_parser('batch', help="Encrypt or decrypt every file in a directory")
+    batch.add_argument('--mode', choices=['encrypt', 'decrypt'], default='encrypt', help="Batch direction (default: encrypt)")
+    batch.add_argument('--in', dest='in_dir', required=True, help="Input directory (walked recursively)")
+    batch.add_argument('--out', dest='out_dir', required=True, help="Output directory; the input layout is mirrored")
+    batch.add_argument('--password', type=str, required=True, help="Password for encryption/decryption")
+    batch.add_argument('--workers', type=int, default=None, help="Worker processes (default: CPU count)")
+    batch.add_argument('--max-in-flight', type=int, default=None, help="Files queued on the pool at once (default: 4 per worker)")
+    batch.add_argument('--state', choices=['shared', 'per-worker'], default='shared', help="Oracle/parasite state: one state daemon for all workers, or separate files per worker")
+    batch.add_argument('--state-dir', type=str, default=None, help="Oracle/parasite state location (default: OUT/.blackhole_state)")
+    # SUPPRESS keeps `main.py --debug batch ...` working: an unset sub-flag must not reset the top-level one
+    batch.add_argument('--debug', action='store_true', default=argparse.SUPPRESS, help="Print engine debug messages and stage timings from the workers")
+
+    args = parser.parse_args()
+    if args.trace:
+        tracer.add_sink(JsonLinesSink(args.trace))
+    if args.debug and args.command != 'batch':
+        set_debug(True)
+
+    if args.command == 'batch':
+        raise SystemExit(run_batch_command(args))
+
+    if not args.mode or not args.password:
+        parser.error("--mode and --password are required")
+
+    engine = blackhole_v6.Engine(package_format=blackhole_v6.FORMAT_BINARY if args.out else blackhole_v6.FORMAT_JSON)
+
+    if args.mode == 'encrypt':
+        if args.out:
+            with open(args.out, 'wb') as f:
+                f.write(engine.encrypt(args.message, args.password))
+            print(f"\n[Encrypted Output] saved to {args.out}")
+        else:
+            result = json.dumps(engine.encrypt(args.message, args.password))
+            print("\n[Encrypted Output]\n", result)
+
+    elif args.mode == 'decrypt':
+        with open(args.message, 'rb') as f:
+            bhex_data = f.read()
+        result = engine.decrypt(bhex_data, args.password)
+        print("\n[Decrypted Output]\n", result)
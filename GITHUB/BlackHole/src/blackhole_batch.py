@@ -0,0 +1,182 @@
+# src/blackhole_batch.py
+"""
+BlackHole batch runner.
+Fans the files of a directory across a process pool so one launch can
+encrypt or decrypt thousands of documents. Each worker process builds its
+Engine once. Oracle/parasite state is either owned by a state daemon the
+driver runs for the batch ("shared", the default) or kept in separate files
+per worker ("per-worker").
+"""
+
+import os
+import sys
+import tempfile
+import time
+from multiprocessing.util import Finalize
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, as_completed, wait
+
+from src import blackhole_v6
+from src.state_daemon import StateClient, StateDaemon
+from src.utils.parasite_state import flush_parasite_states
+from src.utils.trace import set_debug, span
+
+BHEX_SUFFIX = ".bhex"
+PLAIN_SUFFIX = ".txt"
+STATE_DIR_NAME = ".blackhole_state"
+STATE_SHARED = "shared"
+STATE_PER_WORKER = "per-worker"
+# Inputs larger than this go through the chunked streaming container
+STREAM_THRESHOLD = 4 * blackhole_v6.STREAM_CHUNK_CHARS
+
+_engine = None
+
+# === Job Planning ===
+def output_path(rel_path, mode):
+    """
+    Deterministic output name for an input path relative to --in:
+    encrypt appends .bhex; decrypt strips it (or appends .txt if absent).
+    """
+    if (mode == "encrypt"):
+        return rel_path + BHEX_SUFFIX
+    if (rel_path.endswith(BHEX_SUFFIX)):
+        return rel_path[:-len(BHEX_SUFFIX)]
+    return rel_path + PLAIN_SUFFIX
+
+def iter_jobs(in_dir, out_dir, mode):
+    """
+    Yield (src, dst) pairs for every file under in_dir in sorted order.
+    Decrypt mode only picks up .bhex files. out_dir is skipped if nested.
+    """
+    out_root = os.path.abspath(out_dir)
+    for root, dirs, files in os.walk(in_dir):
+        dirs[:] = sorted(d for d in dirs if d != STATE_DIR_NAME and os.path.abspath(os.path.join(root, d)) != out_root)
+        for name in sorted(files):
+            if (mode == "decrypt" and not name.endswith(BHEX_SUFFIX)):
+                continue
+            src = os.path.join(root, name)
+            rel_path = os.path.relpath(src, in_dir)
+            yield src, os.path.join(out_dir, output_path(rel_path, mode))
+
+
+# === Worker Side ===
+def _init_worker(state_dir, debug, daemon_address=None, authkey=None):
+    global _engine
+    if (debug):
+        set_debug(True)
+    # Pool workers skip atexit hooks, so state is flushed by Finalize on worker exit
+    if (daemon_address):
+        client = StateClient(daemon_address, authkey=authkey)
+        _engine = blackhole_v6.Engine(state=client)
+        Finalize(None, client.close, exitpriority=10)
+        return
+    os.makedirs(state_dir, exist_ok=True)
+    pid = os.getpid()
+    _engine = blackhole_v6.Engine(
+        oracle_path=os.path.join(state_dir, f"oracle_memory.{pid}.db"),
+        parasite_path=os.path.join(state_dir, f"parasite_memory.{pid}.json")
+    )
+    Finalize(None, flush_parasite_states, exitpriority=10)
+
+def process_file(mode, src, dst, key):
+    """
+    Encrypt or decrypt one file in the worker's Engine.
+    Returns a status dict; errors are reported, not raised.
+    """
+    started = time.perf_counter()
+    result = {"src": src, "dst": dst, "status": "ok", "bytes": 0, "seconds": 0.0, "error": None}
+    try:
+        result["bytes"] = os.path.getsize(src)
+        os.makedirs(os.path.dirname(dst) or ".", exist_ok=True)
+        tmp_path = dst + ".part"
+        if (mode == "decrypt"):
+            _engine.decrypt_file(src, tmp_path, key)
+        elif (result["bytes"] > STREAM_THRESHOLD):
+            _engine.encrypt_file(src, tmp_path, key)
+        else:
+            with span("io", op="read", path=src), open(src, "r", encoding="utf-8") as f:
+                text = f.read()
+            package = _engine.encrypt(text, key)
+            with span("io", op="write", path=tmp_path), open(tmp_path, "wb") as f:
+                f.write(package)
+        os.replace(tmp_path, dst)
+    except Exception as e:
+        result["status"] = "failed"
+        result["error"] = f"{type(e).__name__}: {e}"
+        if (os.path.exists(dst + ".part")):
+            os.remove(dst + ".part")
+    result["seconds"] = time.perf_counter() - started
+    return result
+
+
+# === Driver ===
+def _daemon_address():
+    if (sys.platform == "win32"):
+        return rf"\\.\pipe\blackhole_state_{os.getpid()}"
+    # Kept short: Unix socket paths are limited to ~100 bytes
+    return os.path.join(tempfile.gettempdir(), f"blackhole_state_{os.getpid()}.sock")
+
+def run_batch(in_dir, out_dir, mode, key, workers=None, max_in_flight=None, state_dir=None, debug=False, state_mode=STATE_SHARED):
+    """
+    Process every file under in_dir, yielding one status dict per file as
+    it completes. At most max_in_flight files (default 4 per worker) are
+    queued on the pool at once, so huge directories are never fully submitted.
+    """
+    if (mode not in ("encrypt", "decrypt")):
+        raise ValueError(f"Unknown batch mode: {mode}")
+    if (not key):
+        raise ValueError("Encryption key is required.")
+    if (not os.path.isdir(in_dir)):
+        raise ValueError(f"Input directory not found: {in_dir}")
+    if (state_mode not in (STATE_SHARED, STATE_PER_WORKER)):
+        raise ValueError(f"Unknown state mode: {state_mode}")
+
+    workers = workers or os.cpu_count() or 1
+    max_in_flight = max_in_flight or workers * 4
+    state_dir = state_dir or os.path.join(out_dir, STATE_DIR_NAME)
+    jobs = iter_jobs(in_dir, out_dir, mode)
+
+    daemon = None
+    initargs = (state_dir, debug)
+    if (state_mode == STATE_SHARED and mode == "encrypt"):
+        os.makedirs(state_dir, exist_ok=True)
+        authkey = os.urandom(16)
+        daemon = StateDaemon(
+            _daemon_address(),
+            oracle_path=os.path.join(state_dir, "oracle_memory.db"),
+            parasite_path=os.path.join(state_dir, "parasite_memory.json"),
+            authkey=authkey
+        )
+        daemon.start()
+        initargs = (state_dir, debug, daemon.address, authkey)
+
+    try:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=initargs) as pool:
+            pending = set()
+            for src, dst in jobs:
+                pending.add(pool.submit(process_file, mode, src, dst, key))
+                if (len(pending) >= max_in_flight):
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield future.result()
+            for future in as_completed(pending):
+                yield future.result()
+    finally:
+        # The pool has joined its workers (and their final state commits) here
+        if (daemon):
+            daemon.stop()
+
+def summarize(results, elapsed):
+    """
+    Totals and throughput for a finished batch.
+    """
+    ok = [r for r in results if r["status"] == "ok"]
+    total_bytes = sum(r["bytes"] for r in ok)
+    return {
+        "files": len(results),
+        "succeeded": len(ok),
+        "failed": len(results) - len(ok),
+        "bytes": total_bytes,
+        "elapsed": round(elapsed, 3),
+        "files_per_sec": round(len(ok) / elapsed, 2) if elapsed else 0.0,
+        "mb_per_sec": round(total_bytes / elapsed / 1e6, 3) if elapsed else 0.0
+    }
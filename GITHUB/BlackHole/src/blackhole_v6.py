@@ -0,0 +1,1260 @@
+# src/blackhole_v6.py
+"""
+BlackHole OS V6 headless engine.
+Holds the full encryption pipeline (fusion, AxiomCore, blur, foam, fractal,
+oracle/parasite memory and .bhex packaging) with no GUI dependencies, so it
+can be imported by the CLI, the Tk front-end and server workers alike.
+"""
+
+import codecs
+import hashlib
+import io
+import json
+import os
+import random
+import threading
+import time
+
+import numpy as np
+
+from src.fusion_branches.pipeline import FusionBuffers, run_fusion
+from src.utils.axiom_codec import (
+    ALPHABET,
+    SYMBOL_WIDTH,
+    UNKNOWN_INDEX,
+    SessionPool,
+    SharedLog,
+    build_symbol_table,
+    pack_symbol_table,
+    pool_codepoints,
+    symbol_codepoints,
+    symbol_from_index,
+    unpack_symbol_table,
+)
+from src.utils.drift_model import drift_bar as format_drift_bar, drift_spread, drift_total
+from src.utils.key_context import DEFAULT_KDF, DriftKey, encryption_context
+from src.utils.oracle_store import get_oracle_store
+from src.utils.parasite_state import get_parasite_state
+from src.utils.trace import log_debug, span, tracer
+from src.utils.package_utils import (
+    FORMAT_BINARY,
+    FORMAT_JSON,
+    FORMAT_STREAM,
+    detect_format,
+    open_bhex,
+    read_stream,
+    seal_binary,
+    seal_package,
+    write_stream,
+)
+
+ORACLE_MEMORY_PATH = "oracle_memory.db"  # a legacy oracle_memory.json is migrated on first use
+ORACLE_WINDOW = 5  # runs read back per encryption (bias: 5, rotor C / CHARLIE: 3)
+PARASITE_MEMORY_PATH = "parasite_memory.json"
+
+
+# === B3.3 Proof Constrained Mapping Implementation ===
+def logic_assert(condition, message, fallback_logic=None):
+    """
+    Triggers logic path redirect or mutation if a rule constraint fails.
+    If fallback_logic is given, switch logic strategy mid-execution.
+    """
+    if not condition:
+        log_debug("[B3.3 ERROR BENDING] Logic assertion failed: %s", message)
+        if (fallback_logic == "reverse_entropy"):
+            log_debug("[B3.3] Switching to reverse entropy logic.")
+            return "REVERSE"
+        elif (fallback_logic == "phantom_layer"):
+            log_debug("[B3.3] Injecting phantom logic layer.")
+            return "PHANTOM"
+        elif (fallback_logic == "skip_segment"):
+            log_debug("[B3.3] Skipping corrupt message segment.")
+            return "SKIP"
+        else:
+            log_debug("[B3.3] No fallback provided. Defaulting to soft exit.")
+            return "FAIL"
+    return "OK"
+
+
+# === B2.4 Boundary Blur Logic Implementation ===
+# Retroactive Logic Fracture and Phantom Operator Injection
+# Shifts are compared as residues mod 26, the rotation they actually apply.
+# The old 25000 cut-off was hit a few terms into the raw Fibonacci values;
+# the top residue is reached just as early in the residue table.
+BLUR_THRESHOLD = 25
+
+def inject_boundary_blur(message, shift_log, threshold=BLUR_THRESHOLD, fallback_branch="cubed_vowel"):
+    """
+    Checks for excessive entropy or shift values and retroactively mutates part of the message
+    using a fallback branch logic like B1.1 (Cubed Vowel Logic).
+    """
+    blur_triggered = False
+    max_shift = int((np.asarray(shift_log, dtype=np.int64) % 26).max()) if len(shift_log) else 0
+
+    if (max_shift >= threshold):
+        blur_triggered = True
+        midpoint = len(message) // 2
+        prefix = message[:midpoint]
+        suffix = message[midpoint:]
+
+        # Apply Cubed Vowel Logic as fallback mutation
+        vowel = find_first_vowel(prefix)
+        y = get_cube_from_vowel(vowel) or 1
+        cube_mod = 3  # default for fallback
+        new_shifted = []
+
+        for i, c in enumerate(prefix):
+            cube_value = (y + i + 1) ** 3
+            shift_val = apply_shift_formula(cube_value, cube_mod)
+            new_shifted.append(shift_char(c, shift_val))
+
+        message = ''.join(new_shifted) + suffix
+
+    return message, blur_triggered
+
+
+# === Quantum Foam Drift Module for BlackHole OS V6 ===
+FOAM_INTENSITY = 0.15
+FOAM_STABILITY = 0.95
+
+# Every stage draws from an explicitly passed numpy Generator rather than the
+# global `random` state, so concurrent encryptions never disturb each other.
+def noise_generator(seed):
+    """
+    Generator for the Planck noise and foam stages of one encryption.
+    """
+    if (isinstance(seed, DriftKey)):
+        return np.random.default_rng(seed.noise_seed)
+    return np.random.default_rng(int(hashlib.sha256(seed.encode()).hexdigest(), 16))
+
+def foam_drift(shift_val, foam_intensity=FOAM_INTENSITY, rng=None):
+    rng = rng or np.random.default_rng()
+    # Uniform in +-intensity*shift; written so negative shifts are valid too
+    fluctuation = foam_intensity * shift_val * (2 * rng.random() - 1)
+    return max(1, int(shift_val + fluctuation))
+
+def foam_ghost_output(char, stability=FOAM_STABILITY):
+    # 📐 For .bhex safety: always return char (no doubling or deletion)
+    return char
+
+def generate_planck_noise(seed, length=1024, rng=None):
+    """
+    Planck noise in [-2, 2] as an int8 array, drawn in one call.
+    """
+    rng = rng or noise_generator(seed)
+    return rng.integers(-2, 3, size=length, dtype=np.int8)
+
+def apply_quantum_foam_shift(char, shift_val, foam_array, index, rng=None):
+    foam_shift = foam_drift(shift_val, rng=rng)
+    noise = int(foam_array[index % len(foam_array)])
+    total_shift = foam_shift + noise
+
+    if (char.isalpha()):
+        base = ord('A') if char.isupper() else ord('a')
+        shifted_char = chr((ord(char) - base + total_shift) % 26 + base)
+    else:
+        shifted_char = char
+
+    return foam_ghost_output(shifted_char)
+
+def apply_quantum_foam(message, shift_log, foam_array, rng=None, foam_intensity=FOAM_INTENSITY):
+    """
+    Whole-message apply_quantum_foam_shift. Draws the fluctuations in one
+    random() call from `rng`, so the result matches the per-character loop
+    fed the same Generator.
+    """
+    codepoints = _to_codepoints(message)
+    if (not len(codepoints)):
+        return message
+    rng = rng or np.random.default_rng()
+    shifts = np.asarray(shift_log[:len(codepoints)], dtype=np.int64).astype(np.float64)
+    fluctuation = foam_intensity * shifts * (2 * rng.random(len(codepoints)) - 1)
+    foam_shift = np.maximum(1, np.trunc(shifts + fluctuation).astype(np.int64))
+    noise = np.asarray(foam_array, dtype=np.int64)
+    if (len(noise) < len(codepoints)):
+        noise = noise[np.arange(len(codepoints)) % len(noise)]
+    # foam_ghost_output is the identity, so only the letter shift remains
+    return _from_codepoints(_apply_shift_vector(codepoints, foam_shift + noise[:len(codepoints)]))
+
+
+# === Fractal Memory Drift Injection (B3.2) and Decay ===
+class FractalMemory:
+    """
+    Shift data and positional entropy from the first encryption pass.
+    shift_log and position_bias are int64 arrays; decay and shift
+    application work on the whole message at once.
+    """
+    __slots__ = ("message_length", "shift_log", "entropy_score", "position_bias")
+
+    def __init__(self, message_length, shift_log, entropy_score, position_bias):
+        self.message_length = message_length
+        self.shift_log = shift_log
+        self.entropy_score = entropy_score
+        self.position_bias = position_bias
+
+    @classmethod
+    def log(cls, message, shift_log):
+        shifts = np.asarray(shift_log, dtype=np.int64)
+        positions = np.arange(len(shifts), dtype=np.int64)
+        return cls(
+            message_length=len(message),
+            shift_log=shifts,
+            entropy_score=int(_to_codepoints(message).sum()),
+            position_bias=positions % 7 - shifts % 3
+        )
+
+    def decay(self, mode="linear", strength=0.1, rng=None):
+        """
+        Apply decay or mutation to the shift log.
+        Modes:
+          - 'linear'   : slowly reduce shift impact
+          - 'wobble'   : small random drift up/down
+          - 'mutate'   : overwrite values if entropy threshold breached
+        """
+        rng = rng or np.random.default_rng()
+        shifts = self.shift_log
+        if (mode == "linear"):
+            self.shift_log = np.maximum(1, np.trunc(shifts * (1 - strength)).astype(np.int64))
+        elif (mode == "wobble"):
+            self.shift_log = np.maximum(1, shifts + rng.integers(-2, 3, size=len(shifts)))
+        elif (mode == "mutate" and self.entropy_score > 1000):
+            mutated = shifts.copy()
+            mutated[::5] = rng.integers(5, 51, size=len(mutated[::5]))
+            self.shift_log = mutated
+        return self
+
+    def apply(self, message):
+        """
+        Use the stored memory to mutate the message.
+        """
+        if (not len(self.shift_log) or not message):
+            return message
+        codepoints = _to_codepoints(message)
+        positions = np.arange(len(codepoints))
+        shifted = np.mod(codepoints + self.shift_log[positions % len(self.shift_log)]
+                         + self.position_bias[positions % len(self.position_bias)], 126)
+        return _from_codepoints(np.where(shifted == 0, 32, shifted))
+
+    def drift_bar(self):
+        return format_drift_bar(self.shift_log)
+
+    def snapshot(self):
+        """
+        JSON-ready entry for parasite_memory.json's fractal_history.
+        """
+        return {
+            "timestamp": time.strftime('%Y-%m-%d %H:%M:%S'),
+            "entropy": self.entropy_score,
+            "shift_log": self.shift_log.tolist(),
+            "bias": self.position_bias.tolist()
+        }
+
+def log_fractal_memory(message: str, shift_log) -> FractalMemory:
+    return FractalMemory.log(message, shift_log)
+
+def decay_fractal_memory(memory: FractalMemory, mode: str = "linear", strength: float = 0.1, rng=None) -> FractalMemory:
+    return memory.decay(mode, strength, rng)
+
+def apply_fractal_shift(message: str, memory: FractalMemory) -> str:
+    return memory.apply(message)
+
+
+# === Phantom Rotor Core ===
+class RotorState:
+    def __init__(self, runs=0, oracle_path=ORACLE_MEMORY_PATH, recent_runs=None):
+        self.runs = runs
+        self.oracle_path = oracle_path
+        self.recent_runs = recent_runs
+        self.rotor_a = self.get_rotor_a()
+        self.rotor_b = self.get_rotor_b()
+        self.rotor_c = self.get_rotor_c()
+
+    def get_rotor_a(self):
+        # Time-based drift rotor (hour of day)
+        return sum(int(d) for d in time.strftime('%H')) % 10
+
+    def get_rotor_b(self):
+        # Message-count rotor
+        return (self.runs % 7) + 1
+
+    def get_rotor_c(self):
+        # Oracle memory drift-based rotor
+        try:
+            recent = self.recent_runs if self.recent_runs is not None else get_oracle_store(self.oracle_path).tail(3)
+            drift_sum = sum(run["drift_score"] for run in recent[-3:])
+            return int(drift_sum) % 9
+        except:
+            return 3
+
+    def rotate(self):
+        self.runs += 1
+        self.rotor_a = self.get_rotor_a()
+        self.rotor_b = self.get_rotor_b()
+        self.rotor_c = self.get_rotor_c()
+
+    def total_bias(self):
+        return self.rotor_a + self.rotor_b + self.rotor_c
+
+
+# === B5.1 Fusion Engine ===
+def charlie_protocol_trigger(fusion_history: list[dict], threshold: float = 0.85) -> bool:
+    """
+    Detects profile convergence over recent fusion decisions.
+    If average similarity between recent fusion paths exceeds threshold,
+    trigger logic mutation to prevent profiling.
+    """
+    def similarity(a, b):
+        all_keys = set(a) | set(b)
+        return sum(min(float(a.get(k, 0)), float(b.get(k, 0))) for k in all_keys) / max(sum(float(v) for v in a.values()), 1)
+
+    filtered = [entry.get("fusion_map", {}) for entry in fusion_history if isinstance(entry.get("fusion_map", {}), dict)]
+    if (len(filtered) < 3):
+        return False
+
+    recent = filtered[-3:]
+    sims = [similarity(recent[i], recent[i + 1]) for i in range(2)]
+    avg_sim = sum(sims) / len(sims)
+    return avg_sim >= threshold
+
+
+def adjust_branch_weights(prior_sessions: list[dict]) -> dict:
+    """
+    Create weight bias toward frequently-used branches.
+    This is the 'white matter' influencing future cognition.
+    """
+    weight_bias = {}
+    for session in prior_sessions[-3:]:  # Look at last 3 messages
+        for branch, weight in session.get("fusion_weights", {}).items():
+            weight_bias[branch] = weight_bias.get(branch, 0) + weight
+
+    # Normalize weights
+    total = sum(weight_bias.values())
+    return {k: v / total for k, v in weight_bias.items()}
+
+
+def analyze_entropy_profile(message, key, oracle_bias):
+    entropy = codepoint_sum(message)
+    key_score = len(key) + sum(c.isdigit() for c in key) * 2 + sum(not c.isalnum() for c in key) * 3
+    fusion_threshold = 2500
+    entropy_modifier = entropy + key_score + oracle_bias.get("bias", 0) * 10
+    activate_fusion = entropy_modifier > fusion_threshold
+    fusion_map = {
+        "B1.2": 0.55,
+        "B3.1": 0.25,
+        "B4.1": 0.20
+    } if activate_fusion else {}
+    return {
+        "activate_fusion": activate_fusion,
+        "fusion_map": fusion_map,
+        "reason": f"Entropy+Key Score={entropy_modifier} ({'activated' if activate_fusion else 'not activated'})"
+    }
+
+def fusion_buffers(text):
+    codepoints = _to_codepoints(text)
+    is_alpha, is_upper = _letter_masks(codepoints)
+    return FusionBuffers(codepoints, is_alpha, is_upper)
+
+def invoke_fusion_logic(message, key, fusion_map):
+    """
+    Run the weighted fusion branches over one set of shared buffers.
+    The accumulated shifts are the shift log, so decryption is unchanged.
+    """
+    log_debug("[FUSION] Activating Entropic Fusion Node with branches: %s", fusion_map)
+    words = message.split()
+    buffers = fusion_buffers(' '.join(words))
+    state = {
+        "message": message,
+        "words": words,
+        "key": key,
+        "modifiers": key_to_modifiers(key),
+        "fibonacci": generate_fibonacci_sequence(FIBONACCI_DEPTH)
+    }
+    ran = run_fusion(buffers, fusion_map, state)
+    if (state.get("skipped")):
+        log_debug("[FUSION] No stage registered for: %s", state["skipped"])
+    log_debug("[FUSION] Ran stages: %s", ran)
+
+    base = np.where(buffers.is_upper, ord('A'), ord('a'))
+    shifted = np.mod(buffers.codepoints - base + buffers.shifts, 26) + base
+    return _from_codepoints(np.where(buffers.is_alpha, shifted, buffers.codepoints)), buffers.shifts
+
+def generate_random_fusion():
+    #  Placeholder for CHARLIE protocol
+    return {
+        "B1.1": round(random.uniform(0.3, 0.6), 2),
+        "B3.1": round(random.uniform(0.2, 0.4), 2),
+        "B4.1": round(random.uniform(0.1, 0.3), 2),
+    }
+
+
+# === Oracle Memory ===
+def load_oracle_memory(path=ORACLE_MEMORY_PATH, window=None):
+    """
+    Oracle runs as {"runs": [...]}: the last `window` runs, or every retained
+    run if window is None. "total_runs" counts compacted runs too.
+    """
+    store = get_oracle_store(path)
+    return {"runs": store.tail(window), "total_runs": store.count()}
+
+def calculate_drift_score(entropy, shift_log):
+    try:
+        spread = drift_spread(shift_log) if len(shift_log) else 1
+        #  Clamp to 100.0 max to avoid overflow
+        return round(min((entropy / (spread + 1)) % 100, 100.0), 2)
+    except OverflowError:
+        return 99.99
+
+def generate_oracle_bias(memory):
+    recent = memory["runs"][-5:] if len(memory["runs"]) >= 5 else memory["runs"]
+    if (not recent):
+        return {"bias": 0, "state": "BALANCE", "response": "ΨEchoSelf>NEUTRAL>Σ1 :: Conditions stable."}
+
+    avg_drift = sum(run["drift_score"] for run in recent) / len(recent)
+    if (avg_drift > 75):
+        return {"bias": -1, "state": "CHAOS_AVERSION", "response": "∴EchoSelf>STABILIZE>Δ1 :: Drift beyond tolerance."}
+    elif (avg_drift < 30):
+        return {"bias": 1, "state": "ENTROPY_HUNGER", "response": "∵EchoSelf>EXPAND>Ω3 :: Entropy suboptimal."}
+    else:
+        return {"bias": 0, "state": "BALANCE", "response": "ΨEchoSelf>NEUTRAL>Σ1 :: Conditions stable."}
+
+
+# === B1.1 Cubed Vowel / B1.2 Fibonacci Core ===
+FIBONACCI_DEPTH = 100000
+PISANO_PERIOD = 84  # period of the Fibonacci sequence mod 26
+_INT64_FIB_TERMS = 92  # terms that fit in int64 before overflow
+
+class FibonacciShiftTable:
+    """
+    B1.2 Fibonacci shifts reduced mod 26.
+    Stands in for the old 100k-term int64 sequence: residues repeat every
+    PISANO_PERIOD terms, and start points are found through a value->index
+    map over the terms that fit in int64. Term k is F(k+1), as before.
+    """
+
+    def __init__(self, depth=FIBONACCI_DEPTH):
+        self.depth = depth
+        residues = [1, 1]
+        while (len(residues) < PISANO_PERIOD):
+            residues.append((residues[-1] + residues[-2]) % 26)
+        self.residues = np.array(residues, dtype=np.uint8)
+
+        self.index_of = {}
+        a, b = 1, 1
+        for i in range(min(depth, _INT64_FIB_TERMS)):
+            self.index_of.setdefault(a, i)
+            a, b = b, a + b
+
+    def __len__(self):
+        return self.depth
+
+    def start_index(self, value):
+        """
+        Index of the first term equal to `value`, or None.
+        """
+        return self.index_of.get(value)
+
+    def shift(self, index):
+        return int(self.residues[index % PISANO_PERIOD])
+
+    def shifts(self, start_index, count):
+        """
+        `count` shifts read from `start_index`, wrapping back to it at the table depth.
+        """
+        positions = start_index + np.arange(count, dtype=np.int64) % (self.depth - start_index)
+        return self.residues[positions % PISANO_PERIOD].astype(np.int64)
+
+_fib_cache = None
+
+def generate_fibonacci_sequence(depth):
+    global _fib_cache
+    if (_fib_cache is None or _fib_cache.depth < depth):
+        _fib_cache = FibonacciShiftTable(depth)
+    return _fib_cache
+
+def key_to_modifiers(key):
+    if (isinstance(key, DriftKey)):
+        return key.modifiers
+    hashed = hashlib.sha256(key.encode()).hexdigest()
+    nums = [int(char, 16)**2 for char in hashed[:16]]
+    fib_mod = sum(nums[:5]) % 1000
+    cube_mod = sum(nums[5:10]) % 7
+    shift_mod = sum(nums[10:]) % 3
+    return fib_mod, cube_mod, shift_mod
+
+def get_cube_from_vowel(vowel):
+    cube_map = {'A': 6, 'E': 7, 'I': 8, 'O': 9, 'U': 11}
+    if (not vowel):
+        return None
+    return cube_map.get(vowel.upper(), None)
+
+def find_first_vowel(text):
+    for char in text.upper():
+        if (char in "AEIOU"):
+            return char
+    return None
+
+def find_nth_vowel(text, n):
+    count = 0
+    for char in text.upper():
+        if (char in "AEIOU"):
+            count += 1
+            if (count == n):
+                return char
+    return None
+
+def shift_char(char, shift):
+    if (char.isalpha()):
+        base = ord('A') if char.isupper() else ord('a')
+        return chr((ord(char) - base + shift) % 26 + base)
+    else:
+        return char
+
+def apply_shift_formula(cube_value, cube_mod):
+    x = ((cube_value / 2) + 10) / 3 + cube_mod
+    return int(x) + 1 if x % 1 != 0 else int(x)
+
+def resolve_modifiers(key, oracle_bias=None, rotor=None):
+    fib_mod, cube_mod, shift_mod = key_to_modifiers(key)
+    if (oracle_bias and rotor):
+        fib_mod += oracle_bias.get("bias", 0) + rotor.rotor_a
+        cube_mod += oracle_bias.get("bias", 0) + rotor.rotor_b
+        shift_mod += rotor.rotor_c
+    return fib_mod, cube_mod, shift_mod
+
+def fibonacci_start_index(message, words, fibonacci_sequence, fib_mod):
+    third_vowel = find_nth_vowel(message, 3)
+    special_end_letters = {'D', 'H', 'L', 'M', 'N', 'T'}
+    first_long_word = next((w for w in words if len(w) >= 5), '')
+    if (first_long_word and first_long_word[-1].upper() in special_end_letters):
+        return fibonacci_sequence.start_index(701408733)
+    vowel_start_points = {'A': 4181, 'E': 28657, 'I': 10946, 'O': 13, 'U': 75025}
+    start_point = vowel_start_points.get(third_vowel, 377)
+    start_index = fibonacci_sequence.start_index(start_point + fib_mod)
+    return 377 if start_index is None else start_index
+
+def encrypt_message(message, fibonacci_sequence, key, oracle_bias=None, rotor=None):
+    # Oracle bias and rotors are applied to the modifiers if both are given
+    fib_mod, cube_mod, shift_mod = resolve_modifiers(key, oracle_bias, rotor)
+    words = message.split()
+    encrypted = []
+    shift_log = []
+    y = get_cube_from_vowel(find_first_vowel(message)) or 1
+    cube_index = 0
+    fibonacci_mode = False
+
+    for index, word in enumerate(words):
+        if (index > 0):
+            encrypted.append(' ')
+            shift_log.append(0)
+
+        if (not fibonacci_mode):
+            if (len(word) >= 5):
+                fibonacci_mode = True
+
+            for char in word:
+                cube_value = (y + cube_index + shift_mod) ** 3
+                shift_val = apply_shift_formula(cube_value, cube_mod)
+                shift_log.append(shift_val)
+                encrypted.append(shift_char(char, shift_val))
+                cube_index += 1
+        else:
+            start_index = fibonacci_start_index(message, words, fibonacci_sequence, fib_mod)
+            span = len(fibonacci_sequence) - start_index
+            rest = ' '.join(words[index:])
+            for i, char in enumerate(rest):
+                shift_val = fibonacci_sequence.shift(start_index + i % span)
+                shift_log.append(shift_val)
+                encrypted.append(shift_char(char, shift_val))
+            break
+
+    return ''.join(encrypted), shift_log
+
+def decrypt_message(encrypted_message, shift_values):
+    decrypted = []
+    for i, char in enumerate(encrypted_message):
+        if (char.isalpha()):
+            base = ord('A') if char.isupper() else ord('a')
+            shifted = chr((ord(char) - base - shift_values[i]) % 26 + base)
+            decrypted.append(shifted)
+        else:
+            decrypted.append(char)
+    return ''.join(decrypted)
+
+
+# === Vectorized Shift Kernels ===
+# Array versions of encrypt_message / decrypt_message over a UTF-32 codepoint
+# view. Output is identical to the scalar functions above, which remain the
+# reference implementation.
+_CUBE_EXACT_LIMIT = 2_097_151  # largest base whose cube fits in int64
+
+def _to_codepoints(text):
+    return np.frombuffer(text.encode('utf-32-le', 'surrogatepass'), dtype=np.uint32).astype(np.int64)
+
+def _from_codepoints(codepoints):
+    return codepoints.astype(np.uint32).tobytes().decode('utf-32-le', 'surrogatepass')
+
+def codepoint_sum(text):
+    """
+    sum(ord(c) for c in text), in one array pass.
+    """
+    return int(_to_codepoints(text).sum())
+
+def _letter_masks(codepoints):
+    """
+    str.isalpha / str.isupper masks; only non-ASCII codepoints fall back to Python.
+    """
+    is_upper = (codepoints >= 65) & (codepoints <= 90)
+    is_alpha = is_upper | ((codepoints >= 97) & (codepoints <= 122))
+    wide = codepoints >= 128
+    if (wide.any()):
+        for cp in np.unique(codepoints[wide]):
+            char = chr(cp)
+            if (char.isalpha()):
+                hits = codepoints == cp
+                is_alpha |= hits
+                if (char.isupper()):
+                    is_upper |= hits
+    return is_alpha, is_upper
+
+def _apply_shift_vector(codepoints, shifts):
+    is_alpha, is_upper = _letter_masks(codepoints)
+    base = np.where(is_upper, ord('A'), ord('a'))
+    shifted = np.mod(codepoints - base + shifts, 26) + base
+    return np.where(is_alpha, shifted, codepoints)
+
+def cube_shift_vector(count, y, cube_mod, shift_mod):
+    """
+    B1.1 cube-phase shifts for `count` consecutive letters (apply_shift_formula in bulk).
+    """
+    n = np.arange(count, dtype=np.int64) + (y + shift_mod)
+    x = ((n ** 3).astype(np.float64) / 2 + 10) / 3 + cube_mod
+    return np.ceil(x).astype(np.int64)
+
+def encrypt_message_array(message, fibonacci_sequence, key, oracle_bias=None, rotor=None):
+    """
+    Vectorized encrypt_message. Returns the cipher text and an int64 shift log.
+    """
+    fib_mod, cube_mod, shift_mod = resolve_modifiers(key, oracle_bias, rotor)
+    words = message.split()
+    joined = ' '.join(words)
+    codepoints = _to_codepoints(joined)
+    shifts = np.zeros(len(codepoints), dtype=np.int64)
+
+    # Cube phase runs through the first word of 5+ letters; Fibonacci takes the rest
+    long_word = next((i for i, w in enumerate(words) if len(w) >= 5), None)
+    cube_words = words if long_word is None else words[:long_word + 1]
+    cube_end = sum(len(w) for w in cube_words) + len(cube_words) - 1 if cube_words else 0
+
+    y = get_cube_from_vowel(find_first_vowel(message)) or 1
+    letters = np.flatnonzero(codepoints[:cube_end] != ord(' '))
+    if (len(letters) and y + shift_mod + len(letters) > _CUBE_EXACT_LIMIT):
+        encrypted, shift_log = encrypt_message(message, fibonacci_sequence, key, oracle_bias, rotor)
+        return encrypted, np.array(shift_log, dtype=np.int64)
+    shifts[letters] = cube_shift_vector(len(letters), y, cube_mod, shift_mod)
+
+    fib_start = cube_end + 1
+    if (fib_start < len(codepoints)):
+        start_index = fibonacci_start_index(message, words, fibonacci_sequence, fib_mod)
+        shifts[fib_start:] = fibonacci_sequence.shifts(start_index, len(codepoints) - fib_start)
+
+    return _from_codepoints(_apply_shift_vector(codepoints, shifts)), shifts
+
+def decrypt_message_array(encrypted_message, shift_values):
+    """
+    Vectorized decrypt_message.
+    """
+    codepoints = _to_codepoints(encrypted_message)
+    # Reduce first so the subtraction is exact like the scalar path's Python ints
+    shifts = np.mod(np.asarray(shift_values[:len(codepoints)], dtype=np.int64), 26)
+    return _from_codepoints(_apply_shift_vector(codepoints, -shifts))
+
+
+# === AxiomCore Symbol Layer ===
+PUNCTUATION_CHARS = list(".,?!:;'\"-_()[]{}@#$%^&*+=<>/\\|~")
+digit_symbols = {str(d): [symbol_from_index(i, exclude=str(d)) for i in range(10)] for d in range(10)}
+punct_symbols = {p: [symbol_from_index(i, exclude=p) for i in range(10)] for p in PUNCTUATION_CHARS}
+
+symbol_map = {chr(i + 65): str(i + 1).zfill(2) for i in range(26)}
+symbol_map.update({chr(i + 97): str(i + 27).zfill(2) for i in range(26)})
+reverse_map = {v: k for k, v in symbol_map.items()}
+_POOL_LETTERS = frozenset(ALPHABET)
+_UPPER_UNKNOWN = np.frombuffer('UNKN'.encode('utf-32-le'), dtype=np.uint32)
+_LOWER_UNKNOWN = np.frombuffer('unkn'.encode('utf-32-le'), dtype=np.uint32)
+# Codepoints of the 10 candidate symbols per digit / punctuation mark
+_CHOICE_CODEPOINTS = {ord(c): symbol_codepoints(range(10), exclude=c) for c in list(digit_symbols) + PUNCTUATION_CHARS}
+
+def encrypt_1to1(message):
+    """
+    AxiomCore encode. Works on the codepoint array: each letter/case pool
+    that occurs permutes the slots it needs in one pass (falling back to
+    UNKN/unkn once its 1000 slots are used up), and the symbols are written
+    straight into the output array, so cost follows message length.
+    Returns the cipher and its (char, symbol) pairs as a SharedLog.
+    """
+    words = message.split()
+    if (not words):
+        return '', SharedLog(np.zeros(0, dtype=np.int64), np.zeros((0, SYMBOL_WIDTH), dtype=np.uint32))
+    joined = _to_codepoints(' '.join(words))
+    is_space = joined == ord(' ')
+    codepoints = joined[~is_space]
+    symbols = np.empty((len(codepoints), SYMBOL_WIDTH), dtype=np.uint32)
+    rng = np.random.default_rng(random.getrandbits(64))
+
+    # Group positions by character (stable, so each group stays in message order)
+    keys = codepoints.astype(np.uint16) if codepoints.max() < 0x10000 else codepoints  # 16-bit keys radix sort
+    order = np.argsort(keys, kind='stable')
+    distinct, starts = np.unique(codepoints[order], return_index=True)
+    for cp, positions in zip(distinct.tolist(), np.split(order, starts[1:])):
+        c = chr(cp)
+        # Uppercase / lowercase letter
+        if (c.isupper() or c.islower()):
+            case = 'upper' if c.isupper() else 'lower'
+            taken = 0
+            if (c.upper() in _POOL_LETTERS):
+                slots = SessionPool(c, case).take_slots(len(positions))
+                symbols[positions[:len(slots)]] = pool_codepoints(c, case, slots)
+                taken = len(slots)
+            symbols[positions[taken:]] = _UPPER_UNKNOWN if case == 'upper' else _LOWER_UNKNOWN
+        # Digit / punctuation
+        elif (cp in _CHOICE_CODEPOINTS):
+            choices = _CHOICE_CODEPOINTS[cp]
+            symbols[positions] = choices[rng.integers(0, len(choices), size=len(positions))]
+        # Catch-all
+        else:
+            symbols[positions] = rng.integers(ord('A'), ord('Z') + 1, size=(len(positions), SYMBOL_WIDTH))
+
+    # Lay the symbols out word by word, one space between words
+    offsets = SYMBOL_WIDTH * np.arange(len(codepoints)) + np.cumsum(is_space)[~is_space]
+    text = np.full(SYMBOL_WIDTH * len(codepoints) + len(words) - 1, ord(' '), dtype=np.uint32)
+    for i in range(SYMBOL_WIDTH):
+        text[offsets + i] = symbols[:, i]
+    return _from_codepoints(text), SharedLog(codepoints, symbols)
+
+_SYMBOL_WEIGHTS = np.array([len(ALPHABET) ** p for p in range(SYMBOL_WIDTH - 1, -1, -1)], dtype=np.int64)
+
+def decrypt_1to1_table(cipher, codepoints, indices):
+    """
+    AxiomCore decode against a packed shared-symbol table.
+    Same rules as decrypt_1to1, but symbols are matched as one array pass.
+    """
+    words = cipher.strip().split()
+    if (not words):
+        return ''
+    # Pad word if length isn't divisible by 4 to prevent symbol shift
+    padded = [word + '_' * (-len(word) % SYMBOL_WIDTH) for word in words]
+    counts = np.array([len(word) // SYMBOL_WIDTH for word in padded], dtype=np.int64)
+    rows = np.frombuffer(''.join(padded).encode('utf-32-le', 'surrogatepass'), dtype=np.uint32).reshape(-1, SYMBOL_WIDTH)
+
+    digits = rows.astype(np.int64) - ord('A')
+    valid = np.all((digits >= 0) & (digits < len(ALPHABET)), axis=1)
+    found = np.where(valid, digits @ _SYMBOL_WEIGHTS, -1)
+    found[np.all(rows == _LOWER_UNKNOWN, axis=1)] = UNKNOWN_INDEX
+
+    total = len(rows)
+    known = min(total, len(indices))
+    match = np.zeros(total, dtype=bool)
+    match[:known] = found[:known] == indices[:known]
+
+    out_chars = np.full(total, ord('?'), dtype=np.uint32)
+    out_chars[match] = codepoints[:known][match[:known]]
+    for i in np.flatnonzero(~match[:known]):
+        # Treat _ as transparent for symbol matching
+        symbol = ''.join(map(chr, rows[i])).rstrip('_')
+        guessed = reverse_map.get(symbol)
+        if (guessed):
+            out_chars[i] = ord(guessed)
+
+    # Re-insert the single spaces between words
+    text = np.full(total + len(words) - 1, ord(' '), dtype=np.uint32)
+    text[np.arange(total) + np.repeat(np.arange(len(words)), counts)] = out_chars
+    return text.tobytes().decode('utf-32-le', 'surrogatepass')
+
+def decrypt_1to1(cipher, shared_log=None):
+    if (isinstance(shared_log, dict)):
+        return decrypt_1to1_table(cipher, *unpack_symbol_table(shared_log))
+    if (isinstance(shared_log, SharedLog)):
+        return decrypt_1to1_table(cipher, shared_log.codepoints, shared_log.indices())
+    shared_log = shared_log or []
+
+    words = cipher.strip().split()
+    decrypted_words = []
+    counter = 0
+    for word in words:
+        # Pad word if length isn't divisible by 4 to prevent symbol shift
+        while (len(word) % SYMBOL_WIDTH != 0):
+            word += '_'
+        symbols = [word[i:i+SYMBOL_WIDTH] for i in range(0, len(word), SYMBOL_WIDTH)]
+        decrypted = ''
+        for symbol in symbols:
+            # Treat _ as transparent for symbol matching
+            if (symbol.endswith('_')):
+                symbol = symbol.rstrip('_')
+            if (counter < len(shared_log)):
+                expected = shared_log[counter]
+                if (expected[1] is None):
+                    decrypted += expected[0] if expected[0] is not None else symbol
+                elif (symbol == expected[1]):  # Exact match
+                    decrypted += expected[0]
+                else:
+                    guessed = reverse_map.get(symbol)
+                    if (not guessed):
+                        # Strip padding chars or attempt Hamming fallback if needed
+                        guessed = '?'
+                    decrypted += guessed
+                counter += 1
+            else:
+                decrypted += '?'
+        decrypted_words.append(decrypted)
+    return ' '.join(decrypted_words)
+
+
+# === Subconscious Log ===
+def generate_subconscious_log(message, key, shift_log):
+    try:
+        entropy = codepoint_sum(message) + min(max(drift_total(shift_log), 0), 1_000_000)
+        if (entropy <= 0):
+            entropy = 1
+        if (isinstance(key, DriftKey)):
+            digest = key.digest(f"subconscious{entropy}")
+        else:
+            digest = hashlib.sha256(f"{key}{entropy}".encode()).hexdigest()
+        seed = int(digest, 16) % 10_000_000
+        rng = np.random.default_rng(seed)
+        symbols = ['⟁', '⌬', '∴', 'Δ', '⇄', 'Ω', 'π', 'Σ', '⊗', '≡', '∵', 'Ψ']
+        tags = ['B1.1', 'B1.2', 'SHIFT', 'PATH_MUT', 'CHAOS', 'ECHO', 'RECALL', 'GLYPH']
+        count = int(rng.integers(8, 17))
+        symbol_idx = rng.integers(0, len(symbols), size=count)
+        tag_idx = rng.integers(0, len(tags), size=count)
+        nums = rng.integers(10, 1000, size=count)
+        fragments = [f"{symbols[s]}{tags[t]}>{n}" for s, t, n in zip(symbol_idx, tag_idx, nums)]
+        if (rng.random() > 0.5):
+            fragments.insert(int(rng.integers(1, count)), f"∵PHANTOM>Δ{rng.integers(1, 10)}")
+        return fragments
+    except Exception as e:
+        log_debug("[SUBCONSCIOUS ERROR] %s", e)
+        return ["∵FAILSAFE>Δ0"]
+
+
+# === Parasite Memory System ===
+def load_parasite_memory(path=PARASITE_MEMORY_PATH):
+    # Live in-process view; written back by the state manager
+    return get_parasite_state(path).memory
+
+def update_parasite_memory(drift_score, entropy_value, path=PARASITE_MEMORY_PATH):
+    state = get_parasite_state(path)
+    memory = state.memory
+    parasite_bias = int((drift_score + (entropy_value % 97)) % 7)
+    with state.lock:
+        memory["drift_bias"] += parasite_bias
+        memory["influence_count"] += 1
+        memory["history"].append({
+            "timestamp": time.strftime('%Y-%m-%d %H:%M:%S'),
+            "bias_added": parasite_bias,
+            "entropy": entropy_value,
+            "drift": drift_score
+        })
+        if (len(memory["history"]) > 20):
+            memory["history"] = memory["history"][-20:]
+        state.touch()
+    return memory
+
+def record_fractal_snapshot(snapshot, path=PARASITE_MEMORY_PATH):
+    # Written back together with the next update_parasite_memory() touch
+    state = get_parasite_state(path)
+    memory = state.memory
+    with state.lock:
+        memory.setdefault("fractal_history", []).append(snapshot)
+        if (len(memory["fractal_history"]) > 20):
+            memory["fractal_history"] = memory["fractal_history"][-20:]
+    return memory
+
+
+# === Shared State Backends ===
+class LocalState:
+    """
+    Oracle/parasite state kept in this process's own files.
+    src/state_daemon.StateClient offers the same methods for state owned by
+    a shared daemon instead.
+    """
+
+    # Stores are shared per path across the whole process (one SQLite
+    # connection each), so every LocalState serializes on the same lock
+    _lock = threading.Lock()
+
+    def __init__(self, oracle_path=ORACLE_MEMORY_PATH, parasite_path=PARASITE_MEMORY_PATH):
+        self.oracle_path = oracle_path
+        self.parasite_path = parasite_path
+
+    def oracle_window(self, window=ORACLE_WINDOW):
+        with self._lock:
+            return load_oracle_memory(self.oracle_path, window=window)
+
+    def commit(self, oracle_entry, fractal_snapshot, drift_score, entropy_value):
+        """
+        Apply the state changes of one encryption; returns parasite memory.
+        """
+        with self._lock:
+            record_fractal_snapshot(fractal_snapshot, self.parasite_path)
+            parasite_memory = update_parasite_memory(drift_score, entropy_value, path=self.parasite_path)
+            get_oracle_store(self.oracle_path).append(oracle_entry)
+        return parasite_memory
+
+    def flush(self):
+        get_parasite_state(self.parasite_path).flush()
+
+
+# === Key Profile / Digit Guards ===
+def analyze_key(key):
+    profile = {
+        'vowel_count': sum(1 for c in key if c.lower() in 'aeiou'),
+        'digit_count': sum(1 for c in key if c.isdigit()),
+        'symbol_count': sum(1 for c in key if not c.isalnum()),
+        'length': len(key)
+    }
+    profile['branch_path'] = []
+    if (profile['vowel_count'] > 4):
+        profile['branch_path'].append("B1.1")
+    if (profile['digit_count'] > 3):
+        profile['branch_path'].append("B1.2")
+    if (profile['symbol_count'] >= 1):
+        profile['branch_path'].append("B2.1")
+    return profile
+
+_NUMBER_WORDS = {ord(str(d)): f"__{word}__" for d, word in enumerate(['zero', 'one', 'two', 'three', 'four', 'five', 'six', 'seven', 'eight', 'nine'])}
+
+def convert_numbers_to_words(text):
+    return text.translate(_NUMBER_WORDS)
+
+def convert_words_to_numbers(text):
+    word_to_num = {'zero': '0', 'one': '1', 'two': '2', 'three': '3', 'four': '4', 'five': '5', 'six': '6', 'seven': '7', 'eight': '8', 'nine': '9'}
+    result = []
+    parts = text.split('__')
+    for part in parts:
+        if (part in word_to_num):
+            result.append(word_to_num[part])
+        else:
+            result.append(part)
+    return ''.join(result)
+
+
+# === .bhex Packaging ===
+def recover_message(package):
+    """
+    Reverse the AxiomCore and drift layers of an opened inner package.
+    """
+    cipher = package.get("cipher", "")
+    shift_log = package.get("shift_log", [])
+    # Packed table since .bhex packages carry "symbol_table"; older ones keep the JSON pairs
+    shared_log = package.get("symbol_table") or package.get("shared_symbols", [])
+    if (not cipher):
+        raise ValueError("Cipher text is empty.")
+
+    log_debug("[DECRYPT] Starting AxiomCore symbol decryption.")
+    with span("axiomcore_decode", chars=len(cipher)):
+        blackhole_ready_text = decrypt_1to1(cipher, shared_log)
+    log_debug("[DECRYPT] AxiomCore output: %s", blackhole_ready_text)
+
+    #  Enforce length uniformity for shift_log and message
+    if (len(blackhole_ready_text) != len(shift_log)):
+        min_len = min(len(blackhole_ready_text), len(shift_log))
+        blackhole_ready_text = blackhole_ready_text[:min_len]
+        shift_log = shift_log[:min_len]
+
+    with span("unshift", chars=len(blackhole_ready_text)):
+        decrypted = decrypt_message_array(blackhole_ready_text, shift_log)
+    log_debug("[DECRYPT] Final result: %s", decrypted)
+    return convert_words_to_numbers(decrypted)
+
+
+STREAM_CHUNK_CHARS = 1 << 16
+_CUT_SCAN_LIMIT = 1 << 16
+
+def _whitespace_cut(text, limit):
+    # Prefer to cut just after whitespace so no word straddles two chunks
+    for i in range(limit - 1, max(-1, limit - 1 - _CUT_SCAN_LIMIT), -1):
+        if (text[i].isspace()):
+            return i + 1
+    return limit
+
+def iter_text_chunks(source, chunk_chars=STREAM_CHUNK_CHARS):
+    """
+    Read a binary (UTF-8) or text file object as text chunks of at most
+    `chunk_chars` characters, holding no more than two chunks in memory.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    buffer = ''
+    while True:
+        block = source.read(chunk_chars)
+        if (isinstance(block, (bytes, bytearray))):
+            buffer += decoder.decode(block, final=not block)
+        else:
+            buffer += block
+        while (len(buffer) >= chunk_chars):
+            cut = _whitespace_cut(buffer, chunk_chars)
+            yield buffer[:cut]
+            buffer = buffer[cut:]
+        if (not block):
+            break
+    if (buffer):
+        yield buffer
+
+
+# === Headless Engine ===
+class Engine:
+    """
+    Headless BlackHole V6 pipeline.
+    Mirrors the GUI encrypt/decrypt path and persists oracle/parasite memory
+    to the given paths (or through `state`, e.g. a state daemon client), but
+    never touches a display or the clipboard.
+    """
+
+    def __init__(self, oracle_path=ORACLE_MEMORY_PATH, parasite_path=PARASITE_MEMORY_PATH, package_format=FORMAT_BINARY, state=None,
+                 kdf=DEFAULT_KDF, kdf_cost=None):
+        if (package_format not in (FORMAT_BINARY, FORMAT_JSON)):
+            raise ValueError(f"Unsupported package format: {package_format}")
+        self.oracle_path = oracle_path
+        self.parasite_path = parasite_path
+        self.package_format = package_format
+        self.state = state or LocalState(oracle_path, parasite_path)
+        self.kdf = kdf
+        self.kdf_cost = kdf_cost
+
+    def key_context(self, key):
+        """
+        Cached KeyContext used to seal packages under `key`.
+        """
+        return encryption_context(key, self.kdf, self.kdf_cost)
+
+    def encrypt(self, message, key):
+        """
+        Encrypt a message and return the sealed .bhex package: bytes for the
+        binary format, or the envelope dict for the JSON format.
+        """
+        return self.encrypt_report(message, key)["package"]
+
+    def encrypt_report(self, message, key):
+        """
+        Run the full encryption pipeline and return the package together with
+        the drift, oracle and parasite readings the front-ends display.
+        """
+        if (isinstance(message, (bytes, bytearray))):
+            message = message.decode()
+        if (not message or not message.strip()):
+            raise ValueError("Please enter a message to encrypt.")
+        if (not key):
+            raise ValueError("Encryption key is required.")
+        with span("keys"):
+            keys = self.key_context(key)
+
+        oracle_memory = self.state.oracle_window(ORACLE_WINDOW)
+        oracle_bias = generate_oracle_bias(oracle_memory)
+
+        # === ROTOR MAGIC ===
+        rotor = RotorState(runs=oracle_memory["total_runs"], oracle_path=self.oracle_path, recent_runs=oracle_memory["runs"])
+        rotor.rotate()
+        log_debug("[ROTORS] A: %s, B: %s, C: %s", rotor.rotor_a, rotor.rotor_b, rotor.rotor_c)
+        log_debug("[ORACLE STATE] %s: %s", oracle_bias["state"], oracle_bias["response"])
+
+        message = convert_numbers_to_words(message.strip())
+
+        # Rotor salt drives the drift stages only; the package is sealed with the caller's key
+        rotor_salt = f"∴{rotor.total_bias()}Ψ" if rotor.runs % 5 == 0 else ""
+        cipher_key = keys.drift_key(key + rotor_salt, rotor_salt)
+
+        fibonacci_sequence = generate_fibonacci_sequence(FIBONACCI_DEPTH)
+        fusion_decision = analyze_entropy_profile(message, cipher_key, oracle_bias)
+        log_debug("[FUSION DECISION] %s", fusion_decision["reason"])
+
+        # === CHARLIE PROTOCOL ===
+        if (charlie_protocol_trigger(oracle_memory['runs'])):
+            fusion_decision['fusion_map'] = generate_random_fusion()
+            log_debug("[CHARLIE PROTOCOL] Triggered. Fusion map scrambled to avoid profile convergence.")
+
+        with span("fusion" if fusion_decision["activate_fusion"] else "drift", chars=len(message)):
+            if (fusion_decision["activate_fusion"]):
+                encrypted, shift_log = invoke_fusion_logic(message, cipher_key, fusion_decision["fusion_map"])
+            else:
+                encrypted, shift_log = encrypt_message_array(message, fibonacci_sequence, cipher_key, oracle_bias, rotor)
+
+        log_debug("[ENCRYPT] BlackHole result: %s", encrypted)
+        log_debug("[ENCRYPT] BlackHole char count: %s", len(encrypted))
+        log_debug("[ENCRYPT] Shift log length: %s", len(shift_log))
+
+        with span("axiomcore", chars=len(encrypted)):
+            axiom_encrypted, shared_log = encrypt_1to1(encrypted)
+        log_debug("[ENCRYPT] AxiomCore result: %s", axiom_encrypted)
+
+        # === Injecting Boundary Blur Logic (B2.4) ===
+        with span("blur", chars=len(encrypted)):
+            encrypted, blur_triggered = inject_boundary_blur(encrypted, shift_log)
+        if (blur_triggered):
+            log_debug("[BLUR] Boundary Blur Logic activated: fallback logic applied to midpoint.")
+
+        # === Injecting Quantum Foam Drift ===
+        with span("foam", chars=len(encrypted)):
+            foam_rng = noise_generator(cipher_key)
+            foam_array = generate_planck_noise(cipher_key, length=len(encrypted), rng=foam_rng)
+            encrypted = apply_quantum_foam(encrypted, shift_log, foam_array, rng=foam_rng)
+        log_debug("[QUANTUM FOAM] Applied quantum drift to %s characters.", len(encrypted))
+
+        # === Injecting Fractal Memory Drift (B3.2) with Drift Decay ===
+        with span("fractal", chars=len(encrypted)):
+            memory = FractalMemory.log(encrypted, shift_log).decay(mode="wobble", strength=0.1, rng=foam_rng)
+            encrypted = memory.apply(encrypted)
+
+            drift_bar = memory.drift_bar()
+            fractal_entropy = memory.entropy_score
+            fractal_drift_score = calculate_drift_score(entropy=fractal_entropy, shift_log=memory.shift_log)
+
+            # === Memory snapshot for parasite_memory.json (committed below) ===
+            memory_snapshot = memory.snapshot()
+
+        log_debug("[FRACTAL DRIFT] %s", drift_bar)
+        if (tracer.enabled):
+            log_debug("[ENCRYPT] AxiomCore word count: %s", len(axiom_encrypted.split()))
+
+        key_profile = analyze_key(cipher_key)
+        log_debug("[KEY PROFILE] %s", key_profile)
+
+        subconscious_log = generate_subconscious_log(message, cipher_key, shift_log)
+
+        entropy_value = codepoint_sum(message)
+        drift_score = calculate_drift_score(entropy=entropy_value, shift_log=shift_log)
+        oracle_entry = {
+            "timestamp": time.strftime('%Y-%m-%d %H:%M:%S'),
+            "entropy": entropy_value,
+            "vowel_count": sum(1 for c in cipher_key if c.lower() in 'aeiou'),
+            "branches": key_profile["branch_path"],
+            "drift_score": drift_score,
+            "flip_triggered": any("flip" in tag.lower() for tag in subconscious_log),
+            "subconscious_tags": subconscious_log,
+            "oracle_state": oracle_bias["state"],
+            "oracle_response": oracle_bias["response"]
+        }
+        with span("state"):
+            parasite_memory = self.state.commit(oracle_entry, memory_snapshot, drift_score, entropy_value)
+
+        package = {
+            "cipher": axiom_encrypted,
+            "shift_log": shift_log,
+            "key_hash": keys.key_hash,
+            "created_at": time.ctime(),
+            "key_profile": key_profile,
+            "subconscious": subconscious_log
+        }
+
+        with span("packaging", format=self.package_format, chars=len(axiom_encrypted)):
+            if (self.package_format == FORMAT_BINARY):
+                package["symbol_table"] = build_symbol_table(shared_log)
+                sealed = seal_binary(package, keys)
+            else:
+                package["shift_log"] = [int(s) for s in shift_log]
+                package["symbol_table"] = pack_symbol_table(shared_log)
+                sealed = seal_package(package, keys)
+
+        return {
+            "package": sealed,
+            "cipher": axiom_encrypted,
+            "shared_symbols": shared_log,
+            "drift_bar": drift_bar,
+            "fractal_entropy": fractal_entropy,
+            "fractal_drift_score": fractal_drift_score,
+            "position_bias": memory.position_bias,
+            "entropy": entropy_value,
+            "drift_score": drift_score,
+            "oracle_bias": oracle_bias,
+            "subconscious": subconscious_log,
+            "parasite_memory": parasite_memory
+        }
+
+    def decrypt(self, package, key):
+        """
+        Verify, open and fully decrypt a .bhex package back to plaintext.
+        Accepts binary v2 and stream containers (bytes) as well as JSON
+        envelopes (dict, text or bytes).
+        """
+        if (isinstance(package, (bytes, bytearray)) and detect_format(package[:4]) == FORMAT_STREAM):
+            return ''.join(self.decrypt_stream(io.BytesIO(package), key))
+        with span("open", bytes=len(package) if isinstance(package, (bytes, bytearray, str)) else None):
+            opened = open_bhex(package, key)
+        return recover_message(opened)
+
+    # === Streaming Mode ===
+    # Each chunk runs the drift and AxiomCore layers as its own message under
+    # the caller's key. Oracle/parasite memory and the display-only blur, foam
+    # and fractal stages are per-session and are not run per chunk.
+    def _encrypt_chunk(self, text, drift_key, sep):
+        message = convert_numbers_to_words(text)
+        fibonacci_sequence = generate_fibonacci_sequence(FIBONACCI_DEPTH)
+        with span("drift", chars=len(message), chunk=True):
+            encrypted, shift_log = encrypt_message_array(message, fibonacci_sequence, drift_key)
+        with span("axiomcore", chars=len(encrypted), chunk=True):
+            axiom_encrypted, shared_log = encrypt_1to1(encrypted)
+        return json.dumps({
+            "sep": sep,
+            "cipher": axiom_encrypted,
+            "shift_log": shift_log.tolist(),
+            "symbol_table": pack_symbol_table(shared_log)
+        }).encode()
+
+    def encrypt_stream(self, source, key, chunk_chars=STREAM_CHUNK_CHARS):
+        """
+        Encrypt a file object into the streaming .bhex container.
+        Yields the container as a sequence of byte strings.
+        """
+        if (not key):
+            raise ValueError("Encryption key is required.")
+        keys = self.key_context(key)
+        drift_key = keys.drift_key(key)
+
+        def payloads():
+            started = False
+            pending_space = False
+            for text in iter_text_chunks(source, chunk_chars):
+                if (not text.strip()):
+                    pending_space = True
+                    continue
+                # Words split by a chunk boundary are rejoined without a space
+                sep = ' ' if (started and (pending_space or text[0].isspace())) else ''
+                started = True
+                pending_space = text[-1].isspace()
+                yield self._encrypt_chunk(text, drift_key, sep)
+
+        return write_stream(payloads(), keys)
+
+    def decrypt_stream(self, source, key):
+        """
+        Decrypt a streaming .bhex container from a binary file object,
+        yielding plaintext pieces in order.
+        """
+        for payload in read_stream(source, key):
+            chunk = json.loads(payload)
+            yield chunk["sep"] + recover_message(chunk)
+
+    def encrypt_file(self, src_path, dst_path, key, chunk_chars=STREAM_CHUNK_CHARS):
+        with span("io", op="encrypt_file", path=src_path), open(src_path, "rb") as src, open(dst_path, "wb") as dst:
+            for block in self.encrypt_stream(src, key, chunk_chars):
+                dst.write(block)
+
+    def decrypt_file(self, src_path, dst_path, key):
+        """
+        Decrypt any .bhex format to a text file. Stream plaintext is only
+        authenticated once the trailer verifies, so it goes to dst_path + ".part"
+        and is moved into place after that; a failed decrypt leaves no output.
+        """
+        part_path = dst_path + ".part"
+        try:
+            with span("io", op="decrypt_file", path=src_path), open(src_path, "rb") as src, open(part_path, "w", encoding="utf-8") as dst:
+                if (detect_format(src.read(4)) == FORMAT_STREAM):
+                    src.seek(0)
+                    for piece in self.decrypt_stream(src, key):
+                        dst.write(piece)
+                else:
+                    src.seek(0)
+                    dst.write(self.decrypt(src.read(), key))
+            os.replace(part_path, dst_path)
+        except BaseException:
+            if (os.path.exists(part_path)):
+                os.remove(part_path)
+            raise
+
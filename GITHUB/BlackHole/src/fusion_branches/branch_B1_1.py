@@ -0,0 +1,24 @@
+# fusion_branches/branch_B1_1.py
+"""
+Branch B1.1: Cubed vowel logic.
+Applies the cube-phase shift formula across every letter of the message.
+"""
+
+import numpy as np
+
+from src.blackhole_v6 import cube_shift_vector, find_first_vowel, get_cube_from_vowel
+from src.fusion_branches.pipeline import register_stage
+
+CUBE_CYCLE = 256  # letters per cube cycle; keeps the cubes exact in float64
+
+@register_stage("B1.1", inputs=("is_alpha",), order=10)
+def apply_branch(input_data, state):
+    _, cube_mod, shift_mod = state["modifiers"]
+    y = get_cube_from_vowel(find_first_vowel(state["message"])) or 1
+    letters = np.flatnonzero(input_data.is_alpha)
+    cycle = cube_shift_vector(min(len(letters), CUBE_CYCLE), y, cube_mod, shift_mod)
+    if (len(cycle)):
+        delta = np.zeros(len(input_data), dtype=np.int64)
+        delta[letters] = np.resize(cycle, len(letters))
+        input_data.add_shifts(delta, state["weight"])
+    return input_data
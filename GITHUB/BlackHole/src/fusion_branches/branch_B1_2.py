@@ -4,6 +4,12 @@ Branch B1.2: Fibonacci-based shift and mutation rules.
 Applies recursive Fibonacci logic to input sequences for drift influence.
 """
 
+from src.blackhole_v6 import fibonacci_start_index
+from src.fusion_branches.pipeline import register_stage
+
+@register_stage("B1.2", inputs=(), order=20)
 def apply_branch(input_data, state):
-    # TODO: Apply Fibonacci-based symbolic mutation
-    return input_data
\ No newline at end of file
+    fibonacci = state["fibonacci"]
+    start_index = fibonacci_start_index(state["message"], state["words"], fibonacci, state["modifiers"][0])
+    input_data.add_shifts(fibonacci.shifts(start_index, len(input_data)), state["weight"])
+    return input_data
@@ -4,6 +4,14 @@ Branch B2.4: Boundary Blur Logic.
 Activates midpoint override to preserve balance when drift exceeds tolerance.
 """
 
+import numpy as np
+
+from src.fusion_branches.pipeline import register_stage
+
+@register_stage("B2.4", inputs=("shifts",), order=50)
 def apply_branch(input_data, state):
-    # TODO: Apply fallback midpoint logic (smoothing unstable entropy)
-    return input_data
\ No newline at end of file
+    # Shifts past tolerance fall back into the 0-25 midpoint band; heavier weights tighten it
+    tolerance = int(26 / max(state["weight"], 0.01))
+    shifts = input_data.shifts
+    np.mod(shifts, 26, out=shifts, where=np.abs(shifts) > tolerance)
+    return input_data
@@ -4,6 +4,21 @@ Branch B3.1: Manual key-based path alteration.
 Incorporates key-dependent flags and manual control layers.
 """
 
+import hashlib
+
+import numpy as np
+
+from src.fusion_branches.pipeline import register_stage
+from src.utils.key_context import DriftKey
+
+@register_stage("B3.1", inputs=(), order=30)
 def apply_branch(input_data, state):
-    # TODO: Implement key-dependent behavior mutation
-    return input_data
\ No newline at end of file
+    key = state["key"]
+    if (isinstance(key, DriftKey)):
+        digest = bytes.fromhex(key.digest("B3.1"))
+    else:
+        digest = hashlib.sha256((key + "B3.1").encode()).digest()
+    # Key bytes become a repeating shift pattern over the message
+    pattern = np.frombuffer(digest, dtype=np.uint8).astype(np.int64) % 26
+    input_data.add_shifts(np.resize(pattern, len(input_data)), state["weight"])
+    return input_data
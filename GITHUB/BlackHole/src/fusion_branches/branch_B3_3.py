@@ -4,6 +4,14 @@ Branch B3.3: Proof-Constrained Mapping.
 Applies constrained symbolic transformation with logic enforcement.
 """
 
+import numpy as np
+
+from src.fusion_branches.pipeline import register_stage
+
+@register_stage("B3.3", inputs=("is_alpha", "shifts"), order=90)
 def apply_branch(input_data, state):
-    # TODO: Inject constrained proof logic and phantom tag interactions
-    return input_data
\ No newline at end of file
+    # Constraint: only letters carry a shift, and every shift is a single turn of the alphabet
+    shifts = input_data.shifts
+    np.mod(shifts, 26, out=shifts)
+    shifts[~input_data.is_alpha] = 0
+    return input_data
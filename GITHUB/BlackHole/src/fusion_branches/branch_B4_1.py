@@ -4,6 +4,16 @@ Branch B4.1: Phantom echo chain mutations.
 Simulates echo-based drift via recursive symbolic transforms.
 """
 
+import numpy as np
+
+from src.fusion_branches.pipeline import register_stage
+
+@register_stage("B4.1", inputs=("shifts",), order=40)
 def apply_branch(input_data, state):
-    # TODO: Implement phantom echo decay and symbolic resonance
+    # Each shift echoes forward onto a later position, damped by the weight
+    lag = 1 + state["modifiers"][2]
+    shifts = input_data.shifts
+    if (len(shifts) > lag):
+        echo = np.rint(shifts[:-lag] * state["weight"]).astype(np.int64)
+        shifts[lag:] += echo
     return input_data
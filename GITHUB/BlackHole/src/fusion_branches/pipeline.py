@@ -0,0 +1,126 @@
+# fusion_branches/pipeline.py
+"""
+B5.1 Entropic Fusion runtime.
+Branches register as stages that declare which shared buffers they read and
+write. A run builds the buffers once for the whole message and passes them
+through every weighted branch in the fusion map; stages add their shifts in
+place and the cipher text is produced once at the end. Buffers a stage did
+not declare as outputs are read-only while it runs.
+"""
+
+import importlib
+import os
+import pkgutil
+
+import numpy as np
+
+BUFFERS = ("codepoints", "is_alpha", "is_upper", "shifts")
+
+_stages = {}
+_loaded = False
+
+
+class FusionBuffers:
+    """
+    Shared arrays for one fusion run, all of message length.
+      - codepoints : UTF-32 codepoints of the message (int64)
+      - is_alpha   : letter mask (only letters are shifted)
+      - is_upper   : uppercase mask
+      - shifts     : accumulated per-position shift, i.e. the shift log
+    """
+    __slots__ = BUFFERS
+
+    def __init__(self, codepoints, is_alpha, is_upper):
+        self.codepoints = codepoints
+        self.is_alpha = is_alpha
+        self.is_upper = is_upper
+        self.shifts = np.zeros(len(codepoints), dtype=np.int64)
+
+    def __len__(self):
+        return len(self.codepoints)
+
+    def add_shifts(self, delta, weight=1.0, where=None):
+        """
+        shifts += round(delta * weight), in place (optionally only `where`).
+        """
+        scaled = np.rint(np.asarray(delta, dtype=np.float64) * weight)
+        np.add(self.shifts, scaled, out=self.shifts, casting="unsafe", where=True if where is None else where)
+
+
+class Stage:
+    __slots__ = ("branch", "func", "inputs", "outputs", "order")
+
+    def __init__(self, branch, func, inputs, outputs, order):
+        self.branch = branch
+        self.func = func
+        self.inputs = inputs
+        self.outputs = outputs
+        self.order = order
+
+    def __repr__(self):
+        return f"Stage({self.branch}, {self.inputs} -> {self.outputs})"
+
+
+def register_stage(branch, inputs, outputs=("shifts",), order=0):
+    """
+    Decorator registering apply_branch(buffers, state) as fusion stage `branch`.
+    Stages in one run execute by ascending `order`.
+    """
+    unknown = (set(inputs) | set(outputs)) - set(BUFFERS)
+    if (unknown):
+        raise ValueError(f"Stage {branch} declares unknown buffers: {sorted(unknown)}")
+
+    def decorator(func):
+        _stages[branch] = Stage(branch, func, tuple(inputs), tuple(outputs), order)
+        return func
+    return decorator
+
+def load_branches():
+    """
+    Import every fusion_branches/branch_*.py once so their stages register.
+    Deferred to the first run, since branches use the engine's shift kernels.
+    """
+    global _loaded
+    if (not _loaded):
+        _loaded = True
+        for module in pkgutil.iter_modules([os.path.dirname(__file__)]):
+            if (module.name.startswith("branch_")):
+                importlib.import_module(f"src.fusion_branches.{module.name}")
+    return dict(_stages)
+
+def plan_fusion(fusion_map):
+    """
+    Stages for the branches in `fusion_map` with a positive weight, in run
+    order, and the branch names that have no registered stage.
+    """
+    stages = load_branches()
+    active = [branch for branch, weight in fusion_map.items() if float(weight) > 0]
+    plan = sorted((stages[branch] for branch in active if branch in stages), key=lambda stage: stage.order)
+    missing = [branch for branch in active if branch not in stages]
+    return plan, missing
+
+def run_fusion(buffers, fusion_map, state):
+    """
+    Run the weighted branch set over `buffers` in place. `state` is shared by
+    all stages; each stage also sees its own weight as state["weight"].
+    Returns the branches that ran.
+    """
+    plan, missing = plan_fusion(fusion_map)
+    if (missing):
+        state.setdefault("skipped", []).extend(missing)
+
+    ran = []
+    for stage in plan:
+        # Undeclared outputs are locked so a stage cannot write them by accident
+        locked = [name for name in BUFFERS if name not in stage.outputs and getattr(buffers, name).flags.writeable]
+        for name in locked:
+            getattr(buffers, name).flags.writeable = False
+        try:
+            state["weight"] = float(fusion_map[stage.branch])
+            stage.func(buffers, state)
+        finally:
+            for name in locked:
+                getattr(buffers, name).flags.writeable = True
+        ran.append(stage.branch)
+    state.pop("weight", None)
+    return ran
@@ -0,0 +1,220 @@
+# src/state_daemon.py
+"""
+BlackHole local state daemon.
+One process owns the oracle store and parasite memory and applies every
+worker's updates in order, so parallel encryptors never read-modify-write
+the state files themselves. Workers talk to it through StateClient, which
+queues commits and sends them in batches; each reply carries a fresh oracle
+window for the rotor/bias stages.
+
+Connections are authenticated with a shared key (the daemon unpickles
+what clients send, so it never listens without one): pass authkey=, or set
+BLACKHOLE_STATE_AUTHKEY on both sides.
+
+Run standalone from the project root with:  python -m src.state_daemon
+"""
+
+import argparse
+import os
+import secrets
+import sys
+import threading
+from multiprocessing.connection import Client, Listener
+
+from src.blackhole_v6 import ORACLE_MEMORY_PATH, ORACLE_WINDOW, PARASITE_MEMORY_PATH, LocalState
+
+DEFAULT_ADDRESS = r"\\.\pipe\blackhole_state" if sys.platform == "win32" else "blackhole_state.sock"
+AUTHKEY_ENV = "BLACKHOLE_STATE_AUTHKEY"
+STATE_BATCH_SIZE = 8  # commits queued per round trip
+
+
+def _authkey(authkey):
+    if (authkey is None):
+        authkey = os.environ.get(AUTHKEY_ENV)
+    if (not authkey):
+        raise ValueError(f"State daemon connections need an authkey (pass authkey= or set {AUTHKEY_ENV}).")
+    return authkey.encode() if isinstance(authkey, str) else authkey
+
+def generate_authkey():
+    return secrets.token_hex(16)
+
+def parasite_summary(memory):
+    # fractal_history is bulky and only used locally; workers just display these
+    return {k: v for k, v in memory.items() if k != "fractal_history"}
+
+
+# === Daemon ===
+class StateDaemon:
+    """
+    Serves one LocalState to many clients. Each connection gets a thread,
+    and a single lock serializes every state operation.
+    """
+
+    def __init__(self, address=DEFAULT_ADDRESS, oracle_path=ORACLE_MEMORY_PATH, parasite_path=PARASITE_MEMORY_PATH, authkey=None):
+        self.address = address
+        self.state = LocalState(oracle_path, parasite_path)
+        self.lock = threading.Lock()
+        self.stopped = threading.Event()
+        self.thread = None
+        self.authkey = _authkey(authkey)
+        if (sys.platform != "win32" and os.path.exists(address)):
+            os.remove(address)  # stale socket from a previous run
+        self.listener = Listener(address, authkey=self.authkey)
+        if (sys.platform != "win32"):
+            os.chmod(address, 0o600)  # only this user may even attempt the handshake
+
+    def handle(self, request):
+        op = request[0]
+        with self.lock:
+            if (op == "window"):
+                return {"window": self.state.oracle_window(request[1])}
+            if (op == "commit"):
+                _, updates, window = request
+                parasite_memory = None
+                for update in updates:
+                    parasite_memory = self.state.commit(*update)
+                return {
+                    "window": self.state.oracle_window(window),
+                    "parasite": parasite_summary(parasite_memory) if parasite_memory else None
+                }
+            if (op == "flush"):
+                self.state.flush()
+                return {}
+            if (op == "shutdown"):
+                self.stopped.set()
+                return {}
+        raise ValueError(f"Unknown state op: {op}")
+
+    def _serve_connection(self, conn):
+        with conn:
+            while (not self.stopped.is_set()):
+                try:
+                    request = conn.recv()
+                except (EOFError, OSError):
+                    return
+                try:
+                    conn.send(("ok", self.handle(request)))
+                except Exception as e:
+                    conn.send(("error", f"{type(e).__name__}: {e}"))
+                if (request[0] == "shutdown"):
+                    self._wake_listener()
+                    return
+
+    def _wake_listener(self):
+        # accept() has no timeout; a throwaway connection unblocks it
+        try:
+            Client(self.address, authkey=self.authkey).close()
+        except Exception:
+            pass
+
+    def serve_forever(self):
+        try:
+            while (not self.stopped.is_set()):
+                try:
+                    conn = self.listener.accept()
+                except Exception:
+                    # Failed handshakes (bad authkey) only drop that client
+                    continue
+                if (self.stopped.is_set()):
+                    conn.close()
+                    break
+                threading.Thread(target=self._serve_connection, args=(conn,), daemon=True).start()
+        finally:
+            self.close()
+
+    def start(self):
+        """
+        Serve from a background thread (used by the batch runner).
+        """
+        self.thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self.thread.start()
+        return self.thread
+
+    def stop(self):
+        """
+        Stop serving; waits for the final flush when started with start().
+        """
+        self.stopped.set()
+        self._wake_listener()
+        if (self.thread):
+            self.thread.join()
+
+    def close(self):
+        with self.lock:
+            self.state.flush()
+        self.listener.close()
+
+
+# === Client ===
+class StateClient:
+    """
+    Engine state backend that forwards to a StateDaemon.
+    Commits are queued and sent `batch_size` at a time, so the parasite
+    memory returned by commit() can trail the queued updates until the next
+    flush. The oracle window comes from the latest daemon reply.
+    """
+
+    def __init__(self, address=DEFAULT_ADDRESS, authkey=None, batch_size=STATE_BATCH_SIZE):
+        self.conn = Client(address, authkey=_authkey(authkey))
+        self.batch_size = max(1, batch_size)
+        self.pending = []
+        self.window = None
+        self.parasite = {"drift_bias": 0, "influence_count": 0, "history": []}
+
+    def _call(self, *request):
+        self.conn.send(request)
+        status, reply = self.conn.recv()
+        if (status != "ok"):
+            raise RuntimeError(f"State daemon error: {reply}")
+        return reply
+
+    def oracle_window(self, window=ORACLE_WINDOW):
+        if (self.window is None):
+            self.window = self._call("window", window)["window"]
+        # Runs still queued locally count toward the rotor's run counter
+        return {"runs": self.window["runs"], "total_runs": self.window["total_runs"] + len(self.pending)}
+
+    def commit(self, oracle_entry, fractal_snapshot, drift_score, entropy_value):
+        self.pending.append((oracle_entry, fractal_snapshot, drift_score, entropy_value))
+        if (len(self.pending) >= self.batch_size):
+            self.flush()
+        return self.parasite
+
+    def flush(self):
+        if (not self.pending):
+            return
+        reply = self._call("commit", self.pending, ORACLE_WINDOW)
+        self.pending = []
+        self.window = reply["window"]
+        if (reply["parasite"]):
+            self.parasite = reply["parasite"]
+
+    def shutdown_daemon(self):
+        self.flush()
+        self._call("shutdown")
+
+    def close(self):
+        try:
+            self.flush()
+        finally:
+            self.conn.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="BlackHole local state daemon")
+    parser.add_argument('--address', default=DEFAULT_ADDRESS, help="Unix socket path (named pipe on Windows)")
+    parser.add_argument('--oracle', default=ORACLE_MEMORY_PATH, help="Oracle store path")
+    parser.add_argument('--parasite', default=PARASITE_MEMORY_PATH, help="Parasite memory path")
+    parser.add_argument('--authkey', default=None, help=f"Shared secret for clients (default: ${AUTHKEY_ENV})")
+    args = parser.parse_args()
+
+    authkey = args.authkey or os.environ.get(AUTHKEY_ENV)
+    if (not authkey):
+        authkey = generate_authkey()
+        print(f"[STATE] No authkey given; clients must set {AUTHKEY_ENV}={authkey}", file=sys.stderr)
+    daemon = StateDaemon(args.address, args.oracle, args.parasite, authkey=authkey)
+    print(f"[STATE] Serving oracle/parasite state on {args.address}")
+    try:
+        daemon.serve_forever()
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,245 @@
+# utils/axiom_codec.py
+"""
+AxiomCore symbol codec.
+Maps (letter, case, slot) to four-letter AxiomCore symbols and back with
+positional arithmetic, instead of materializing all 26^4 symbols.
+"""
+
+import base64
+import random
+
+import numpy as np
+
+ALPHABET = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ'
+SYMBOL_WIDTH = 4
+POOL_SIZE = 1000
+UNKNOWN_INDEX = 0xFFFFFFFF
+
+_alphabets = {}
+
+def _alphabet(exclude=None):
+    # Symbols for a letter never contain that letter; dropping it from the
+    # alphabet keeps lexicographic order, so slot k is just k in base 25.
+    alphabet = _alphabets.get(exclude)
+    if (alphabet is None):
+        chars = ALPHABET.replace(exclude, '') if exclude else ALPHABET
+        alphabet = (chars, {c: i for i, c in enumerate(chars)}, np.array([ord(c) for c in chars], dtype=np.uint32))
+        _alphabets[exclude] = alphabet
+    return alphabet
+
+def symbol_from_index(index, exclude=None):
+    """
+    Return the index-th symbol (lexicographic order) that does not contain `exclude`.
+    """
+    chars, _, _ = _alphabet(exclude)
+    base = len(chars)
+    if (index < 0 or index >= base ** SYMBOL_WIDTH):
+        raise IndexError(f"Symbol index {index} out of range for base {base}.")
+    symbol = []
+    for _ in range(SYMBOL_WIDTH):
+        index, digit = divmod(index, base)
+        symbol.append(chars[digit])
+    return ''.join(reversed(symbol))
+
+def index_from_symbol(symbol, exclude=None):
+    """
+    Inverse of symbol_from_index. Returns None if the symbol is not in that ordering.
+    """
+    chars, positions, _ = _alphabet(exclude)
+    if (len(symbol) != SYMBOL_WIDTH):
+        return None
+    index = 0
+    for c in symbol:
+        digit = positions.get(c)
+        if (digit is None):
+            return None
+        index = index * len(chars) + digit
+    return index
+
+def symbol_codepoints(indices, exclude=None):
+    """
+    Vectorized symbol_from_index: an (n, SYMBOL_WIDTH) uint32 array holding
+    the codepoints of each symbol, decoded as base-25/26 digits in one pass.
+    """
+    _, _, letters = _alphabet(exclude)
+    base = len(letters)
+    indices = np.asarray(indices, dtype=np.int64)
+    weights = base ** np.arange(SYMBOL_WIDTH - 1, -1, -1, dtype=np.int64)
+    return letters[indices[:, None] // weights % base]
+
+def symbol_index(symbol):
+    """
+    Full-alphabet index of a symbol, or UNKNOWN_INDEX for anything else (e.g. 'unkn').
+    """
+    index = index_from_symbol(symbol)
+    return UNKNOWN_INDEX if index is None else index
+
+def pool_symbol(letter, case, slot):
+    """
+    Symbol for slot `slot` of a letter's 'upper' or 'lower' session pool.
+    """
+    if (slot < 0 or slot >= POOL_SIZE):
+        raise IndexError(f"Pool slot {slot} out of range.")
+    offset = 0 if case == 'upper' else POOL_SIZE
+    return symbol_from_index(offset + slot, exclude=letter.upper())
+
+def pool_slot(letter, symbol):
+    """
+    Locate a symbol inside a letter's pools. Returns (case, slot) or None.
+    """
+    index = index_from_symbol(symbol, exclude=letter.upper())
+    if (index is None or index >= 2 * POOL_SIZE):
+        return None
+    if (index < POOL_SIZE):
+        return 'upper', index
+    return 'lower', index - POOL_SIZE
+
+def pool_codepoints(letter, case, slots):
+    """
+    Vectorized pool_symbol: symbol codepoints for an array of slots.
+    """
+    offset = 0 if case == 'upper' else POOL_SIZE
+    return symbol_codepoints(np.asarray(slots, dtype=np.int64) + offset, exclude=letter.upper())
+
+
+# === Packed Shared-Symbol Table ===
+_CHAR_DTYPES = {1: '<u1', 2: '<u2', 4: '<u4'}
+_SYMBOL_WEIGHTS = len(ALPHABET) ** np.arange(SYMBOL_WIDTH - 1, -1, -1, dtype=np.int64)
+
+class SharedLog:
+    """
+    The (char, symbol) pairs of one AxiomCore encode, kept as the message
+    codepoints and an (n, SYMBOL_WIDTH) array of symbol codepoints. Iterating
+    or indexing yields (char, symbol) tuples like the old list of pairs.
+    """
+    __slots__ = ("codepoints", "symbols")
+
+    def __init__(self, codepoints, symbols):
+        self.codepoints = codepoints
+        self.symbols = symbols
+
+    def __len__(self):
+        return len(self.codepoints)
+
+    def __getitem__(self, index):
+        return chr(self.codepoints[index]), ''.join(map(chr, self.symbols[index]))
+
+    def __iter__(self):
+        return zip(map(chr, self.codepoints.tolist()), self.symbols.view(f'<U{SYMBOL_WIDTH}').ravel().tolist())
+
+    def indices(self):
+        """
+        Vectorized symbol_index over every symbol.
+        """
+        digits = self.symbols.astype(np.int64) - ord('A')
+        valid = np.all((digits >= 0) & (digits < len(ALPHABET)), axis=1)
+        return np.where(valid, digits @ _SYMBOL_WEIGHTS, UNKNOWN_INDEX).astype(np.uint32)
+
+def build_symbol_table(shared_log):
+    """
+    Pack (char, symbol) pairs into a codepoint array plus a uint32 symbol-index
+    array, as raw little-endian bytes. Codepoints use the narrowest unsigned
+    width that fits the message.
+    """
+    if (isinstance(shared_log, SharedLog)):
+        codepoints, indices = shared_log.codepoints.astype(np.uint32), shared_log.indices()
+    else:
+        codepoints = np.fromiter((ord(c) for c, _ in shared_log), dtype=np.uint32, count=len(shared_log))
+        indices = np.fromiter((symbol_index(s) for _, s in shared_log), dtype=np.uint32, count=len(shared_log))
+    peak = int(codepoints.max()) if len(codepoints) else 0
+    char_width = 1 if peak < 0x100 else 2 if peak < 0x10000 else 4
+    return {
+        "count": len(shared_log),
+        "char_width": char_width,
+        "chars": codepoints.astype(_CHAR_DTYPES[char_width]).tobytes(),
+        "symbols": indices.astype('<u4').tobytes()
+    }
+
+def pack_symbol_table(shared_log):
+    """
+    build_symbol_table with the arrays base64 encoded for the JSON package.
+    """
+    table = build_symbol_table(shared_log)
+    table["chars"] = base64.b64encode(table["chars"]).decode()
+    table["symbols"] = base64.b64encode(table["symbols"]).decode()
+    return table
+
+def unpack_symbol_table(table):
+    """
+    Inverse of build_symbol_table / pack_symbol_table; the arrays may be raw
+    bytes-like objects (used without copying) or base64 text.
+    Returns (codepoints, symbol_indices) as uint32 arrays.
+    """
+    chars, symbols = table["chars"], table["symbols"]
+    if (isinstance(chars, str)):
+        chars, symbols = base64.b64decode(chars), base64.b64decode(symbols)
+    codepoints = np.frombuffer(chars, dtype=_CHAR_DTYPES[table["char_width"]]).astype(np.uint32)
+    indices = np.frombuffer(symbols, dtype='<u4')
+    if (len(codepoints) != table["count"] or len(indices) != table["count"]):
+        raise ValueError("Shared symbol table is truncated.")
+    return codepoints, indices
+
+
+# === Lazy Session Pools ===
+FEISTEL_ROUNDS = 4
+_HALF_BITS = 5  # 2 * 5 bits = 1024 >= POOL_SIZE
+_HALF_MASK = (1 << _HALF_BITS) - 1
+
+class SessionPool:
+    """
+    Hands out the slots of one letter/case pool in a keyed pseudorandom order.
+    A small Feistel network over 10-bit indices, cycle-walked into
+    [0, POOL_SIZE), replaces shuffling all 1000 slots up front.
+    """
+
+    def __init__(self, letter, case, round_keys=None):
+        self.letter = letter.upper()
+        self.case = case
+        self.round_keys = round_keys or [random.getrandbits(32) for _ in range(FEISTEL_ROUNDS)]
+        self.issued = 0
+
+    def _feistel(self, value):
+        # Works on ints and, element-wise, on uint64 arrays (no product exceeds 2**64)
+        left, right = value >> _HALF_BITS, value & _HALF_MASK
+        for k in self.round_keys:
+            mixed = ((right * 0x9E3779B1) ^ k) & 0xFFFFFFFF
+            left, right = right, left ^ ((mixed * 0x85EBCA6B >> 16) & _HALF_MASK)
+        return (left << _HALF_BITS) | right
+
+    def permute(self, index):
+        # Cycle-walk: re-encrypt until the value falls inside the pool
+        value = self._feistel(index)
+        while (value >= POOL_SIZE):
+            value = self._feistel(value)
+        return value
+
+    def permute_range(self, start, stop):
+        """
+        permute() over start..stop-1 as one array pass; only the values still
+        outside the pool are walked again.
+        """
+        values = self._feistel(np.arange(start, stop, dtype=np.uint64))
+        walking = np.flatnonzero(values >= POOL_SIZE)
+        while (len(walking)):
+            values[walking] = self._feistel(values[walking])
+            walking = walking[values[walking] >= POOL_SIZE]
+        return values.astype(np.int64)
+
+    def take_slots(self, count):
+        """
+        Slots of the next `count` symbols; fewer once the pool is exhausted.
+        """
+        stop = min(self.issued + count, POOL_SIZE)
+        slots = self.permute_range(self.issued, stop)
+        self.issued = stop
+        return slots
+
+    def take(self):
+        """
+        Next unused symbol of this pool, or None once all slots are issued.
+        """
+        if (self.issued >= POOL_SIZE):
+            return None
+        slot = self.permute(self.issued)
+        self.issued += 1
+        return pool_symbol(self.letter, self.case, slot)
@@ -2,8 +2,194 @@
 """
 Drift modeling and volatility analysis.
 Used to calculate symbolic drift score and visualize movement.
+Shift logs are handled as NumPy arrays: summary statistics, rolling
+windows and the drift bar are all vectorized. Only legacy logs (wrapped
+int64 Fibonacci shifts, written before the Pisano residue table) fall back
+to exact integer sums and statistics.stdev, so their scores stay unchanged.
 """
 
-def compute_drift_vector(log):
-    # TODO: Analyze shift logs to derive volatility patterns
-    return []
\ No newline at end of file
+import statistics
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+DEFAULT_ROLLING_WINDOW = 32
+BAR_MARKS = np.frombuffer(b".:|", dtype=np.uint8)  # shift <= 20, <= 40, above
+BAR_LEVELS = (20, 40)
+FLOAT_EXACT = 2**53  # largest magnitude float64 holds every integer up to
+
+
+def as_drift_array(log):
+    """
+    Shift log as an integer or float array (huge Python ints become float64).
+    """
+    values = np.asarray(log)
+    if (values.dtype.kind not in "iuf"):
+        values = values.astype(np.float64)
+    return values.ravel()
+
+def drift_bar(log, limit=None):
+    """
+    One mark per shift: '|' above 40, ':' above 20, '.' otherwise.
+    """
+    values = as_drift_array(log)[:limit]
+    levels = (values > BAR_LEVELS[0]).astype(np.uint8) + (values > BAR_LEVELS[1])
+    return BAR_MARKS[levels].tobytes().decode("ascii")
+
+def drift_total(log):
+    """
+    Exact sum of the shifts (the entropy score). Logs written before the
+    Pisano residue table hold wrapped int64 Fibonacci values whose sum
+    overflows int64, so those are summed as Python ints.
+    """
+    values = np.asarray(log).ravel()
+    if (not len(values)):
+        return 0
+    if (values.dtype.kind not in "iuf"):
+        return sum(int(v) for v in values.tolist())
+    if (values.dtype.kind == "f"):
+        return values.sum().item()
+    peak = max(abs(values.max().item()), abs(values.min().item()))
+    if (peak * len(values) < 2**63):
+        return values.sum(dtype=np.int64).item()
+    return sum(values.tolist())
+
+def drift_spread(log):
+    values = as_drift_array(log)
+    if (not len(values)):
+        return 0
+    return values.max().item() - values.min().item()
+
+def drift_volatility(log):
+    """
+    Sample standard deviation of the shifts (0.0 below two values).
+    """
+    values = as_drift_array(log)
+    if (len(values) < 2):
+        return 0.0
+    if (values.dtype.kind in "iu" and max(abs(values.max().item()), abs(values.min().item())) > FLOAT_EXACT):
+        # Legacy Fibonacci logs: float64 would round the shifts, keep the exact integer result
+        return statistics.stdev(values.tolist())
+    return float(np.std(values, dtype=np.float64, ddof=1))
+
+def rolling_drift(log, window=DEFAULT_ROLLING_WINDOW):
+    """
+    Rolling mean, volatility (sample stdev) and spread (max - min) over every
+    run of `window` consecutive shifts, as float32 arrays of len(log) - window + 1.
+    Means and variances come from prefix sums of the mean-centred log, spreads
+    from reductions over a strided view (no window is copied).
+    """
+    values = as_drift_array(log)
+    window = min(window, len(values))
+    if (window < 1):
+        empty = np.zeros(0, dtype=np.float32)
+        return {"window": 0, "mean": empty, "volatility": empty, "spread": empty}
+    centre = float(values.mean())
+    centred = values.astype(np.float64) - centre
+    sums = np.concatenate(([0.0], np.cumsum(centred)))
+    squares = np.concatenate(([0.0], np.cumsum(centred * centred)))
+    total = sums[window:] - sums[:-window]
+    total_sq = squares[window:] - squares[:-window]
+    if (window > 1):
+        variance = np.maximum(total_sq - total * total / window, 0.0) / (window - 1)
+    else:
+        variance = np.zeros_like(total)
+    view = sliding_window_view(values, window)
+    return {
+        "window": window,
+        "mean": (total / window + centre).astype(np.float32),
+        "volatility": np.sqrt(variance).astype(np.float32),
+        "spread": (view.max(axis=1) - view.min(axis=1)).astype(np.float32)
+    }
+
+def compute_drift_vector(log, window=DEFAULT_ROLLING_WINDOW, bar_limit=None):
+    """
+    Everything the tools report about a shift log in one call: length, sum
+    (the entropy score), mean, volatility, spread, the drift bar and the
+    rolling arrays of rolling_drift.
+    """
+    values = as_drift_array(log)
+    return {
+        "length": len(values),
+        "entropy": drift_total(log),
+        "mean": float(values.mean()) if len(values) else 0.0,
+        "volatility": drift_volatility(values),
+        "spread": drift_spread(values),
+        "drift_bar": drift_bar(values, bar_limit),
+        "rolling": rolling_drift(values, window)
+    }
+
+
+class DriftAccumulator:
+    """
+    compute_drift_vector for a log that arrives in pieces (the chunks of a
+    streaming container): exact total, extremes, pooled mean and volatility
+    (Chan's parallel update), the first bar_limit drift marks and the peak
+    rolling volatility, with the last window - 1 shifts carried over so
+    windows span piece boundaries. A single piece gives the same numbers
+    as compute_drift_vector.
+    """
+
+    def __init__(self, window=DEFAULT_ROLLING_WINDOW, bar_limit=None):
+        self.window = window
+        self.bar_limit = bar_limit
+        self.pieces = 0
+        self.length = 0
+        self.total = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.low = None
+        self.high = None
+        self.volatility = 0.0
+        self.bar = []
+        self.tail = np.zeros(0, dtype=np.int64)
+        self.peak_rolling = None
+
+    def update(self, log):
+        values = as_drift_array(log)
+        if (not len(values)):
+            return self
+        self.pieces += 1
+        self.volatility = drift_volatility(values)
+        self.total += drift_total(values)
+        low, high = values.min().item(), values.max().item()
+        self.low = low if self.low is None else min(self.low, low)
+        self.high = high if self.high is None else max(self.high, high)
+
+        count, mean = len(values), float(values.mean())
+        m2 = float(((values.astype(np.float64) - mean) ** 2).sum())
+        combined = self.length + count
+        delta = mean - self.mean
+        self.m2 += m2 + delta * delta * self.length * count / combined
+        self.mean += delta * count / combined
+        self.length = combined
+
+        marks = sum(len(piece) for piece in self.bar)
+        if (self.bar_limit is None or marks < self.bar_limit):
+            self.bar.append(drift_bar(values, None if self.bar_limit is None else self.bar_limit - marks))
+
+        joined = np.concatenate((self.tail, values)) if len(self.tail) else values
+        if (len(joined) >= self.window):
+            peak = float(rolling_drift(joined, self.window)["volatility"].max())
+            self.peak_rolling = peak if self.peak_rolling is None else max(self.peak_rolling, peak)
+        self.tail = joined[max(len(joined) - (self.window - 1), 0):]
+        return self
+
+    def result(self):
+        if (self.pieces > 1):
+            volatility = (self.m2 / (self.length - 1)) ** 0.5
+        else:
+            volatility = self.volatility
+        peak = self.peak_rolling
+        if (peak is None and self.length):
+            # Shorter than one window: compute_drift_vector shrinks the window to the log
+            peak = float(rolling_drift(self.tail, self.window)["volatility"].max())
+        return {
+            "length": self.length,
+            "entropy": self.total,
+            "mean": self.mean,
+            "volatility": volatility,
+            "spread": self.high - self.low if self.length else 0,
+            "drift_bar": ''.join(self.bar),
+            "peak_rolling_volatility": peak if peak is not None else 0.0
+        }
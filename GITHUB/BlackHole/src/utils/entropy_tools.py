@@ -2,8 +2,315 @@
 """
 Entropy and frequency tools.
 Includes Shannon entropy, symbol density, frequency skew.
+Every metric is an accumulator fed with update(chunk) and read with
+result(), so ciphertexts of any size are scored in one streaming pass with
+bounded memory; chunks may be bytes-like or str (UTF-8 encoded).
 """
 
+import zlib
+
+import numpy as np
+
+DEFAULT_CHUNK_SIZE = 1 << 20
+DEFAULT_WINDOW = 4096  # bytes per window of the rolling entropy profile
+
+# Set bits per byte value, and bit flips inside each byte (between adjacent bits, MSB first)
+_POPCOUNT = np.unpackbits(np.arange(256, dtype=np.uint8)[:, None], axis=1).sum(axis=1).astype(np.int64)
+_INNER_RUNS = _POPCOUNT[(np.arange(256) ^ (np.arange(256) >> 1)) & 0x7F]
+
+
+def as_bytes(chunk):
+    """
+    uint8 array view of a chunk (no copy for bytes-like input).
+    """
+    if (isinstance(chunk, str)):
+        chunk = chunk.encode("utf-8")
+    return np.frombuffer(chunk, dtype=np.uint8)
+
+def entropy_from_counts(counts):
+    total = counts.sum()
+    if (not total):
+        return 0.0
+    p = counts[counts > 0] / total
+    return float(-(p * np.log2(p)).sum())
+
+
+# === Accumulators ===
+class ByteHistogram:
+    """
+    Byte value counts; entropy, skew and byte statistics derive from it.
+    """
+
+    def __init__(self):
+        self.counts = np.zeros(256, dtype=np.int64)
+
+    def update(self, chunk):
+        self.counts += np.bincount(as_bytes(chunk), minlength=256)
+        return self
+
+    @property
+    def total(self):
+        return int(self.counts.sum())
+
+    def result(self):
+        return self.counts.copy()
+
+
+class EntropyAccumulator(ByteHistogram):
+    """
+    Shannon entropy in bits per byte.
+    """
+
+    def result(self):
+        return entropy_from_counts(self.counts)
+
+
+class SkewAccumulator(ByteHistogram):
+    """
+    Frequency skew: most common / (least common + 1) over the bytes seen,
+    and the peak ratio: most common / mean frequency.
+    """
+
+    def result(self):
+        seen = self.counts[self.counts > 0]
+        if (not len(seen)):
+            return {"symbol_skew": 0.0, "peak_ratio": 0.0}
+        return {
+            "symbol_skew": int(seen.max()) / (int(seen.min()) + 1),
+            "peak_ratio": int(seen.max()) / (int(seen.sum()) / len(seen))
+        }
+
+
+class BitAccumulator:
+    """
+    Bit balance and runs over the byte stream (MSB first). Runs count the
+    bit flips between neighbouring bits, including across chunk boundaries.
+    With ascii_only, bytes >= 128 are dropped first (the NIST approximation
+    the inspector and benchmark have always used on cipher text).
+    """
+
+    def __init__(self, ascii_only=False):
+        self.ascii_only = ascii_only
+        self.ones = 0
+        self.bits = 0
+        self.runs = 0
+        self.last_byte = None
+
+    def update(self, chunk):
+        data = as_bytes(chunk)
+        if (self.ascii_only):
+            data = data[data < 128]
+        if (not len(data)):
+            return self
+        self.ones += int(_POPCOUNT[data].sum())
+        self.bits += 8 * len(data)
+        self.runs += int(_INNER_RUNS[data].sum())
+        # Flip between the last bit of one byte and the first bit of the next
+        self.runs += int(np.count_nonzero((data[:-1] & 1) != (data[1:] >> 7)))
+        if (self.last_byte is not None):
+            self.runs += int((self.last_byte & 1) != (data[0] >> 7))
+        self.last_byte = int(data[-1])
+        return self
+
+    def result(self):
+        return {
+            "bit_ones": self.ones,
+            "bit_zeros": self.bits - self.ones,
+            "bit_ratio": self.ones / self.bits if self.bits else 0.0,
+            "bit_runs": self.runs,
+            "bit_length": self.bits
+        }
+
+
+class CompressionAccumulator:
+    """
+    zlib compressed size / raw size, compressed incrementally.
+    """
+
+    def __init__(self, level=zlib.Z_DEFAULT_COMPRESSION):
+        self.compressor = zlib.compressobj(level)
+        self.raw = 0
+        self.compressed = 0
+
+    def update(self, chunk):
+        data = chunk.encode("utf-8") if isinstance(chunk, str) else chunk
+        self.raw += len(data)
+        self.compressed += len(self.compressor.compress(data))
+        return self
+
+    def result(self):
+        if (not self.raw):
+            return 1.0
+        # Flush a copy so the stream can keep accepting chunks
+        return (self.compressed + len(self.compressor.copy().flush())) / self.raw
+
+
+class WindowedEntropy:
+    """
+    Rolling Shannon entropy and bit ratio over windows of `window` bytes
+    starting every `hop` bytes (window must be a multiple of hop). The stream
+    is cut into hop-sized blocks whose histograms are counted once; each
+    window histogram is the previous one plus the newest block minus the
+    oldest (done as a prefix-sum difference per chunk), so the cost is O(n)
+    plus O(256) per window instead of re-counting every window.
+    result(worst) returns float32 per-window arrays (with their start
+    offsets) and the `worst` lowest-entropy windows. Bytes past the last hop
+    are covered by one extra window aligned to the end of the data; input
+    shorter than a window has no windows (min_entropy / max_bit_bias are
+    None) and is scored as a single "partial" window instead.
+    """
+
+    def __init__(self, window=DEFAULT_WINDOW, hop=None):
+        hop = hop or max(window // 2, 1)
+        if (window < 1 or window % hop):
+            raise ValueError(f"window ({window}) must be a positive multiple of hop ({hop})")
+        self.window = window
+        self.hop = hop
+        self.span = window // hop
+        self.pending = np.zeros(0, dtype=np.uint8)
+        # Histograms / set-bit counts of the last span - 1 blocks, shared with the next chunk
+        self.history = np.zeros((0, 256), dtype=np.int64)
+        self.history_ones = np.zeros(0, dtype=np.int64)
+        self.entropy = []
+        self.bit_ratio = []
+        self.total = 0
+        self.recent = np.zeros(0, dtype=np.uint8)  # last `window` bytes, for the end-aligned window
+
+    def update(self, chunk):
+        raw = as_bytes(chunk)
+        self.total += len(raw)
+        self.recent = np.concatenate((self.recent, raw[-self.window:]))[-self.window:]
+        data = np.concatenate((self.pending, raw))
+        blocks = len(data) // self.hop
+        self.pending = data[blocks * self.hop:].copy()
+        if (not blocks):
+            return self
+        block_bytes = data[:blocks * self.hop].reshape(blocks, self.hop)
+        index = (np.arange(blocks, dtype=np.int64)[:, None] << 8) + block_bytes
+        counts = np.bincount(index.ravel(), minlength=blocks * 256).reshape(blocks, 256)
+        ones = _POPCOUNT[block_bytes].sum(axis=1)
+
+        counts = np.concatenate((self.history, counts))
+        ones = np.concatenate((self.history_ones, ones))
+        ends = np.arange(max(self.span, len(self.history) + 1), len(counts) + 1)
+        if (len(ends)):
+            cum = np.zeros((len(counts) + 1, 256), dtype=np.int64)
+            np.cumsum(counts, axis=0, out=cum[1:])
+            cum_ones = np.concatenate(([0], np.cumsum(ones)))
+            windows = cum[ends] - cum[ends - self.span]
+            weighted = (windows * np.log2(np.maximum(windows, 1))).sum(axis=1)
+            self.entropy.append((np.log2(self.window) - weighted / self.window).astype(np.float32))
+            self.bit_ratio.append(((cum_ones[ends] - cum_ones[ends - self.span]) / (8 * self.window)).astype(np.float32))
+        keep = max(len(counts) - (self.span - 1), 0)
+        self.history = counts[keep:]
+        self.history_ones = ones[keep:]
+        return self
+
+    def _score_recent(self):
+        counts = np.bincount(self.recent, minlength=256)
+        return entropy_from_counts(counts), int(_POPCOUNT[self.recent].sum()) / (8 * len(self.recent))
+
+    def result(self, worst=5):
+        entropy = np.concatenate(self.entropy) if self.entropy else np.zeros(0, dtype=np.float32)
+        bit_ratio = np.concatenate(self.bit_ratio) if self.bit_ratio else np.zeros(0, dtype=np.float32)
+        starts = np.arange(len(entropy), dtype=np.int64) * self.hop
+        partial = None
+        covered = int(starts[-1]) + self.window if len(starts) else 0
+        if (self.total >= self.window and self.total > covered):
+            tail_entropy, tail_ratio = self._score_recent()
+            entropy = np.append(entropy, np.float32(tail_entropy))
+            bit_ratio = np.append(bit_ratio, np.float32(tail_ratio))
+            starts = np.append(starts, self.total - self.window)
+        elif (0 < self.total < self.window):
+            tail_entropy, tail_ratio = self._score_recent()
+            partial = {"start": 0, "end": self.total, "entropy": round(tail_entropy, 4), "bit_ratio": round(tail_ratio, 4)}
+        ranked = np.argsort(entropy, kind="stable")[:worst]
+        return {
+            "window": self.window,
+            "hop": self.hop,
+            "windows": len(entropy),
+            "starts": starts,
+            "entropy": entropy,
+            "bit_ratio": bit_ratio,
+            "min_entropy": float(entropy.min()) if len(entropy) else None,
+            "max_bit_bias": float(np.abs(bit_ratio - 0.5).max()) if len(bit_ratio) else None,
+            "partial": partial,
+            "worst": [{
+                "start": int(starts[i]),
+                "end": int(starts[i]) + self.window,
+                "entropy": round(float(entropy[i]), 4),
+                "bit_ratio": round(float(bit_ratio[i]), 4)
+            } for i in ranked]
+        }
+
+
+class CipherMetrics:
+    """
+    All of the above in one pass: update(chunk) feeds each accumulator once.
+    """
+
+    def __init__(self, ascii_bits=False, compression=True):
+        self.histogram = ByteHistogram()
+        self.bits = BitAccumulator(ascii_only=ascii_bits)
+        self.compression = CompressionAccumulator() if compression else None
+
+    def update(self, chunk):
+        data = as_bytes(chunk)
+        self.histogram.update(data)
+        self.bits.update(data)
+        if (self.compression):
+            self.compression.update(data)
+        return self
+
+    def result(self):
+        counts = self.histogram.counts
+        total = int(counts.sum())
+        seen = counts[counts > 0]
+        values = np.arange(256)
+        mean = float((values * counts).sum() / total) if total else 0.0
+        variance = float((((values - mean) ** 2) * counts).sum() / (total - 1)) if total > 1 else 0.0
+        report = {
+            "bytes": total,
+            "distinct_bytes": len(seen),
+            "entropy": entropy_from_counts(counts),
+            "symbol_skew": int(seen.max()) / (int(seen.min()) + 1) if len(seen) else 0.0,
+            "peak_ratio": int(seen.max()) / (total / len(seen)) if len(seen) else 0.0,
+            "byte_mean": mean,
+            "byte_stddev": variance ** 0.5
+        }
+        report.update(self.bits.result())
+        if (self.compression):
+            report["compression_ratio"] = self.compression.result()
+        return report
+
+
+# === One-Shot Helpers ===
+def iter_chunks(data, chunk_size=DEFAULT_CHUNK_SIZE):
+    view = memoryview(data.encode("utf-8") if isinstance(data, str) else data)
+    for start in range(0, len(view), chunk_size):
+        yield view[start:start + chunk_size]
+
+def score_chunks(chunks, **options):
+    metrics = CipherMetrics(**options)
+    for chunk in chunks:
+        metrics.update(chunk)
+    return metrics.result()
+
+def score_file(path, chunk_size=DEFAULT_CHUNK_SIZE, **options):
+    """
+    Stream a file through CipherMetrics without loading it whole.
+    """
+    with open(path, "rb") as f:
+        return score_chunks(iter(lambda: f.read(chunk_size), b""), **options)
+
+def entropy_profile(data, window=DEFAULT_WINDOW, hop=None, worst=5):
+    profile = WindowedEntropy(window, hop)
+    for chunk in iter_chunks(data):
+        profile.update(chunk)
+    return profile.result(worst)
+
 def calculate_shannon_entropy(data):
-    # TODO: Calculate entropy based on symbol frequencies
-    return 0.0
+    metrics = EntropyAccumulator()
+    for chunk in iter_chunks(data):
+        metrics.update(chunk)
+    return metrics.result()
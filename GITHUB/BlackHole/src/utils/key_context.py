@@ -0,0 +1,229 @@
+# utils/key_context.py
+"""
+Password key derivation.
+A KeyContext runs one tunable KDF (scrypt, or PBKDF2 where scrypt is not
+available) over the password and derives every sub-key the pipeline needs
+from that single result with HMAC-SHA256: the AES and HMAC keys of the
+.bhex envelope, the key verifier and the drift-stage modifiers and seeds.
+Contexts are kept in a bounded, locked LRU keyed on a per-process HMAC of
+the password; evicted contexts are dropped (callers may still hold them),
+and only clear_key_cache() zeroes key material.
+"""
+
+import hashlib
+import hmac
+import os
+import struct
+import threading
+from collections import OrderedDict
+
+KDF_LEGACY = 0  # bare SHA-256 of the password, as in packages written before KeyContext
+KDF_SCRYPT = 1
+KDF_PBKDF2 = 2
+DEFAULT_KDF = KDF_SCRYPT if hasattr(hashlib, "scrypt") else KDF_PBKDF2
+DEFAULT_COSTS = {
+    KDF_SCRYPT: 14,  # log2(N), r=8, p=1
+    KDF_PBKDF2: 200_000  # iterations
+}
+# Upper bounds for costs read from a package header. The header is only
+# authenticated after the key is derived, so a forged cost must not be
+# able to stall the reader (PBKDF2) or exhaust its memory (scrypt, 1 GiB at 20).
+MAX_COSTS = {
+    KDF_SCRYPT: 20,
+    KDF_PBKDF2: 10_000_000
+}
+SALT_SIZE = 16
+KEY_CACHE_SIZE = 32
+
+# kdf id | cost | salt, stored in the .bhex header
+KDF_PARAMS = struct.Struct(">BI16s")
+
+_contexts = OrderedDict()
+_contexts_lock = threading.RLock()
+_CACHE_SALT = os.urandom(16)  # cache keys are HMACs of the password, never the password itself
+
+
+def _derive_master(password, kdf, cost, salt):
+    secret = password.encode()
+    if (kdf == KDF_LEGACY):
+        return hashlib.sha256(secret).digest()
+    if (kdf == KDF_SCRYPT):
+        n = 1 << cost
+        return hashlib.scrypt(secret, salt=salt, n=n, r=8, p=1, maxmem=256 * n * 8 + (1 << 20), dklen=32)
+    if (kdf == KDF_PBKDF2):
+        return hashlib.pbkdf2_hmac("sha256", secret, salt, cost, dklen=32)
+    raise ValueError(f"Unknown KDF id {kdf}.")
+
+
+def check_kdf_params(kdf, cost):
+    """
+    Reject unknown KDF ids and costs outside 1..MAX_COSTS before deriving.
+    """
+    if (kdf == KDF_LEGACY):
+        return
+    if (kdf not in MAX_COSTS):
+        raise ValueError(f"Unknown KDF id {kdf}.")
+    if (not 1 <= cost <= MAX_COSTS[kdf]):
+        raise ValueError(f"KDF cost {cost} is outside 1..{MAX_COSTS[kdf]} for KDF id {kdf}.")
+
+
+class DriftKey(str):
+    """
+    The cipher key text (a str, so the character-profile stages keep
+    working) carrying pre-derived material for the hash-seeded stages.
+    """
+
+    def __new__(cls, text, material):
+        self = super().__new__(cls, text)
+        self.material = material
+        digits = material.hex()
+        nums = [int(char, 16)**2 for char in digits[:16]]
+        self.modifiers = (sum(nums[:5]) % 1000, sum(nums[5:10]) % 7, sum(nums[10:]) % 3)
+        self.noise_seed = int.from_bytes(hmac.digest(material, b"planck-noise", "sha256"), "big")
+        return self
+
+    def digest(self, label):
+        """
+        Hex digest of `label` under this key (replaces sha256(key + label)).
+        """
+        return hmac.digest(self.material, label.encode(), "sha256").hex()
+
+
+class KeyContext:
+    """
+    Derived keys for one password under one set of KDF parameters.
+    Key material is held in bytearrays so wipe() can zero it in place; a
+    wiped context raises ValueError instead of handing out zeroed keys.
+    Zeroing is best effort: copies made by hashlib or the AES backend are
+    outside our reach.
+    """
+
+    def __init__(self, password, kdf=DEFAULT_KDF, cost=None, salt=None):
+        if (not password):
+            raise ValueError("Encryption key is required.")
+        self.kdf = kdf
+        self.cost = 0 if kdf == KDF_LEGACY else (cost or DEFAULT_COSTS.get(kdf))
+        check_kdf_params(self.kdf, self.cost)
+        self.salt = b"\0" * SALT_SIZE if kdf == KDF_LEGACY else (salt or os.urandom(SALT_SIZE))
+        self.wiped = False
+        self._master = bytearray(_derive_master(password, self.kdf, self.cost, self.salt))
+        if (kdf == KDF_LEGACY):
+            # Legacy packages used the one SHA-256 digest for AES and HMAC
+            self._aes_key = bytearray(self._master)
+            self._mac_key = bytearray(self._master)
+        else:
+            self._aes_key = self.subkey("aes")
+            self._mac_key = self.subkey("hmac")
+        self.key_hash = self.subkey("key-hash").hex()
+        self._drift_keys = {}
+
+    def _live(self, buf):
+        if (self.wiped):
+            raise ValueError("Key context has been wiped; derive a new one.")
+        return buf
+
+    @property
+    def master(self):
+        return self._live(self._master)
+
+    @property
+    def aes_key(self):
+        return self._live(self._aes_key)
+
+    @property
+    def mac_key(self):
+        return self._live(self._mac_key)
+
+    @property
+    def params(self):
+        """
+        Packed KDF parameters for the package header.
+        """
+        return KDF_PARAMS.pack(self.kdf, self.cost, self.salt)
+
+    def subkey(self, label, context=""):
+        return bytearray(hmac.digest(self.master, f"{label}|{context}".encode(), "sha256"))
+
+    def drift_key(self, text, salt=""):
+        """
+        DriftKey for the cipher key text `text`, whose rotor salt is `salt`.
+        """
+        drift = self._drift_keys.get(salt)
+        if (drift is None or drift != text):
+            drift = DriftKey(text, bytes(self.subkey("drift", salt)))
+            self._drift_keys[salt] = drift
+        return drift
+
+    def wipe(self):
+        self.wiped = True
+        for buf in (self._master, self._aes_key, self._mac_key):
+            buf[:] = bytes(len(buf))
+        self._drift_keys.clear()
+
+
+# === Bounded Context Cache ===
+def _password_id(password):
+    return hmac.digest(_CACHE_SALT, password.encode(), "sha256")
+
+def _cache_get(cache_key):
+    context = _contexts.get(cache_key)
+    if (context is not None):
+        _contexts.move_to_end(cache_key)
+    return context
+
+def _cache_put(cache_key, context):
+    # Evicted contexts are only dropped: an engine or another thread may still be using one
+    _contexts[cache_key] = context
+    _contexts.move_to_end(cache_key)
+    while (len(_contexts) > KEY_CACHE_SIZE):
+        _contexts.popitem(last=False)
+
+def encryption_context(password, kdf=DEFAULT_KDF, cost=None):
+    """
+    Context for sealing new packages. One salt is drawn per password, KDF
+    and cost for the life of the cache entry, so a batch under a single
+    password derives once.
+    """
+    password_id = _password_id(password)
+    cache_key = ("seal", password_id, kdf, cost)
+    with _contexts_lock:
+        context = _cache_get(cache_key)
+    if (context is None):
+        # Derived outside the lock so one slow KDF never stalls other passwords
+        context = KeyContext(password, kdf, cost)
+        with _contexts_lock:
+            # Keep the first context if another thread got here meanwhile: one salt per password
+            context = _cache_get(cache_key) or context
+            # A sealing context is also cached for opening its own packages
+            _cache_put(("open", password_id, context.kdf, context.cost, context.salt), context)
+            _cache_put(cache_key, context)
+    return context
+
+def opening_context(password, params=None):
+    """
+    Context for opening a package sealed with `params` (packed KDF_PARAMS),
+    or with the legacy SHA-256 key if params is None. Header parameters are
+    bounds-checked before anything is derived.
+    """
+    kdf, cost, salt = KDF_PARAMS.unpack(params) if params else (KDF_LEGACY, 0, b"\0" * SALT_SIZE)
+    check_kdf_params(kdf, cost)
+    cache_key = ("open", _password_id(password), kdf, cost, salt)
+    with _contexts_lock:
+        context = _cache_get(cache_key)
+    if (context is None):
+        context = KeyContext(password, kdf, cost, salt)
+        with _contexts_lock:
+            context = _cache_get(cache_key) or context
+            _cache_put(cache_key, context)
+    return context
+
+def clear_key_cache():
+    """
+    Drop and zero every cached context. Contexts still held elsewhere
+    raise ValueError on their next use.
+    """
+    with _contexts_lock:
+        contexts = list(_contexts.values())
+        _contexts.clear()
+    for context in contexts:
+        context.wipe()
@@ -0,0 +1,107 @@
+# utils/oracle_store.py
+"""
+Oracle memory store.
+Keeps the oracle run history in a local SQLite database (WAL mode) so that
+appending a run and reading the last few runs do not depend on history size.
+Old runs are compacted away periodically, and a legacy oracle_memory.json is
+imported once on first open.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+
+ORACLE_RETAIN_RUNS = 5000  # runs kept after compaction
+ORACLE_COMPACT_EVERY = 500  # appends between compactions
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+class OracleStore:
+    """
+    Append-only oracle run log.
+    Run ids are AUTOINCREMENT, so `count()` keeps reporting the total number
+    of runs ever recorded even after old rows are compacted away.
+    """
+
+    def __init__(self, path, legacy_path=None, retain=ORACLE_RETAIN_RUNS, compact_every=ORACLE_COMPACT_EVERY):
+        self.path = path
+        self.retain = retain
+        self.compact_every = compact_every
+        # Callers serialize access (the state daemon uses one store from several threads)
+        self.conn = sqlite3.connect(path, timeout=30, isolation_level=None, check_same_thread=False)
+        self.conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("CREATE TABLE IF NOT EXISTS runs (id INTEGER PRIMARY KEY AUTOINCREMENT, data TEXT NOT NULL)")
+        if (legacy_path and os.path.exists(legacy_path)):
+            self.migrate(legacy_path)
+
+    def migrate(self, legacy_path):
+        """
+        One-time import of a legacy {"runs": [...]} JSON file. The file is
+        renamed to *.migrated afterwards so it is never imported twice.
+        """
+        with self.conn:
+            # The write lock serializes migrating processes: whoever gets it
+            # second finds the file already renamed and has nothing to do
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                with open(legacy_path, "r") as f:
+                    runs = json.load(f).get("runs", [])
+            except FileNotFoundError:
+                return
+            if (self.count() == 0):
+                self.conn.executemany("INSERT INTO runs (data) VALUES (?)", ((json.dumps(run),) for run in runs))
+            os.replace(legacy_path, legacy_path + ".migrated")
+        self.compact()
+
+    def append(self, run):
+        run_id = self.conn.execute("INSERT INTO runs (data) VALUES (?)", (json.dumps(run),)).lastrowid
+        if (self.compact_every and run_id % self.compact_every == 0):
+            self.compact()
+        return run_id
+
+    def count(self):
+        row = self.conn.execute("SELECT seq FROM sqlite_sequence WHERE name = 'runs'").fetchone()
+        return row[0] if row else 0
+
+    def tail(self, n=None):
+        """
+        The last n runs, oldest first (all retained runs if n is None).
+        """
+        if (n is None):
+            rows = self.conn.execute("SELECT data FROM runs ORDER BY id").fetchall()
+            return [json.loads(data) for data, in rows]
+        rows = self.conn.execute("SELECT data FROM runs ORDER BY id DESC LIMIT ?", (n,)).fetchall()
+        return [json.loads(data) for data, in reversed(rows)]
+
+    def compact(self):
+        """
+        Drop everything but the newest `retain` runs and release the pages.
+        """
+        self.conn.execute("DELETE FROM runs WHERE id <= ?", (self.count() - self.retain,))
+        self.conn.execute("PRAGMA incremental_vacuum")
+        self.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    def close(self):
+        self.conn.close()
+
+
+def legacy_json_path(path):
+    return os.path.splitext(path)[0] + ".json"
+
+def get_oracle_store(path):
+    """
+    Shared OracleStore for `path` in this process (connections are never
+    reused across a fork). Migrates the sibling .json file on first open.
+    """
+    cache_key = (os.getpid(), os.path.abspath(path))
+    with _stores_lock:
+        store = _stores.get(cache_key)
+        if (store is None):
+            legacy_path = legacy_json_path(path)
+            store = OracleStore(path, legacy_path=legacy_path if legacy_path != path else None)
+            _stores[cache_key] = store
+    return store
@@ -1,18 +1,345 @@
 # utils/package_utils.py
 """
 .bhex Packaging Tools.
-Handles AES encryption, padding, base64 encoding, and HMAC integrity.
+Handles AES encryption, padding, base64 encoding, and HMAC integrity for the
+binary (v2) and legacy JSON envelopes, plus the framed streaming container
+for inputs too large to hold in memory.
 """
-import base64, json
-from cryptography.hazmat.primitives import hashes, hmac, padding as sympad
-from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
-from cryptography.hazmat.backends import default_backend
+import base64
+import hashlib
+import hmac
+import json
 import os
+import struct
 
-def encrypt_bhex(plaintext, password):
-    # TODO: Encrypt to bhex using AES and add HMAC
-    return {}
+import numpy as np
+from Crypto.Cipher import AES
+from Crypto.Random import get_random_bytes
 
-def decrypt_bhex(package, password):
-    # TODO: Decrypt and validate package integrity
-    return ""
\ No newline at end of file
+from src.utils.key_context import KDF_PARAMS, KeyContext, encryption_context, opening_context
+
+FORMAT_JSON = "json"
+FORMAT_BINARY = "binary"
+FORMAT_STREAM = "stream"
+_HMAC_SIZE = 32
+
+# === AES / HMAC Primitives ===
+def pad(data):
+    padding_len = 16 - (len(data) % 16)
+    return data + bytes([padding_len]) * padding_len
+
+def unpad(data):
+    padding_len = data[-1]
+    #  Validate padding
+    if (padding_len < 1 or padding_len > 16):
+        raise ValueError("Invalid padding.")
+    return data[:-padding_len]
+
+def encrypt_aes(data_bytes, key):
+    iv = get_random_bytes(16)
+    cipher = AES.new(key, AES.MODE_CBC, iv)
+    encrypted = cipher.encrypt(pad(data_bytes))
+    return iv, encrypted
+
+def decrypt_aes(encrypted_bytes, key, iv):
+    cipher = AES.new(key, AES.MODE_CBC, iv)
+    decrypted = cipher.decrypt(encrypted_bytes)
+    return unpad(decrypted)
+
+def generate_hmac(data_bytes, key):
+    return hmac.new(key, data_bytes, hashlib.sha256).digest()
+
+def verify_hmac(data_bytes, key, received_hmac):
+    expected = generate_hmac(data_bytes, key)
+    return hmac.compare_digest(expected, received_hmac)
+
+def password_key(key):
+    # Legacy key for packages without KDF parameters
+    return hashlib.sha256(key.encode()).digest()
+
+def sealing_keys(key):
+    """
+    KeyContext for sealing: `key` may be a password or a KeyContext.
+    """
+    return key if isinstance(key, KeyContext) else encryption_context(key)
+
+def opening_keys(key, params):
+    """
+    KeyContext for opening a package sealed with `params` (None = legacy).
+    """
+    if (isinstance(key, KeyContext)):
+        if ((params or None) != (key.params if key.kdf else None)):
+            raise ValueError("Key context does not match the package KDF parameters.")
+        return key
+    return opening_context(key, params)
+
+
+# === JSON Envelope (format 1) ===
+def seal_package(package, key):
+    """
+    Encrypt and HMAC an inner package dict into the .bhex envelope.
+    """
+    package_bytes = json.dumps(package).encode()
+    keys = sealing_keys(key)
+    iv, encrypted_package = encrypt_aes(package_bytes, keys.aes_key)
+    hmac_signature = generate_hmac(encrypted_package, keys.mac_key)
+
+    return {
+        "kdf": base64.b64encode(keys.params).decode(),
+        "iv": base64.b64encode(iv).decode(),
+        "cipher": base64.b64encode(encrypted_package).decode(),
+        "hmac": base64.b64encode(hmac_signature).decode()
+    }
+
+def parse_bhex(data):
+    """
+    Accept a .bhex envelope as a dict, JSON text or raw bytes.
+    """
+    if (isinstance(data, (bytes, bytearray))):
+        data = data.decode()
+    if (isinstance(data, str)):
+        data = json.loads(data)
+    return data
+
+def open_package(secure_package, key):
+    """
+    Verify and decrypt a .bhex envelope back into its inner package dict.
+    Raises ValueError if the HMAC does not match.
+    """
+    secure_package = parse_bhex(secure_package)
+    iv = base64.b64decode(secure_package['iv'])
+    cipher_data = base64.b64decode(secure_package['cipher'])
+    received_hmac = base64.b64decode(secure_package['hmac'])
+    params = base64.b64decode(secure_package['kdf']) if secure_package.get('kdf') else None
+
+    keys = opening_keys(key, params)
+    if (not verify_hmac(cipher_data, keys.mac_key, received_hmac)):
+        raise ValueError("HMAC verification failed. The file may have been tampered with.")
+
+    return json.loads(decrypt_aes(cipher_data, keys.aes_key, iv).decode())
+
+
+# === Binary Envelope (format 2) ===
+# Layout:
+#   header   : magic "BHX2" | version u8 | flags u8 | iv (16) | payload length u32
+#   kdf      : kdf id u8 | cost u32 | salt (16), present when flags & FLAG_KDF
+#   payload  : AES-CBC ciphertext
+#   hmac     : HMAC-SHA256 over header + kdf + payload (32)
+# The decrypted payload is a run of length-prefixed sections (tag 4s | length u32):
+#   META  JSON of the descriptive fields (key_hash, created_at, key_profile, ...)
+#   CIPH  UTF-8 AxiomCore cipher text
+#   SHFT  width u8 | little-endian signed shift log
+#   SYMT  char width u8 | count u32 | codepoints | uint32 symbol indices
+BINARY_MAGIC = b"BHX2"
+BINARY_VERSION = 2
+FLAG_KDF = 0x01  # KDF parameters follow the header; without it the key is legacy SHA-256
+_BINARY_HEADER = struct.Struct(">4sBB16sI")
+_SECTION_HEADER = struct.Struct(">4sI")
+_SYMBOL_TABLE_HEADER = struct.Struct(">BI")
+_SHIFT_DTYPES = {1: '<i1', 2: '<i2', 4: '<i4', 8: '<i8'}
+_BINARY_FIELDS = ("cipher", "shift_log", "symbol_table")
+
+def _section(tag, data):
+    return _SECTION_HEADER.pack(tag, len(data)) + data
+
+def _shift_section(shift_log):
+    shifts = np.asarray(shift_log, dtype=np.int64)
+    span = max(int(shifts.max()), -int(shifts.min()) - 1) if len(shifts) else 0
+    width = 1 if span < 0x80 else 2 if span < 0x8000 else 4 if span < 0x80000000 else 8
+    return bytes([width]) + shifts.astype(_SHIFT_DTYPES[width]).tobytes()
+
+def encode_sections(package):
+    """
+    Serialize an inner package into binary sections. `symbol_table` must hold
+    raw bytes (see axiom_codec.build_symbol_table).
+    """
+    meta = {k: v for k, v in package.items() if k not in _BINARY_FIELDS}
+    parts = [
+        _section(b"META", json.dumps(meta).encode()),
+        _section(b"CIPH", package["cipher"].encode()),
+        _section(b"SHFT", _shift_section(package["shift_log"]))
+    ]
+    table = package.get("symbol_table")
+    if (table):
+        parts.append(_section(b"SYMT", _SYMBOL_TABLE_HEADER.pack(table["char_width"], table["count"]) + table["chars"] + table["symbols"]))
+    return b"".join(parts)
+
+def decode_sections(payload):
+    """
+    Parse binary sections back into an inner package dict. Array fields are
+    NumPy/memoryview slices of `payload`, not copies.
+    """
+    view = memoryview(payload)
+    package = {}
+    offset = 0
+    while (offset < len(view)):
+        tag, length = _SECTION_HEADER.unpack_from(view, offset)
+        offset += _SECTION_HEADER.size
+        body = view[offset:offset + length]
+        if (len(body) != length):
+            raise ValueError("Truncated .bhex section.")
+        offset += length
+
+        if (tag == b"META"):
+            package.update(json.loads(bytes(body)))
+        elif (tag == b"CIPH"):
+            package["cipher"] = str(body, "utf-8")
+        elif (tag == b"SHFT"):
+            package["shift_log"] = np.frombuffer(body[1:], dtype=_SHIFT_DTYPES[body[0]])
+        elif (tag == b"SYMT"):
+            char_width, count = _SYMBOL_TABLE_HEADER.unpack_from(body)
+            chars_end = _SYMBOL_TABLE_HEADER.size + count * char_width
+            package["symbol_table"] = {
+                "count": count,
+                "char_width": char_width,
+                "chars": body[_SYMBOL_TABLE_HEADER.size:chars_end],
+                "symbols": body[chars_end:chars_end + count * 4]
+            }
+        # Unknown sections are skipped so newer writers stay readable
+    return package
+
+def seal_binary(package, key):
+    """
+    Encrypt and HMAC an inner package into a binary v2 .bhex blob.
+    """
+    keys = sealing_keys(key)
+    iv, encrypted = encrypt_aes(encode_sections(package), keys.aes_key)
+    header = _BINARY_HEADER.pack(BINARY_MAGIC, BINARY_VERSION, FLAG_KDF, iv, len(encrypted)) + keys.params
+    return header + encrypted + generate_hmac(header + encrypted, keys.mac_key)
+
+def read_binary_envelope(data):
+    """
+    Split a binary v2 blob into its envelope fields without copying.
+    Returns a dict with memoryview slices for the signed region and payload.
+    """
+    view = memoryview(data)
+    magic, version, flags, iv, length = _BINARY_HEADER.unpack_from(view)
+    if (magic != BINARY_MAGIC):
+        raise ValueError("Not a binary .bhex package.")
+    if (version != BINARY_VERSION):
+        raise ValueError(f"Unsupported .bhex version {version}.")
+    start = _BINARY_HEADER.size + (KDF_PARAMS.size if flags & FLAG_KDF else 0)
+    end = start + length
+    if (len(view) < end + _HMAC_SIZE):
+        raise ValueError("Truncated .bhex package.")
+    return {
+        "version": version,
+        "iv": iv,
+        "kdf": bytes(view[_BINARY_HEADER.size:start]) or None,
+        "signed": view[:end],
+        "cipher": view[start:end],
+        "hmac": bytes(view[end:end + _HMAC_SIZE])
+    }
+
+def open_binary(data, key):
+    """
+    Verify and decrypt a binary v2 .bhex blob into its inner package dict.
+    Raises ValueError if the HMAC does not match.
+    """
+    envelope = read_binary_envelope(data)
+    keys = opening_keys(key, envelope["kdf"])
+    if (not verify_hmac(envelope["signed"], keys.mac_key, envelope["hmac"])):
+        raise ValueError("HMAC verification failed. The file may have been tampered with.")
+    return decode_sections(decrypt_aes(envelope["cipher"], keys.aes_key, envelope["iv"]))
+
+def open_bhex(data, key):
+    """
+    Open a single-package .bhex of either format (binary v2 or JSON).
+    """
+    if (isinstance(data, (bytes, bytearray, memoryview)) and detect_format(data[:4]) == FORMAT_BINARY):
+        return open_binary(data, key)
+    if (isinstance(data, (bytes, bytearray, memoryview)) and detect_format(data[:4]) == FORMAT_STREAM):
+        raise ValueError("Streaming .bhex containers must be read with read_stream().")
+    return open_package(bytes(data) if isinstance(data, memoryview) else data, key)
+
+
+# === Streaming Container ===
+# Layout:
+#   header  : magic "BHXS" | version u8 | flags u8 | stream id (16 bytes)
+#   kdf     : KDF parameters as in the binary envelope, when flags & FLAG_KDF
+#   chunk   : "C" | seq u64 | iv (16) | length u32 | AES-CBC payload | HMAC (32)
+#   trailer : "T" | chunk count u64 | HMAC (32)
+# Every HMAC covers the stream id and the record fields, so chunks cannot be
+# reordered, dropped or spliced in from another stream without detection.
+
+STREAM_MAGIC = b"BHXS"
+STREAM_VERSION = 1
+_STREAM_HEADER = struct.Struct(">4sBB16s")
+_CHUNK_HEADER = struct.Struct(">Q16sI")
+_TRAILER = struct.Struct(">Q")
+
+def detect_format(head):
+    """
+    Identify a .bhex container from its first bytes.
+    """
+    if (head[:len(BINARY_MAGIC)] == BINARY_MAGIC):
+        return FORMAT_BINARY
+    if (head[:len(STREAM_MAGIC)] == STREAM_MAGIC):
+        return FORMAT_STREAM
+    if (head.lstrip()[:1] in (b"{", "{")):
+        return FORMAT_JSON
+    raise ValueError("Unrecognized .bhex format.")
+
+def write_stream(payloads, key):
+    """
+    Frame an iterable of payload bytes into the streaming container.
+    Yields the encoded header, one record per payload, then the trailer.
+    """
+    keys = sealing_keys(key)
+    aes_key, mac_key = keys.aes_key, keys.mac_key
+    stream_id = os.urandom(16)
+    yield _STREAM_HEADER.pack(STREAM_MAGIC, STREAM_VERSION, FLAG_KDF, stream_id) + keys.params
+
+    count = 0
+    for payload in payloads:
+        iv, encrypted = encrypt_aes(payload, aes_key)
+        record = b"C" + _CHUNK_HEADER.pack(count, iv, len(encrypted))
+        yield record + encrypted + generate_hmac(stream_id + record + encrypted, mac_key)
+        count += 1
+
+    trailer = b"T" + _TRAILER.pack(count)
+    yield trailer + generate_hmac(stream_id + trailer, mac_key)
+
+def _read_exact(source, size):
+    data = source.read(size)
+    if (len(data) != size):
+        raise ValueError("Truncated .bhex stream.")
+    return data
+
+def read_stream(source, key):
+    """
+    Verify and decrypt a streaming container from a binary file object,
+    yielding each chunk payload in order. Raises ValueError on any
+    integrity failure, including a missing trailer.
+    """
+    magic, version, flags, stream_id = _STREAM_HEADER.unpack(_read_exact(source, _STREAM_HEADER.size))
+    if (magic != STREAM_MAGIC):
+        raise ValueError("Not a .bhex stream.")
+    if (version != STREAM_VERSION):
+        raise ValueError(f"Unsupported .bhex stream version {version}.")
+    params = _read_exact(source, KDF_PARAMS.size) if flags & FLAG_KDF else None
+    keys = opening_keys(key, params)
+    aes_key, mac_key = keys.aes_key, keys.mac_key
+
+    expected_seq = 0
+    while True:
+        kind = _read_exact(source, 1)
+        if (kind == b"T"):
+            trailer = kind + _read_exact(source, _TRAILER.size)
+            if (not verify_hmac(stream_id + trailer, mac_key, _read_exact(source, _HMAC_SIZE))):
+                raise ValueError("HMAC verification failed on stream trailer.")
+            if (_TRAILER.unpack(trailer[1:])[0] != expected_seq):
+                raise ValueError("Stream chunk count mismatch.")
+            return
+        if (kind != b"C"):
+            raise ValueError("Corrupt .bhex stream record.")
+
+        fields = _read_exact(source, _CHUNK_HEADER.size)
+        seq, iv, length = _CHUNK_HEADER.unpack(fields)
+        encrypted = _read_exact(source, length)
+        if (not verify_hmac(stream_id + kind + fields + encrypted, mac_key, _read_exact(source, _HMAC_SIZE))):
+            raise ValueError(f"HMAC verification failed on chunk {seq}.")
+        if (seq != expected_seq):
+            raise ValueError(f"Stream chunk {seq} out of order.")
+        expected_seq += 1
+        yield decrypt_aes(encrypted, aes_key, iv)
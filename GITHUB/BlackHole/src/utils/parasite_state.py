@@ -0,0 +1,107 @@
+# utils/parasite_state.py
+"""
+Parasite memory state manager.
+Keeps parasite_memory.json in memory for the life of the process and writes
+it back behind the hot path: after a batch of updates, after a time
+interval, or at interpreter shutdown. Writes go to a temp file that is
+renamed over the original, so readers never see a torn file.
+"""
+
+import atexit
+import json
+import os
+import tempfile
+import threading
+import time
+
+PARASITE_FLUSH_EVERY = 16  # updates coalesced per write
+PARASITE_FLUSH_SECONDS = 2.0  # max age of unwritten updates (checked on update)
+
+_states = {}
+_states_lock = threading.Lock()
+
+def empty_parasite_memory():
+    return {
+        "drift_bias": 0,
+        "influence_count": 0,
+        "history": [],
+        "fractal_history": []
+    }
+
+def read_parasite_memory(path):
+    try:
+        with open(path, "r") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return empty_parasite_memory()
+
+def write_json_atomic(path, data):
+    # A unique temp file per write: threads of one process flush the same path.
+    # json.dumps without indent runs the C encoder (indent=4 took seconds for MB-sized fractal history)
+    text = json.dumps(data)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or ".", prefix=os.path.basename(path) + ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as f:
+            f.write(text)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if (os.path.exists(tmp_path)):
+            os.remove(tmp_path)
+        raise
+
+
+class ParasiteState:
+    """
+    Write-behind cache of one parasite memory file.
+    Callers mutate `memory` in place while holding `lock` and then call
+    touch(); the lock is reentrant, so touch() may be called inside it.
+    """
+
+    def __init__(self, path, flush_every=PARASITE_FLUSH_EVERY, flush_seconds=PARASITE_FLUSH_SECONDS):
+        self.path = path
+        self.flush_every = flush_every
+        self.flush_seconds = flush_seconds
+        self.lock = threading.RLock()
+        self.memory = read_parasite_memory(path)
+        self.pending = 0
+        self.last_flush = time.monotonic()
+
+    def touch(self):
+        """
+        Record one update and flush if the size or time policy is met.
+        """
+        with self.lock:
+            self.pending += 1
+            if (self.pending >= self.flush_every or time.monotonic() - self.last_flush >= self.flush_seconds):
+                self.flush()
+
+    def flush(self):
+        # Held across the write too, so an older snapshot never replaces a newer one
+        with self.lock:
+            if (self.pending):
+                write_json_atomic(self.path, self.memory)
+                self.pending = 0
+            self.last_flush = time.monotonic()
+
+
+def get_parasite_state(path):
+    """
+    Shared ParasiteState for `path` in this process.
+    """
+    cache_key = (os.getpid(), os.path.abspath(path))
+    with _states_lock:
+        state = _states.get(cache_key)
+        if (state is None):
+            state = ParasiteState(path)
+            _states[cache_key] = state
+    return state
+
+def flush_parasite_states():
+    pid = os.getpid()
+    with _states_lock:
+        states = list(_states.items())
+    for (owner, _), state in states:
+        if (owner == pid):
+            state.flush()
+
+atexit.register(flush_parasite_states)
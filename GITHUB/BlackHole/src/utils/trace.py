@@ -0,0 +1,212 @@
+# utils/trace.py
+"""
+Pipeline tracing.
+Debug messages and per-stage timing spans go to pluggable sinks: console
+print, JSON lines or an in-memory ring buffer. With no sink attached tracing
+is disabled and each call is a flag check; messages take %-style arguments
+that are only formatted (and clipped) when a sink will receive them.
+
+Set BLACKHOLE_TRACE=1 to print, or BLACKHOLE_TRACE=<path> for JSON lines.
+"""
+
+import json
+import os
+import time
+from collections import deque
+
+TRACE_ENV = "BLACKHOLE_TRACE"
+PREVIEW_CHARS = 160  # longest str argument rendered into a message
+RING_BUFFER_SIZE = 4096
+
+
+def _clip(value):
+    if (isinstance(value, (str, bytes, bytearray)) and len(value) > PREVIEW_CHARS):
+        return f"{value[:PREVIEW_CHARS]!s}... ({len(value)} chars)"
+    return value
+
+def render(message, args):
+    if (not args):
+        return message
+    return message % tuple(_clip(arg) for arg in args)
+
+
+# === Sinks ===
+class PrintSink:
+    """
+    The classic "[DEBUG] <time> - <message>" console output.
+    """
+
+    def emit(self, record):
+        if (record["type"] == "span"):
+            fields = ''.join(f" {k}={v}" for k, v in record["fields"].items())
+            text = f"[SPAN] {record['name']} {record['ms']:.3f} ms{fields}"
+        else:
+            text = record["msg"]
+        print(f"[DEBUG] {time.ctime(record['ts'])} - {text}")
+
+    def close(self):
+        pass
+
+
+class JsonLinesSink:
+    """
+    One JSON record per line, appended to `target` (a path or a text file).
+    """
+
+    def __init__(self, target):
+        self.owned = isinstance(target, (str, os.PathLike))
+        self.file = open(target, "a", encoding="utf-8") if self.owned else target
+
+    def emit(self, record):
+        self.file.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+        self.file.flush()
+
+    def close(self):
+        if (self.owned):
+            self.file.close()
+
+
+class RingBufferSink:
+    """
+    Keeps the newest `size` records in memory (for tests, GUIs and post-mortems).
+    """
+
+    def __init__(self, size=RING_BUFFER_SIZE):
+        self.records = deque(maxlen=size)
+
+    def emit(self, record):
+        self.records.append(record)
+
+    def spans(self, name=None):
+        return [r for r in self.records if r["type"] == "span" and (name is None or r["name"] == name)]
+
+    def clear(self):
+        self.records.clear()
+
+    def close(self):
+        pass
+
+
+# === Tracer ===
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def set(self, **fields):
+        pass
+
+_NULL_SPAN = _NullSpan()
+
+
+class Span:
+    __slots__ = ("tracer", "name", "fields", "started")
+
+    def __init__(self, tracer, name, fields):
+        self.tracer = tracer
+        self.name = name
+        self.fields = fields
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        elapsed = time.perf_counter() - self.started
+        if (exc_type is not None):
+            self.fields["error"] = exc_type.__name__
+        self.tracer.emit({
+            "type": "span",
+            "ts": time.time(),
+            "pid": os.getpid(),
+            "name": self.name,
+            "ms": round(elapsed * 1000, 3),
+            "fields": self.fields
+        })
+        return False
+
+    def set(self, **fields):
+        """
+        Attach fields (sizes, counts) known only inside the span.
+        """
+        self.fields.update(fields)
+
+
+class Tracer:
+    """
+    Fans records out to its sinks; `enabled` is true while any sink is attached.
+    """
+
+    def __init__(self):
+        self.sinks = []
+        self.enabled = False
+
+    def add_sink(self, sink):
+        self.sinks.append(sink)
+        self.enabled = True
+        return sink
+
+    def remove_sink(self, sink):
+        if (sink in self.sinks):
+            self.sinks.remove(sink)
+            sink.close()
+        self.enabled = bool(self.sinks)
+
+    def clear(self):
+        for sink in list(self.sinks):
+            self.remove_sink(sink)
+
+    def emit(self, record):
+        for sink in self.sinks:
+            sink.emit(record)
+
+    def log(self, message, *args):
+        if (self.enabled):
+            self.emit({"type": "log", "ts": time.time(), "pid": os.getpid(), "msg": render(message, args)})
+
+    def span(self, name, **fields):
+        if (not self.enabled):
+            return _NULL_SPAN
+        return Span(self, name, fields)
+
+
+tracer = Tracer()
+
+def log_debug(message, *args):
+    """
+    Trace a debug message; %-style `args` are formatted only if tracing is on.
+    """
+    if (tracer.enabled):
+        tracer.log(message, *args)
+
+def span(name, **fields):
+    """
+    Context manager timing one pipeline stage:  with span("foam", chars=n): ...
+    """
+    if (not tracer.enabled):
+        return _NULL_SPAN
+    return Span(tracer, name, fields)
+
+def set_debug(enabled):
+    """
+    Attach or detach the console PrintSink.
+    """
+    printing = [sink for sink in tracer.sinks if isinstance(sink, PrintSink)]
+    if (enabled and not printing):
+        tracer.add_sink(PrintSink())
+    elif (not enabled):
+        for sink in printing:
+            tracer.remove_sink(sink)
+
+def configure_from_env():
+    value = os.environ.get(TRACE_ENV, "").strip()
+    if (value.lower() in ("1", "true", "print")):
+        set_debug(True)
+    elif (value and value.lower() not in ("0", "false")):
+        tracer.add_sink(JsonLinesSink(value))
+
+configure_from_env()
@@ -1,155 +1,159 @@
 # === Cipher Benchmarking Lab with GUI ===
+# Headless comparison:  python -m tests.BlackHoleBenchMarking --compare --sizes 64B,1KB,64KB,1MB
+# GUI:                  python -m tests.BlackHoleBenchMarking
+# (run from the project root)
 
-import os, json, base64, time, zlib, hashlib
+import argparse, json, os, sys, tempfile, zlib
 import numpy as np
 from Crypto.Cipher import AES, ChaCha20_Poly1305, PKCS1_OAEP
+from Crypto.Hash import SHA256
 from Crypto.PublicKey import RSA
 from Crypto.Random import get_random_bytes
-from Crypto.Util.Padding import pad, unpad
-from collections import Counter
-from math import log2
-import matplotlib.pyplot as plt
-from tkinter import filedialog, Tk, Text, Button, Toplevel, Scrollbar, RIGHT, Y, LEFT, END, BOTH
+from Crypto.Util.Padding import pad
+from src.utils.entropy_tools import CompressionAccumulator, calculate_shannon_entropy, iter_chunks, score_chunks
+from src.utils.fractal_tools import detect_fft_spikes, spike_count
+from tests.BlackHoleStageBenchmark import make_message, parse_size, summarize_samples, time_call
+
+COMPARE_SIZES = ["64B", "1KB", "64KB", "1MB"]
+RSA_MAX_PAYLOAD = 2048 // 8 - 2 * SHA256.digest_size - 2  # OAEP-SHA256 limit for a 2048-bit key
+QUALITY_SAMPLE = 4096  # output bytes scored by the entropy/bit/FFT metrics
 
 # === Analysis Tools ===
+# Byte/bit/compression scores come from the shared streaming accumulators
 def shannon_entropy(data):
-    if not data:
-        return 0.0
-    freq = Counter(data)
-    total = len(data)
-    return round(-sum((count / total) * log2(count / total) for count in freq.values()), 4)
+    return round(calculate_shannon_entropy(data), 4)
 
 def nist_bits(text):
-    bits = ''.join(f"{ord(c):08b}" for c in text if ord(c) < 128)
-    ones = bits.count('1')
-    runs = sum(bits[i] != bits[i+1] for i in range(len(bits)-1))
-    return round(ones / max(1, len(bits)), 4), runs
+    stats = score_chunks(iter_chunks(text), ascii_bits=True, compression=False)
+    return round(stats["bit_ratio"], 4), stats["bit_runs"]
 
 def fft_spike_count(shift_vals):
-    if not shift_vals:
-        return 0
-    y = np.array(shift_vals)
-    y_fft = np.abs(np.fft.fft(y))
-    return int(np.sum(y_fft[:len(y)//2] > 100))
+    return spike_count(shift_vals)
+
+def fft_burst_windows(shift_vals):
+    # Windows of the signal with a local spectral spike (STFT, see utils/fractal_tools)
+    return len(detect_fft_spikes(shift_vals))
 
 def compressibility_ratio(data_bytes):
     if not data_bytes:
         return 1.0
-    compressed = zlib.compress(data_bytes)
-    return round(len(compressed) / len(data_bytes), 3)
+    return round(CompressionAccumulator().update(data_bytes).result(), 3)
 
 # === Encryption Schemes ===
-def encrypt_aes(text, key_size=128):
+# setup_* does the one-off work (key generation, key derivation, engine state)
+# and returns (encrypt(text) -> bytes, max payload in bytes or None). Only
+# encrypt() is timed; per-message work such as drawing a fresh IV stays in it.
+def setup_aes(key_size=128):
     key = get_random_bytes(key_size // 8)
-    iv = get_random_bytes(16)
-    cipher = AES.new(key, AES.MODE_CBC, iv)
-    ct = cipher.encrypt(pad(text.encode(), AES.block_size))
-    return iv + ct
 
-def encrypt_chacha(text):
+    def encrypt(text):
+        iv = get_random_bytes(16)
+        cipher = AES.new(key, AES.MODE_CBC, iv)
+        return iv + cipher.encrypt(pad(text.encode(), AES.block_size))
+    return encrypt, None
+
+def setup_chacha():
     key = get_random_bytes(32)
-    cipher = ChaCha20_Poly1305.new(key=key)
-    nonce = cipher.nonce
-    ciphertext, tag = cipher.encrypt_and_digest(text.encode())
-    return nonce + ciphertext + tag
-
-def encrypt_rsa(text):
-    key = RSA.generate(2048)
-    cipher = PKCS1_OAEP.new(key)
-    return cipher.encrypt(text.encode())
-
-def load_blackhole_bhex():
-    from tkinter.simpledialog import askstring
-    root = Tk()
-    root.withdraw()
-    file_path = filedialog.askopenfilename(title="Select .bhex File", filetypes=[("BlackHole Package", "*.bhex")])
-    if not file_path:
-        return None
-    password = askstring("Password", "Enter password for .bhex:", show='*')
-    if not password:
-        return None
-    try:
-        with open(file_path, "r") as f:
-            data = json.load(f)
-        iv = base64.b64decode(data["iv"])
-        cipher_data = base64.b64decode(data["cipher"])
-        key = hashlib.sha256(password.encode()).digest()
-        aes = AES.new(key, AES.MODE_CBC, iv)
-        decrypted = unpad(aes.decrypt(cipher_data), AES.block_size)
-        package = json.loads(decrypted)
-        return package.get("cipher", "")
-    except Exception as e:
-        print(f"Error loading .bhex: {e}")
-        return None
-    password = input("Enter password for .bhex: ")
-    try:
-        with open(file_path, "r") as f:
-            data = json.load(f)
-        iv = base64.b64decode(data["iv"])
-        cipher_data = base64.b64decode(data["cipher"])
-        key = hashlib.sha256(password.encode()).digest()
-        aes = AES.new(key, AES.MODE_CBC, iv)
-        decrypted = unpad(aes.decrypt(cipher_data), AES.block_size)
-        package = json.loads(decrypted)
-        return package.get("cipher", "")
-    except Exception as e:
-        print(f"Error loading .bhex: {e}")
-        return None
-
-def benchmark_cipher(label, func, text):
-    start = time.time()
-    try:
-        result = func(text)
-        runtime = round(time.time() - start, 4)
-        if isinstance(result, bytes):
-            encoded = result
-        else:
-            encoded = result.encode()
-
-        entropy = shannon_entropy(encoded)
-        result_str = result.decode('utf-8', errors='ignore') if isinstance(result, bytes) else result
-        bit_ratio, bit_runs = nist_bits(result_str)
-        comp_ratio = compressibility_ratio(encoded)
-        spikes = fft_spike_count([ord(c) for c in result_str if c.isprintable()])
-
-        return {
-            "Cipher": label,
-            "Entropy": entropy,
-            "Bits(1%)": bit_ratio,
-            "Runs": bit_runs,
-            "FFT Spikes": spikes,
-            "Compression": comp_ratio,
-            "Time(s)": runtime
-        }
-    except Exception as e:
-        return {"Cipher": label, "Error": str(e)}
+
+    def encrypt(text):
+        cipher = ChaCha20_Poly1305.new(key=key)
+        ciphertext, tag = cipher.encrypt_and_digest(text.encode())
+        return cipher.nonce + ciphertext + tag
+    return encrypt, None
+
+def setup_rsa():
+    cipher = PKCS1_OAEP.new(RSA.generate(2048), hashAlgo=SHA256)
+    return (lambda text: cipher.encrypt(text.encode())), RSA_MAX_PAYLOAD
+
+def setup_blackhole(state_dir, password="bench-password"):
+    # The engine encrypts in-process; its oracle/parasite state lives in a scratch directory
+    from src.blackhole_v6 import Engine
+    engine = Engine(oracle_path=os.path.join(state_dir, "oracle_memory.db"),
+                    parasite_path=os.path.join(state_dir, "parasite_memory.json"))
+    engine.key_context(password)  # password KDF runs once, as it would for a long-lived engine
+    return (lambda text: engine.encrypt(text, password)), None
+
+CIPHERS = [
+    ("AES-128-CBC", lambda state_dir: setup_aes(128)),
+    ("AES-256-CBC", lambda state_dir: setup_aes(256)),
+    ("ChaCha20-Poly1305", lambda state_dir: setup_chacha()),
+    ("RSA-2048-OAEP", lambda state_dir: setup_rsa()),
+    ("BlackHoleV6", setup_blackhole),
+]
+
+def quality_metrics(result):
+    """
+    Output-quality scores on the first QUALITY_SAMPLE bytes (never timed).
+    """
+    encoded = result if isinstance(result, bytes) else result.encode()
+    sample = encoded[:QUALITY_SAMPLE]
+    stats = score_chunks([sample], ascii_bits=True, compression=False)
+    result_str = sample.decode('utf-8', errors='ignore')
+    signal = np.array([ord(c) for c in result_str if c.isprintable()], dtype=np.float32)
+    return {
+        "Entropy": round(stats["entropy"], 4),
+        "Bits(1%)": round(stats["bit_ratio"], 4),
+        "Runs": stats["bit_runs"],
+        "FFT Spikes": fft_spike_count(signal),
+        "FFT Bursts": fft_burst_windows(signal),
+        "Compression": compressibility_ratio(encoded)
+    }
+
+def compare_ciphers(sizes=COMPARE_SIZES, repeat=20, warmup=2, ciphers=None, log=print):
+    """
+    Time every cipher on the same plaintext at each size. Returns one row per
+    cipher and size with latency percentiles, MB/s and output quality.
+    """
+    wanted = set(ciphers) if ciphers else None
+    rows = []
+    # Windows keeps the oracle database open until exit, so cleanup there is best effort
+    with tempfile.TemporaryDirectory(prefix="bh_bench_", ignore_cleanup_errors=True) as state_dir:
+        setups = {}
+        for label, setup in CIPHERS:
+            if wanted is None or label in wanted:
+                setups[label] = setup(state_dir)
+        for size_label in sizes:
+            message = make_message(parse_size(size_label))
+            nbytes = len(message.encode())
+            for label, (encrypt, max_payload) in setups.items():
+                row = {"Cipher": label, "Size": size_label}
+                if max_payload is not None and nbytes > max_payload:
+                    row["Skipped"] = f"payload limit {max_payload} B"
+                else:
+                    try:
+                        row.update(summarize_samples(time_call(lambda: encrypt(message), repeat, warmup), nbytes))
+                        output = encrypt(message)
+                        row["Expansion"] = round(len(output) / nbytes, 3)
+                        row.update(quality_metrics(output))
+                    except Exception as e:
+                        row["Error"] = f"{type(e).__name__}: {e}"
+                rows.append(row)
+                log(format_row(row))
+        if "BlackHoleV6" in setups:
+            from src.utils.parasite_state import flush_parasite_states
+            flush_parasite_states()  # write engine state before its scratch directory goes away
+    return rows
+
+def format_row(r):
+    head = f"{r['Cipher']:<18} {r['Size']:>6}"
+    if 'Error' in r:
+        return f"{head}  ERROR - {r['Error']}"
+    if 'Skipped' in r:
+        return f"{head}  skipped ({r['Skipped']})"
+    return (f"{head}  p50 {r['p50_ms']:>10.4f} ms | p90 {r['p90_ms']:>10.4f} ms | p99 {r['p99_ms']:>10.4f} ms | "
+            f"{r['mb_per_sec']:>9} MB/s | x{r['Expansion']:<6} | Entropy: {r['Entropy']:<6} | Comp: {r['Compression']}")
 
 def run_benchmark():
-    message = "The quick brown fox jumps over the lazy dog 123!"
-    results = []
-
-    results.append(benchmark_cipher("AES-128", lambda t: encrypt_aes(t, 128), message))
-    results.append(benchmark_cipher("AES-256", lambda t: encrypt_aes(t, 256), message))
-    results.append(benchmark_cipher("ChaCha20", encrypt_chacha, message))
-    results.append(benchmark_cipher("RSA-2048", encrypt_rsa, message))
-
-    bh_cipher = load_blackhole_bhex()
-    if bh_cipher:
-        results.append(benchmark_cipher("BlackHoleV6 (.bhex)", lambda _: bh_cipher, message))
-
-    output = "\n=== Cipher Benchmark Report ===\n"
-    for r in results:
-        if 'Error' in r:
-            output += f"{r['Cipher']}: ERROR - {r['Error']}\n"
-        else:
-            output += f"{r['Cipher']:<22} Entropy: {r['Entropy']:<5} | Bits: {r['Bits(1%)']} | Runs: {r['Runs']:<4} | FFT: {r['FFT Spikes']:<3} | Comp: {r['Compression']} | Time: {r['Time(s)']}s\n"
+    rows = compare_ciphers(COMPARE_SIZES[:2], repeat=10, warmup=1, log=lambda line: None)
+    output = "\n=== Cipher Benchmark Report ===\n" + "\n".join(format_row(r) for r in rows) + "\n"
     show_results(output)
 
 def show_results(text):
+    from tkinter import Text, Toplevel, Scrollbar, RIGHT, Y, LEFT, END, BOTH
     win = Toplevel()
     win.title("Benchmark Results")
-    win.geometry("750x300")
-    text_area = Text(win, wrap='word')
+    win.geometry("1100x300")
+    text_area = Text(win, wrap='none')
     scrollbar = Scrollbar(win, command=text_area.yview)
     text_area.configure(yscrollcommand=scrollbar.set)
     text_area.pack(side=LEFT, fill=BOTH, expand=True)
@@ -158,11 +162,36 @@ def show_results(text):
     text_area.config(state='disabled')
 
 def launch_gui():
+    from tkinter import Tk, Button
     root = Tk()
     root.title("BlackHole Cipher Benchmark")
     root.geometry("400x200")
     Button(root, text="Run Benchmark", font=("Arial", 14), command=run_benchmark).pack(pady=40)
     root.mainloop()
 
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="BlackHole cipher comparison benchmark")
+    parser.add_argument('--compare', action='store_true', help="Run the comparison headless instead of opening the GUI")
+    parser.add_argument('--sizes', default=','.join(COMPARE_SIZES), help="Comma-separated payload sizes, e.g. 64B,1KB,1MB")
+    parser.add_argument('--ciphers', default=None, help=f"Comma-separated subset of: {', '.join(label for label, _ in CIPHERS)}")
+    parser.add_argument('--repeat', type=int, default=20, help="Timed encryptions per cipher and size")
+    parser.add_argument('--warmup', type=int, default=2, help="Untimed encryptions before timing")
+    parser.add_argument('--save', help="Write the result rows to this JSON file")
+    args = parser.parse_args(argv)
+
+    if not args.compare:
+        launch_gui()
+        return 0
+
+    sizes = [s.strip() for s in args.sizes.split(',') if s.strip()]
+    ciphers = [c.strip() for c in args.ciphers.split(',')] if args.ciphers else None
+    print("=== Cipher Benchmark Report ===")
+    rows = compare_ciphers(sizes, max(1, args.repeat), max(0, args.warmup), ciphers)
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(rows, f, indent=4)
+        print(f"\n[Saved] {args.save}")
+    return 0
+
 if __name__ == "__main__":
-    launch_gui()
+    sys.exit(main())
@@ -1,20 +1,30 @@
 # === Enhanced Entropy Inspector with FFT Noise Signature and Full Integration ===
+# Run from the project root with:  python -m tests.BlackHoleEntropyInspector
+# Headless audit of a directory (one JSON line per package):
+#   python -m tests.BlackHoleEntropyInspector inspect DIR --password ... --workers 8 --format jsonl --out audit.jsonl
+# Tk dialogs, matplotlib and colorama are only loaded by the interactive path.
 
+import argparse
 import json
 import base64
 import hashlib
 import sys
 import os
-import statistics
+import time
 from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, as_completed, wait
 from math import log2
-from tkinter import filedialog, Tk, simpledialog, messagebox
 from Crypto.Cipher import AES
 from Crypto.Util.Padding import unpad
-from colorama import Fore, Style, init
-import matplotlib.pyplot as plt
 import numpy as np
-init(autoreset=True)
+from src.utils.drift_model import DriftAccumulator, drift_volatility
+from src.utils.entropy_tools import CipherMetrics, WindowedEntropy, calculate_shannon_entropy, iter_chunks
+from src.utils.fractal_tools import spectral_profile, spike_count, welch_psd
+from src.utils.package_utils import FORMAT_STREAM, STREAM_MAGIC, detect_format, open_bhex, read_stream
+
+BHEX_SUFFIX = ".bhex"
+PROFILE_WINDOW = 1024  # cipher bytes per window of the rolling entropy profile
+WEAK_WINDOWS = 5
 
 class NullSignatureCollapse:
     def __init__(self, output_dir="phantom_output"):
@@ -32,17 +42,26 @@ class NullSignatureCollapse:
         )
         return data
 
+def is_stream_file(filepath):
+    with open(filepath, "rb") as f:
+        return detect_format(f.read(len(STREAM_MAGIC))) == FORMAT_STREAM
+
+def load_package(filepath, password):
+    """
+    Open a .bhex package; the shift log comes back as an int64 array.
+    """
+    if is_stream_file(filepath):
+        raise ValueError("Streaming .bhex container: score it with stream_metrics() or the inspect command.")
+    with open(filepath, "rb") as f:
+        package = open_bhex(f.read(), password)
+    package["shift_log"] = np.asarray(package.get("shift_log", []), dtype=np.int64)
+    return package
+
 def decrypt_bhex_file(filepath, password):
     try:
-        with open(filepath, "r") as f:
-            data = json.load(f)
-        iv = base64.b64decode(data.get('iv', ''))
-        cipher_data = base64.b64decode(data.get('cipher', ''))
-        key = hashlib.sha256(password.encode()).digest()
-        cipher = AES.new(key, AES.MODE_CBC, iv)
-        decrypted = unpad(cipher.decrypt(cipher_data), AES.block_size)
-        return json.loads(decrypted)
+        return load_package(filepath, password)
     except Exception as e:
+        from colorama import Fore, Style
         print(f"{Fore.RED}[ERROR] Failed to decrypt or parse .bhex file: {e}{Style.RESET_ALL}")
         return None
 
@@ -57,15 +76,25 @@ def decrypt_null_signature_bhex(password, map_path="phantom_output/null_map.json
         decrypted = unpad(cipher.decrypt(cipher_data), AES.block_size)
         return json.loads(decrypted)
     except Exception as e:
+        from colorama import Fore, Style
         print(f"{Fore.RED}[ERROR] Failed to decrypt or parse Null Signature package: {e}{Style.RESET_ALL}")
         return None
 
+def cipher_stats(data, *extra):
+    """
+    One streaming pass of the shared entropy accumulators over cipher text;
+    any extra accumulators (e.g. a WindowedEntropy profile) are fed the same
+    chunks. Bit statistics keep the inspector's ASCII-only NIST approximation.
+    """
+    metrics = CipherMetrics(ascii_bits=True)
+    for chunk in iter_chunks(data):
+        metrics.update(chunk)
+        for accumulator in extra:
+            accumulator.update(chunk)
+    return metrics.result()
+
 def shannon_entropy(data):
-    if not data:
-        return 0.0
-    freq = Counter(data)
-    total = len(data)
-    return round(-sum((count / total) * log2(count / total) for count in freq.values()), 4)
+    return round(calculate_shannon_entropy(data), 4)
 
 def estimate_password_strength(password):
     variety = sum([any(c.islower() for c in password), any(c.isupper() for c in password),
@@ -79,20 +108,13 @@ def calculate_symbolic_strength(tags, drift_score, uniqueness_ratio):
     return min(600, 500 + len(tags)*2 + int(drift_score // 3) + int(uniqueness_ratio * 5))
 
 def drift_volatility_index(shift_log):
-    if len(shift_log) < 2:
-        return 0.0
-    return round(statistics.stdev(shift_log), 4)
+    return round(drift_volatility(shift_log), 4)
 
 def fusion_entropy_weight(fusion_map):
     return round(sum(v**2 for v in fusion_map.values()), 4) if fusion_map else 0.0
 
 def symbol_skew(data):
-    freq = Counter(data)
-    if not freq:
-        return 0.0
-    most_common = freq.most_common(1)[0][1]
-    least_common = freq.most_common()[-1][1]
-    return round(most_common / (least_common + 1), 2)
+    return round(cipher_stats(data)["symbol_skew"], 2)
 
 def classify_behavior(volatility, saturation, skew):
     if volatility > 1e+12 and saturation > 0.4 and skew > 20:
@@ -113,23 +135,23 @@ def confidence_estimator(phantom_tags, volatility, skew):
     return min(base, 99)
 
 def approximate_nist_tests(ciphertext):
-    if not ciphertext:
+    if not len(ciphertext):
         return {}
-    bits = ''.join(f"{ord(c):08b}" for c in ciphertext if ord(c) < 128)
-    ones = bits.count('1')
-    zeros = bits.count('0')
-    runs = sum(bits[i] != bits[i+1] for i in range(len(bits)-1))
+    return nist_fields(cipher_stats(ciphertext))
+
+def nist_fields(stats):
     return {
-        "bit_ones": ones,
-        "bit_zeros": zeros,
-        "bit_ratio": round(ones / max(1, len(bits)), 4),
-        "bit_runs": runs,
-        "bit_length": len(bits)
+        "bit_ones": stats["bit_ones"],
+        "bit_zeros": stats["bit_zeros"],
+        "bit_ratio": round(stats["bit_ratio"], 4),
+        "bit_runs": stats["bit_runs"],
+        "bit_length": stats["bit_length"]
     }
 
 def plot_entropy_graph(shift_log):
-    if not shift_log:
+    if not len(shift_log):
         return
+    import matplotlib.pyplot as plt
     plt.figure(figsize=(10, 4))
     plt.plot(shift_log, color='darkcyan', linewidth=1.5)
     plt.title("BlackHole Shift Log Drift")
@@ -143,6 +165,7 @@ def plot_entropy_graph(shift_log):
 def plot_symbol_histogram(ciphertext):
     if not ciphertext:
         return
+    import matplotlib.pyplot as plt
     freq = Counter(ciphertext)
     labels, values = zip(*freq.most_common())
     plt.figure(figsize=(10, 4))
@@ -155,91 +178,208 @@ def plot_symbol_histogram(ciphertext):
     plt.close()
 
 def plot_fft_of_shift_log(shift_log):
-    if not shift_log:
+    if not len(shift_log):
         return
-    y = np.array(shift_log)
-    y_fft = np.abs(np.fft.fft(y))
-    x = np.fft.fftfreq(len(y))
-
-    anomalies = np.sum(y_fft[:len(y)//2] > 100)
+    import matplotlib.pyplot as plt
+    x, power = welch_psd(shift_log)
+    anomalies = spike_count(shift_log)
+    bursts = spectral_profile(shift_log)["burst_windows"]
 
     plt.figure(figsize=(10, 4))
-    plt.plot(x[:len(x)//2], y_fft[:len(y_fft)//2], color='slateblue')
-    plt.title(f"FFT Frequency Spectrum of Shift Log | Anomaly Peaks: {anomalies}")
+    plt.semilogy(x, power + 1e-12, color='slateblue')
+    plt.title(f"Welch Spectrum of Shift Log | Anomaly Peaks: {anomalies} | Burst Windows: {bursts}")
     plt.xlabel("Frequency")
-    plt.ylabel("Magnitude")
+    plt.ylabel("Power")
     plt.grid(True, linestyle='--', alpha=0.6)
     plt.tight_layout()
     plt.savefig("fft_shift_spectrum.png")
     plt.close()
 
-def analyze_entropy_metrics(package, output_to_file=False):
-    output_lines = []
-    metrics = {}
-    raw = package.get("cipher", "")
-    metrics['symbol_count'] = len(raw)
-    metrics['word_count'] = len(raw.split())
-    metrics['symbol_density'] = round(metrics['symbol_count'] / (metrics['word_count'] + 1), 2)
-    metrics['shannon_entropy'] = shannon_entropy(raw)
-    metrics['symbol_skew'] = symbol_skew(raw)
-
-    shift_log = package.get("shift_log", [])
-    entropy_score = sum(shift_log)
-    drift_range = max(shift_log) - min(shift_log) if shift_log else 1
-    drift_score = round((entropy_score / (drift_range + 1)) % 100, 2)
-    drift_volatility = drift_volatility_index(shift_log)
-
-    tags = package.get("subconscious", [])
-    phantom_tags = [t for t in tags if "PHANTOM" in t or "Δ" in t or "⌜" in t]
-    tag_saturation = round(len(tags) / (metrics['word_count'] + 1), 2)
-
-    fusion_map = package.get("fusion_map", {})
-    fusion_summary = ", ".join(f"{k}:{v}" for k, v in fusion_map.items()) if fusion_map else "None"
-    fusion_weight = fusion_entropy_weight(fusion_map)
-    unique_symbols = len(set(raw.split()))
-    uniqueness_ratio = round(unique_symbols / (metrics['word_count'] + 1), 3)
-    password_strength = estimate_password_strength(package.get("password", ""))
-    complexity_bits = calculate_symbolic_strength(tags, drift_score, uniqueness_ratio)
-    behavior_class = classify_behavior(drift_volatility, tag_saturation, metrics['symbol_skew'])
-    confidence = confidence_estimator(phantom_tags, drift_volatility, metrics['symbol_skew'])
-    nist = approximate_nist_tests(raw)
-
-    drift_bar = ''.join(['|' if s > 40 else ':' if s > 20 else '.' for s in shift_log[:60]])
-    est_layers = 3 + (1 if fusion_map else 0) + (1 if phantom_tags else 0)
-
-    anomalies = int(np.sum(np.abs(np.fft.fft(np.array(shift_log)))[:len(shift_log)//2] > 100))
-    fft_classification = (
+def classify_fft(anomalies):
+    return (
         "[•] Flat Spectrum (Stochastic)" if anomalies == 0 else
         "[⟳] Periodic Structure Detected" if anomalies <= 5 else
         "[⚠] Resonant Drift Activity" if anomalies <= 15 else
         "[🔊] High Entropy Pulse"
     )
-    output_lines.append(f"FFT Anomaly Spikes Detected: {anomalies}")
-    output_lines.append(f"FFT Classification: {fft_classification}")
-    output_lines.extend([
+
+def round_or_none(value, digits):
+    return None if value is None else round(value, digits)
+
+def show_value(value):
+    return "n/a" if value is None else value
+
+class PackageTally:
+    """
+    Accumulates the inspector's scores over a package that arrives in parts:
+    a JSON/binary package is one part, a streaming container one part per
+    chunk. Byte, bit and window statistics are streamed; shift logs are
+    scored per part, so memory stays bounded by the largest chunk.
+    """
+
+    def __init__(self):
+        self.stats = CipherMetrics(ascii_bits=True)
+        self.window_profile = WindowedEntropy(PROFILE_WINDOW)
+        self.drift = DriftAccumulator(bar_limit=60)
+        self.symbol_count = 0
+        self.word_count = 0
+        self.unique_words = set()
+        self.open_word = ""  # word cut by a part boundary, completed by the next part
+        self.shift_offset = 0
+        self.fft_anomalies = 0
+        self.fft_windows = 0
+        self.fft_burst_windows = 0
+        self.fft_bursts = []
+        self.tags = []
+        self.fusion_map = {}
+
+    def add(self, cipher, shift_log, tags=(), fusion_map=None):
+        for chunk in iter_chunks(cipher):
+            self.stats.update(chunk)
+            self.window_profile.update(chunk)
+        self.symbol_count += len(cipher)
+        if (cipher):
+            words = cipher.split()
+            if (self.open_word and not cipher[0].isspace()):
+                words = [self.open_word + (words[0] if words else "")] + words[1:]
+            elif (self.open_word):
+                words.insert(0, self.open_word)
+            self.open_word = words.pop() if words and not cipher[-1].isspace() else ""
+            self.word_count += len(words)
+            self.unique_words.update(words)
+
+        shift_log = np.asarray(shift_log, dtype=np.int64)
+        self.drift.update(shift_log)
+        spectrum = spectral_profile(shift_log)
+        self.fft_anomalies += spike_count(shift_log)
+        self.fft_windows += spectrum['windows']
+        self.fft_burst_windows += spectrum['burst_windows']
+        for w in spectrum['worst']:
+            self.fft_bursts.append(dict(w, start=w['start'] + self.shift_offset, end=w['end'] + self.shift_offset))
+        self.fft_bursts = sorted(self.fft_bursts, key=lambda b: (len(b['bins']), b['peak']), reverse=True)[:WEAK_WINDOWS]
+        self.shift_offset += len(shift_log)
+
+        self.tags.extend(tags)
+        self.fusion_map.update(fusion_map or {})
+        return self
+
+    def metrics(self, password=""):
+        """
+        Every score the inspector reports, as plain JSON-ready values.
+        """
+        metrics = {}
+        stats = self.stats.result()
+        word_count = self.word_count + (1 if self.open_word else 0)
+        unique_words = self.unique_words | ({self.open_word} if self.open_word else set())
+        metrics['symbol_count'] = self.symbol_count
+        metrics['word_count'] = word_count
+        metrics['symbol_density'] = round(metrics['symbol_count'] / (metrics['word_count'] + 1), 2)
+        metrics['shannon_entropy'] = round(stats["entropy"], 4)
+        metrics['symbol_skew'] = round(stats["symbol_skew"], 2)
+        metrics['distinct_bytes'] = stats["distinct_bytes"]
+        metrics['compression_ratio'] = round(stats["compression_ratio"], 3)
+        windows = self.window_profile.result(WEAK_WINDOWS)
+        metrics['entropy_windows'] = windows["windows"]
+        # None when the cipher is shorter than one window; it is then scored as one partial window
+        metrics['min_window_entropy'] = round_or_none(windows["min_entropy"], 4)
+        metrics['max_window_bit_bias'] = round_or_none(windows["max_bit_bias"], 4)
+        metrics['weak_windows'] = windows["worst"]
+        metrics['partial_window'] = windows["partial"]
+
+        drift = self.drift.result()
+        drift_range = drift['spread'] if drift['length'] else 1
+        metrics['shift_count'] = drift['length']
+        metrics['drift_score'] = round((drift['entropy'] / (drift_range + 1)) % 100, 2)
+        metrics['drift_volatility'] = round(drift['volatility'], 4)
+        metrics['max_rolling_volatility'] = round(drift['peak_rolling_volatility'], 4)
+        metrics['drift_bar'] = drift['drift_bar']
+
+        tags = self.tags
+        phantom_tags = [t for t in tags if "PHANTOM" in t or "Δ" in t or "⌜" in t]
+        metrics['tags'] = len(tags)
+        metrics['phantom_tags'] = len(phantom_tags)
+        metrics['tag_saturation'] = round(len(tags) / (metrics['word_count'] + 1), 2)
+
+        fusion_map = self.fusion_map
+        metrics['fusion_map'] = fusion_map
+        metrics['fusion_weight'] = fusion_entropy_weight(fusion_map)
+        metrics['unique_symbols'] = len(unique_words)
+        metrics['uniqueness_ratio'] = round(metrics['unique_symbols'] / (metrics['word_count'] + 1), 3)
+        metrics['password_strength'] = estimate_password_strength(password)
+        metrics['complexity_bits'] = calculate_symbolic_strength(tags, metrics['drift_score'], metrics['uniqueness_ratio'])
+        metrics['behavior'] = classify_behavior(metrics['drift_volatility'], metrics['tag_saturation'], metrics['symbol_skew'])
+        metrics['confidence'] = confidence_estimator(phantom_tags, metrics['drift_volatility'], metrics['symbol_skew'])
+        metrics.update(nist_fields(stats))
+        metrics['est_layers'] = 3 + (1 if fusion_map else 0) + (1 if phantom_tags else 0)
+
+        metrics['fft_anomalies'] = self.fft_anomalies
+        metrics['fft_classification'] = classify_fft(metrics['fft_anomalies'])
+        metrics['fft_windows'] = self.fft_windows
+        metrics['fft_burst_windows'] = self.fft_burst_windows
+        metrics['fft_bursts'] = [{"start": w["start"], "end": w["end"], "freqs": w["freqs"]} for w in self.fft_bursts]
+        return metrics
+
+def package_metrics(package, password=""):
+    """
+    Scores for one opened JSON/binary package.
+    """
+    tally = PackageTally().add(package.get("cipher", ""), package.get("shift_log", []),
+                               package.get("subconscious", []), package.get("fusion_map", {}))
+    return tally.metrics(password or package.get("password", ""))
+
+def stream_metrics(filepath, password):
+    """
+    Scores for a streaming (BHXS) container, verified and scored chunk by
+    chunk through read_stream. Each chunk is an independent encryption, so
+    the FFT anomaly count is summed over the chunks' shift logs.
+    """
+    tally = PackageTally()
+    with open(filepath, "rb") as f:
+        for payload in read_stream(f, password):
+            chunk = json.loads(payload)
+            tally.add(chunk.get("sep", "") + chunk["cipher"], chunk.get("shift_log", []))
+    return tally.metrics(password)
+
+def analyze_entropy_metrics(package, output_to_file=False, metrics=None):
+    from colorama import Fore, Style, init
+    init(autoreset=True)
+    m = metrics or package_metrics(package)
+    raw = package.get("cipher", "")
+    shift_log = package.get("shift_log", [])
+    fusion_summary = ", ".join(f"{k}:{v}" for k, v in m['fusion_map'].items()) if m['fusion_map'] else "None"
+
+    output_lines = [
+        f"FFT Anomaly Spikes Detected: {m['fft_anomalies']}",
+        f"FFT Classification: {m['fft_classification']}",
+        f"FFT Burst Windows:  {m['fft_burst_windows']} of {m['fft_windows']}"
+        + ''.join(f" | [{b['start']}:{b['end']}] f={b['freqs'][:3]}" for b in m['fft_bursts'][:3]),
         "\n=== 🔍 BLACKHOLE ENTROPY INSPECTION ===",
-        f"Word Count:             {metrics['word_count']}",
-        f"Symbol Count:           {metrics['symbol_count']}",
-        f"Symbol Density:         {metrics['symbol_density']}",
-        f"Shannon Entropy:        {metrics['shannon_entropy']}",
-        f"Drift Score:            {drift_score}",
-        f"Drift Volatility:       {drift_volatility}",
-        f"Subconscious Tags:      {len(tags)} total | {len(phantom_tags)} phantom",
-        f"Tag Saturation:         {tag_saturation}",
-        f"Visual Drift Signature: {drift_bar}",
-        f"Detected Layers:        {est_layers} (base + fusion/oracle flags)",
+        f"Word Count:             {m['word_count']}",
+        f"Symbol Count:           {m['symbol_count']}",
+        f"Symbol Density:         {m['symbol_density']}",
+        f"Shannon Entropy:        {m['shannon_entropy']}",
+        f"Window Entropy:         min {show_value(m['min_window_entropy'])} over {m['entropy_windows']} x {PROFILE_WINDOW} B windows"
+        f" | max bit bias {show_value(m['max_window_bit_bias'])}"
+        + (f" | shorter than one window: {m['partial_window']['entropy']} over {m['partial_window']['end']} B" if m['partial_window'] else ""),
+        f"Weakest Windows:        " + (", ".join(f"[{w['start']}:{w['end']}] {w['entropy']}" for w in m['weak_windows']) or "n/a"),
+        f"Drift Score:            {m['drift_score']}",
+        f"Drift Volatility:       {m['drift_volatility']} | peak rolling {m['max_rolling_volatility']}",
+        f"Subconscious Tags:      {m['tags']} total | {m['phantom_tags']} phantom",
+        f"Tag Saturation:         {m['tag_saturation']}",
+        f"Visual Drift Signature: {m['drift_bar']}",
+        f"Detected Layers:        {m['est_layers']} (base + fusion/oracle flags)",
         f"Fusion Map:             {fusion_summary}",
-        f"Fusion Entropy Weight:  {fusion_weight}",
-        f"Symbol Uniqueness:      {unique_symbols} unique | Ratio: {uniqueness_ratio}",
-        f"Symbol Frequency Skew:  {metrics['symbol_skew']}",
-        f"Password Influence:     ~{password_strength} bits (est.)",
-        f"NIST Approx Bit Ratio:  {nist['bit_ratio']} | Runs: {nist['bit_runs']}",
+        f"Fusion Entropy Weight:  {m['fusion_weight']}",
+        f"Symbol Uniqueness:      {m['unique_symbols']} unique | Ratio: {m['uniqueness_ratio']}",
+        f"Symbol Frequency Skew:  {m['symbol_skew']}",
+        f"Password Influence:     ~{m['password_strength']} bits (est.)",
+        f"NIST Approx Bit Ratio:  {m['bit_ratio']} | Runs: {m['bit_runs']}",
         "---------------------------------------",
-        f"Symbolic Strength Index: 2^{complexity_bits} (~{round(complexity_bits / 3.32, 2)} decimal digits)",
-        f"{behavior_class}",
-        f"Confidence Level:       {confidence}%",
+        f"Symbolic Strength Index: 2^{m['complexity_bits']} (~{round(m['complexity_bits'] / 3.32, 2)} decimal digits)",
+        f"{m['behavior']}",
+        f"Confidence Level:       {m['confidence']}%",
         "=======================================\n"
-    ])
+    ]
 
     print('\n'.join([Fore.CYAN + line + Style.RESET_ALL for line in output_lines]))
     if output_to_file:
@@ -249,7 +389,93 @@ def analyze_entropy_metrics(package, output_to_file=False):
         plot_symbol_histogram(raw)
         plot_fft_of_shift_log(shift_log)
 
-if __name__ == "__main__":
+# === Headless Batch Inspection ===
+def iter_packages(root_dir):
+    """
+    Every .bhex file under root_dir, in sorted order.
+    """
+    for root, dirs, files in os.walk(root_dir):
+        dirs.sort()
+        for name in sorted(files):
+            if name.endswith(BHEX_SUFFIX):
+                yield os.path.join(root, name)
+
+def inspect_file(path, password):
+    """
+    Open and score one package in a worker. Errors are reported, not raised.
+    """
+    started = time.perf_counter()
+    record = {"path": path, "status": "ok", "error": None, "bytes": 0}
+    try:
+        record["bytes"] = os.path.getsize(path)
+        if is_stream_file(path):
+            record.update(stream_metrics(path, password))
+        else:
+            record.update(package_metrics(load_package(path, password), password))
+    except Exception as e:
+        record["status"] = "failed"
+        record["error"] = f"{type(e).__name__}: {e}"
+    record["seconds"] = round(time.perf_counter() - started, 4)
+    return record
+
+def inspect_directory(root_dir, password, workers=None, max_in_flight=None):
+    """
+    Yield one record per package as it completes, keeping at most
+    max_in_flight (default 4 per worker) packages queued on the pool.
+    """
+    workers = workers or os.cpu_count() or 1
+    max_in_flight = max_in_flight or workers * 4
+    if workers == 1:
+        for path in iter_packages(root_dir):
+            yield inspect_file(path, password)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = set()
+        for path in iter_packages(root_dir):
+            pending.add(pool.submit(inspect_file, path, password))
+            if len(pending) >= max_in_flight:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+        for future in as_completed(pending):
+            yield future.result()
+
+def format_record(record, fmt):
+    if fmt == "jsonl":
+        return json.dumps(record, ensure_ascii=False)
+    if record["status"] != "ok":
+        return f"[FAILED] {record['path']} {record['error']}"
+    return (f"[OK] {record['path']} | entropy {record['shannon_entropy']} (window min {show_value(record['min_window_entropy'])}) | bits {record['bit_ratio']} "
+            f"| runs {record['bit_runs']} | skew {record['symbol_skew']} | volatility {record['drift_volatility']} "
+            f"| fft bursts {record['fft_burst_windows']} | {record['behavior']}")
+
+def run_inspect_command(args):
+    password = args.password or os.environ.get("BLACKHOLE_PASSWORD")
+    if not password:
+        print("[ERROR] --password (or BLACKHOLE_PASSWORD) is required", file=sys.stderr)
+        return 2
+    if not os.path.isdir(args.dir):
+        print(f"[ERROR] Not a directory: {args.dir}", file=sys.stderr)
+        return 2
+
+    out = open(args.out, "w", encoding="utf-8") if args.out else sys.stdout
+    ok = failed = 0
+    started = time.perf_counter()
+    try:
+        for record in inspect_directory(args.dir, password, args.workers, args.max_in_flight):
+            out.write(format_record(record, args.format) + "\n")
+            if record["status"] == "ok":
+                ok += 1
+            else:
+                failed += 1
+    finally:
+        if args.out:
+            out.close()
+    print(f"[Inspect] {ok} ok, {failed} failed in {time.perf_counter() - started:.2f} s", file=sys.stderr)
+    return 1 if failed else 0
+
+def run_dialog_inspection():
+    from tkinter import filedialog, Tk, simpledialog, messagebox
     root = Tk()
     root.withdraw()
     use_null = messagebox.askyesno("B4.3?", "Analyze a B4.3 Null Signature Package?")
@@ -259,8 +485,34 @@ if __name__ == "__main__":
         pkg = decrypt_null_signature_bhex(password, map_path)
     else:
         filepath = filedialog.askopenfilename(title="Select .bhex File", filetypes=[("BlackHole Packages", "*.bhex")])
+        if filepath and is_stream_file(filepath):
+            # Streaming containers are scored chunk by chunk; there is no single package to plot
+            try:
+                metrics = stream_metrics(filepath, password)
+            except Exception as e:
+                messagebox.showerror("Stream Container", f"Failed to read streaming .bhex container: {e}")
+                return
+            analyze_entropy_metrics({}, output_to_file=True, metrics=metrics)
+            messagebox.showinfo("Analysis Complete", "Streaming container scored; entropy report saved.")
+            return
         pkg = decrypt_bhex_file(filepath, password)
     if pkg:
         pkg["password"] = password
         analyze_entropy_metrics(pkg, output_to_file=True)
         messagebox.showinfo("Analysis Complete", "All entropy visuals and FFT output saved.")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="BlackHole entropy inspector (no command: interactive Tk dialogs)")
+    commands = parser.add_subparsers(dest='command')
+    inspect = commands.add_parser('inspect', help="Score every .bhex package under a directory")
+    inspect.add_argument('dir', help="Directory walked recursively for .bhex files")
+    inspect.add_argument('--password', type=str, default=None, help="Package password (default: $BLACKHOLE_PASSWORD)")
+    inspect.add_argument('--workers', type=int, default=None, help="Worker processes (default: CPU count)")
+    inspect.add_argument('--max-in-flight', type=int, default=None, help="Packages queued on the pool at once (default: 4 per worker)")
+    inspect.add_argument('--format', choices=['jsonl', 'text'], default='jsonl', help="One JSON line or one summary line per package")
+    inspect.add_argument('--out', type=str, default=None, help="Write records here instead of stdout")
+    args = parser.parse_args()
+
+    if args.command == 'inspect':
+        sys.exit(run_inspect_command(args))
+    run_dialog_inspection()
@@ -0,0 +1,203 @@
+# === Headless Engine Stage Benchmark and Regression Check ===
+# Times each engine stage over a sweep of message sizes (warmup, repetitions,
+# percentiles) and compares throughput against a saved JSON baseline.
+# Run from the project root with:
+#   python -m tests.BlackHoleStageBenchmark --save bench_baseline.json
+#   python -m tests.BlackHoleStageBenchmark --baseline bench_baseline.json --threshold 0.15
+
+import argparse
+import json
+import platform
+import sys
+import time
+
+import numpy as np
+
+from src import blackhole_v6 as bh
+from src.utils.key_context import encryption_context
+from src.utils.package_utils import open_bhex, seal_binary
+
+DEFAULT_SIZES = ["100B", "10KB", "1MB", "10MB"]  # up to 100MB via --sizes
+STAGES = ["encrypt_message", "encrypt_1to1", "decrypt_1to1", "foam", "fractal", "packaging", "unpackaging"]
+PERCENTILES = (50, 90, 99)
+BENCH_PASSWORD = "bench-password"
+_UNITS = {"B": 1, "KB": 1 << 10, "MB": 1 << 20, "GB": 1 << 30}
+_WORDS = ("the quick brown fox jumps over lazy dog entropy drift rotor oracle phantom "
+          "Fibonacci Cube Axiom signal noise memory fractal branch fusion, parasite. vowel!").split()
+
+
+def parse_size(label):
+    label = label.strip().upper()
+    for unit in sorted(_UNITS, key=len, reverse=True):
+        if label.endswith(unit):
+            return int(float(label[:-len(unit)]) * _UNITS[unit])
+    return int(label)
+
+def make_message(size, seed=0):
+    """
+    Deterministic word text of exactly `size` bytes (ASCII).
+    """
+    rng = np.random.default_rng(seed)
+    picks = rng.integers(0, len(_WORDS), size=size // 4 + 2)
+    text = ' '.join(_WORDS[i] for i in picks)
+    while len(text) < size:
+        text += ' ' + text
+    return text[:size].rstrip() or "a"
+
+
+# === Stage Setup ===
+def build_stages(message):
+    """
+    Stage name -> zero-argument callable. Every input a stage needs is
+    produced here, outside the timed region.
+    """
+    keys = encryption_context(BENCH_PASSWORD)
+    drift_key = keys.drift_key(BENCH_PASSWORD)
+    fibonacci = bh.generate_fibonacci_sequence(bh.FIBONACCI_DEPTH)
+
+    encrypted, shift_log = bh.encrypt_message_array(message, fibonacci, drift_key)
+    cipher, shared_log = bh.encrypt_1to1(encrypted)
+    table = bh.build_symbol_table(shared_log)
+    package = {
+        "cipher": cipher,
+        "shift_log": shift_log,
+        "key_hash": keys.key_hash,
+        "created_at": time.ctime(),
+        "key_profile": {},
+        "subconscious": [],
+        "symbol_table": table
+    }
+    sealed = seal_binary(package, keys)
+
+    def foam():
+        rng = bh.noise_generator(drift_key)
+        noise = bh.generate_planck_noise(drift_key, length=len(encrypted), rng=rng)
+        return bh.apply_quantum_foam(encrypted, shift_log, noise, rng=rng)
+
+    def fractal():
+        rng = bh.noise_generator(drift_key)
+        return bh.FractalMemory.log(encrypted, shift_log).decay(mode="wobble", strength=0.1, rng=rng).apply(encrypted)
+
+    return {
+        "encrypt_message": lambda: bh.encrypt_message_array(message, fibonacci, drift_key),
+        "encrypt_1to1": lambda: bh.encrypt_1to1(encrypted),
+        "decrypt_1to1": lambda: bh.decrypt_1to1(cipher, table),
+        "foam": foam,
+        "fractal": fractal,
+        "packaging": lambda: seal_binary(package, keys),
+        "unpackaging": lambda: open_bhex(sealed, BENCH_PASSWORD)
+    }
+
+
+# === Timing ===
+def time_call(func, repeat=5, warmup=1):
+    """
+    Run func `warmup` times untimed, then `repeat` times; returns the
+    per-run durations in nanoseconds.
+    """
+    for _ in range(warmup):
+        func()
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter_ns()
+        func()
+        samples.append(time.perf_counter_ns() - started)
+    return samples
+
+def summarize_samples(samples, nbytes):
+    """
+    Latency percentiles (ms) and throughput (MB/s at the median).
+    """
+    ns = np.asarray(samples, dtype=np.float64)
+    stats = {f"p{p}_ms": round(float(np.percentile(ns, p)) / 1e6, 4) for p in PERCENTILES}
+    stats["mean_ms"] = round(float(ns.mean()) / 1e6, 4)
+    stats["runs"] = len(samples)
+    stats["bytes"] = nbytes
+    median_s = float(np.percentile(ns, 50)) / 1e9
+    stats["mb_per_sec"] = round(nbytes / (1 << 20) / median_s, 3) if median_s > 0 else None
+    return stats
+
+def run_suite(sizes=DEFAULT_SIZES, stages=STAGES, repeat=5, warmup=1, log=print):
+    results = {stage: {} for stage in stages}
+    for label in sizes:
+        message = make_message(parse_size(label))
+        nbytes = len(message.encode())
+        available = build_stages(message)
+        for stage in stages:
+            stats = summarize_samples(time_call(available[stage], repeat, warmup), nbytes)
+            results[stage][label] = stats
+            log(f"{stage:<16} {label:>6}  p50 {stats['p50_ms']:>10.3f} ms  p90 {stats['p90_ms']:>10.3f} ms  "
+                f"p99 {stats['p99_ms']:>10.3f} ms  {stats['mb_per_sec']:>9} MB/s")
+    return {
+        "meta": {
+            "created_at": time.strftime('%Y-%m-%d %H:%M:%S'),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "machine": platform.platform(),
+            "repeat": repeat,
+            "warmup": warmup
+        },
+        "results": results
+    }
+
+
+# === Baseline Regression Check ===
+def compare_to_baseline(report, baseline, threshold=0.10):
+    """
+    Stage/size pairs whose median throughput fell more than `threshold`
+    (a fraction) below the baseline. Pairs missing on either side are skipped.
+    """
+    regressions = []
+    for stage, by_size in report["results"].items():
+        for label, stats in by_size.items():
+            base = baseline.get("results", {}).get(stage, {}).get(label)
+            if not base or not base.get("mb_per_sec") or not stats.get("mb_per_sec"):
+                continue
+            drop = 1 - stats["mb_per_sec"] / base["mb_per_sec"]
+            if drop > threshold:
+                regressions.append({
+                    "stage": stage,
+                    "size": label,
+                    "baseline_mb_per_sec": base["mb_per_sec"],
+                    "mb_per_sec": stats["mb_per_sec"],
+                    "drop": round(drop, 4)
+                })
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless BlackHole engine stage benchmark")
+    parser.add_argument('--sizes', default=','.join(DEFAULT_SIZES), help="Comma-separated message sizes, e.g. 100B,10KB,1MB,100MB")
+    parser.add_argument('--stages', default=','.join(STAGES), help=f"Comma-separated subset of: {', '.join(STAGES)}")
+    parser.add_argument('--repeat', type=int, default=5, help="Timed runs per stage and size")
+    parser.add_argument('--warmup', type=int, default=1, help="Untimed runs before timing")
+    parser.add_argument('--save', help="Write the results to this JSON file (e.g. a new baseline)")
+    parser.add_argument('--baseline', help="Compare against this JSON baseline")
+    parser.add_argument('--threshold', type=float, default=0.10, help="Allowed throughput drop vs. baseline (fraction, default 0.10)")
+    args = parser.parse_args(argv)
+
+    stages = [s.strip() for s in args.stages.split(',') if s.strip()]
+    unknown = [s for s in stages if s not in STAGES]
+    if unknown:
+        parser.error(f"Unknown stages: {', '.join(unknown)}")
+    sizes = [s.strip() for s in args.sizes.split(',') if s.strip()]
+
+    report = run_suite(sizes, stages, repeat=max(1, args.repeat), warmup=max(0, args.warmup))
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(report, f, indent=4)
+        print(f"\n[Saved] {args.save}")
+
+    if args.baseline:
+        with open(args.baseline, "r") as f:
+            baseline = json.load(f)
+        regressions = compare_to_baseline(report, baseline, args.threshold)
+        if regressions:
+            print(f"\n[REGRESSION] {len(regressions)} stage/size pair(s) more than {args.threshold:.0%} slower than {args.baseline}:")
+            for r in regressions:
+                print(f"  {r['stage']:<16} {r['size']:>6}  {r['baseline_mb_per_sec']} -> {r['mb_per_sec']} MB/s (-{r['drop']:.1%})")
+            return 1
+        print(f"\n[OK] No stage regressed more than {args.threshold:.0%} against {args.baseline}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
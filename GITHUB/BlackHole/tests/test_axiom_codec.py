@@ -0,0 +1,187 @@
+# Run from the project root with:  python -m pytest -q tests
+# AxiomCore symbol codec: arithmetic symbol indices must reproduce the old
+# import-time symbol tables and invert exactly, and the keyed session pools
+# must stay bijections over their slots. Packed symbol tables must decode
+# like the (char, symbol) pair lists they replace.
+
+import itertools
+import json
+
+import numpy as np
+import pytest
+
+from src.blackhole_v6 import PUNCTUATION_CHARS, decrypt_1to1, digit_symbols, encrypt_1to1, punct_symbols
+from src.utils.axiom_codec import (
+    ALPHABET, POOL_SIZE, SYMBOL_WIDTH, SessionPool, build_symbol_table, index_from_symbol, pack_symbol_table,
+    pool_slot, pool_symbol, symbol_codepoints, symbol_from_index, symbol_index, unpack_symbol_table
+)
+
+ALL_SYMBOLS = [''.join(p) for p in itertools.product(ALPHABET, repeat=SYMBOL_WIDTH)]
+
+
+@pytest.mark.parametrize("letter", ["A", "M", "Z"])
+def test_pools_match_the_old_filtered_tables(letter):
+    filtered = [s for s in ALL_SYMBOLS if letter not in s]
+    assert [pool_symbol(letter, "upper", slot) for slot in range(POOL_SIZE)] == filtered[:POOL_SIZE]
+    assert [pool_symbol(letter.lower(), "lower", slot) for slot in range(POOL_SIZE)] == filtered[POOL_SIZE:2 * POOL_SIZE]
+
+def test_digit_and_punctuation_symbols_match_the_old_tables():
+    for d in range(10):
+        assert digit_symbols[str(d)] == [s for s in ALL_SYMBOLS if str(d) not in s][:10]
+    for p in PUNCTUATION_CHARS:
+        assert punct_symbols[p] == ALL_SYMBOLS[:10]
+
+@pytest.mark.parametrize("exclude", [None, "A", "M", "Z"])
+def test_symbol_index_round_trip(exclude):
+    base = len(ALPHABET) - (1 if exclude else 0)
+    for index in (0, 1, base - 1, base, 12345, base ** SYMBOL_WIDTH - 1):
+        assert index_from_symbol(symbol_from_index(index, exclude), exclude) == index
+    with pytest.raises(IndexError):
+        symbol_from_index(base ** SYMBOL_WIDTH, exclude)
+    assert index_from_symbol("AB", exclude) is None
+    assert index_from_symbol("ab_c", exclude) is None
+
+def test_pool_slot_inverts_pool_symbol():
+    for letter in ALPHABET:
+        for case in ("upper", "lower"):
+            for slot in (0, 1, 499, POOL_SIZE - 1):
+                assert pool_slot(letter, pool_symbol(letter, case, slot)) == (case, slot)
+    assert pool_slot("a", "AAAA") is None
+    assert pool_slot("a", "ZZZZ") is None
+    with pytest.raises(IndexError):
+        pool_symbol("a", "upper", POOL_SIZE)
+
+
+# === Session Pools ===
+ROUND_KEYS = [
+    [0, 0, 0, 0],
+    [1, 2, 3, 4],
+    [0xFFFFFFFF] * 4,
+    [0x9E3779B1, 0x85EBCA6B, 0xC2B2AE35, 0x27D4EB2F]
+]
+
+@pytest.mark.parametrize("round_keys", ROUND_KEYS)
+def test_feistel_is_a_bijection_over_ten_bits(round_keys):
+    pool = SessionPool("a", "upper", round_keys)
+    assert sorted(pool._feistel(i) for i in range(1024)) == list(range(1024))
+
+@pytest.mark.parametrize("round_keys", ROUND_KEYS)
+def test_permute_is_a_bijection_over_the_pool(round_keys):
+    pool = SessionPool("a", "upper", round_keys)
+    assert sorted(pool.permute(i) for i in range(POOL_SIZE)) == list(range(POOL_SIZE))
+
+@pytest.mark.parametrize("round_keys", ROUND_KEYS)
+def test_permute_range_matches_permute(round_keys):
+    pool = SessionPool("a", "upper", round_keys)
+    assert pool.permute_range(0, POOL_SIZE).tolist() == [pool.permute(i) for i in range(POOL_SIZE)]
+    assert pool.permute_range(250, 260).tolist() == [pool.permute(i) for i in range(250, 260)]
+
+def test_take_slots_continues_and_stops_at_the_pool_size():
+    pool = SessionPool("q", "lower", ROUND_KEYS[3])
+    first = pool.take_slots(600)
+    rest = pool.take_slots(600)
+    assert len(first) == 600 and len(rest) == POOL_SIZE - 600
+    assert np.concatenate((first, rest)).tolist() == [pool.permute(i) for i in range(POOL_SIZE)]
+    assert len(pool.take_slots(5)) == 0
+    assert pool.take() is None
+
+@pytest.mark.parametrize("letter, case", [("a", "upper"), ("q", "lower"), ("Z", "upper")])
+def test_take_issues_every_slot_once_then_stops(letter, case):
+    pool = SessionPool(letter, case)
+    symbols = [pool.take() for _ in range(POOL_SIZE)]
+    assert len(set(symbols)) == POOL_SIZE
+    assert all(letter.upper() not in s for s in symbols)
+    assert sorted(pool_slot(letter, s)[1] for s in symbols) == list(range(POOL_SIZE))
+    assert {pool_slot(letter, s)[0] for s in symbols} == {case}
+    assert pool.take() is None
+
+def test_symbol_codepoints_match_symbol_from_index():
+    indices = [0, 1, 24, 25, 999, 1999, 24 ** 4]
+    for exclude in (None, "A", "K"):
+        decoded = [''.join(map(chr, row)) for row in symbol_codepoints(indices, exclude)]
+        assert decoded == [symbol_from_index(i, exclude) for i in indices]
+
+
+# === AxiomCore Encode ===
+MESSAGES = {
+    "short": "Hello World",
+    "punctuation": "Drift, rotor; oracle! __one__ (phantom) [memory] @#$%",
+    "unicode": "Ünïcode ß 黑洞 \U0001F573 naïve Ωmega",
+    "exhausted": "e" * 1500 + " " + "E" * 1200,
+    "empty": "   "
+}
+
+@pytest.mark.parametrize("name", MESSAGES)
+def test_encrypt_1to1_round_trip(name):
+    message = MESSAGES[name]
+    cipher, shared_log = encrypt_1to1(message)
+    pairs = list(shared_log)
+    assert [c for c, _ in pairs] == list(''.join(message.split()))
+    assert all(len(symbol) == SYMBOL_WIDTH for _, symbol in pairs)
+    assert [len(w) for w in cipher.split(' ')] == [SYMBOL_WIDTH * len(w) for w in message.split()] or not pairs
+    assert cipher.replace(' ', '') == ''.join(symbol for _, symbol in pairs)
+    expected = ' '.join(message.split())
+    assert decrypt_1to1(cipher, pairs) == expected
+    assert decrypt_1to1(cipher, shared_log) == expected
+    assert build_symbol_table(shared_log) == build_symbol_table(pairs)
+    assert decrypt_1to1(cipher, build_symbol_table(shared_log)) == expected
+
+def test_encrypt_1to1_draws_each_pool_slot_once():
+    _, shared_log = encrypt_1to1(MESSAGES["exhausted"])
+    lower = [symbol for c, symbol in shared_log if c == "e"]
+    upper = [symbol for c, symbol in shared_log if c == "E"]
+    assert len(set(lower[:POOL_SIZE])) == POOL_SIZE and set(lower[POOL_SIZE:]) == {"unkn"}
+    assert len(set(upper[:POOL_SIZE])) == POOL_SIZE and set(upper[POOL_SIZE:]) == {"UNKN"}
+    assert {pool_slot("e", s)[0] for s in lower[:POOL_SIZE]} == {"lower"}
+    assert {pool_slot("E", s)[0] for s in upper[:POOL_SIZE]} == {"upper"}
+
+def test_encrypt_1to1_symbol_classes():
+    _, shared_log = encrypt_1to1(MESSAGES["unicode"] + " 7 , x")
+    for c, symbol in shared_log:
+        if c in digit_symbols:
+            assert symbol in digit_symbols[c]
+        elif c in punct_symbols:
+            assert symbol in punct_symbols[c]
+        elif c.isascii() and c.isalpha():
+            assert pool_slot(c, symbol)[0] == ("upper" if c.isupper() else "lower")
+        elif c.isupper() or c.islower():
+            assert symbol == ("UNKN" if c.isupper() else "unkn")
+        else:
+            assert len(symbol) == SYMBOL_WIDTH and symbol.isupper()
+
+
+# === Packed Shared-Symbol Table ===
+SHARED_LOGS = {
+    "ascii": [("h", "BCDE"), ("i", "ZZZZ"), (" ", "unkn")],
+    "latin": [("é", "ABCD"), ("ß", "unkn")],
+    "cjk": [("黑", "QQQQ"), ("洞", "ABCE")],
+    "astral": [("\U0001F573", "WXYZ")],
+    "empty": []
+}
+
+@pytest.mark.parametrize("name", SHARED_LOGS)
+def test_symbol_table_round_trip(name):
+    shared_log = SHARED_LOGS[name]
+    for table in (build_symbol_table(shared_log), pack_symbol_table(shared_log)):
+        codepoints, indices = unpack_symbol_table(table)
+        assert [chr(c) for c in codepoints] == [c for c, _ in shared_log]
+        assert indices.tolist() == [symbol_index(s) for _, s in shared_log]
+    assert json.loads(json.dumps(pack_symbol_table(shared_log))) == pack_symbol_table(shared_log)
+
+@pytest.mark.parametrize("name, width", [("ascii", 1), ("latin", 1), ("cjk", 2), ("astral", 4)])
+def test_symbol_table_uses_the_narrowest_char_width(name, width):
+    assert build_symbol_table(SHARED_LOGS[name])["char_width"] == width
+
+def test_table_decode_matches_the_pair_list():
+    cipher, shared_log = encrypt_1to1("Packed tables, same text: Ωmega 黑洞!")
+    pairs = list(shared_log)
+    assert decrypt_1to1(cipher, pack_symbol_table(pairs)) == decrypt_1to1(cipher, pairs)
+    # A damaged symbol falls back to '?' in both decoders
+    damaged = "QQQQ" + cipher[4:]
+    assert decrypt_1to1(damaged, build_symbol_table(pairs)) == decrypt_1to1(damaged, pairs)
+
+def test_truncated_symbol_table_is_rejected():
+    table = build_symbol_table(SHARED_LOGS["ascii"])
+    table["symbols"] = table["symbols"][:-4]
+    with pytest.raises(ValueError):
+        unpack_symbol_table(table)
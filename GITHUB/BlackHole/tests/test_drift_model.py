@@ -0,0 +1,67 @@
+# Run from the project root with:  python -m pytest -q tests
+# Drift analytics against the original list-based formulas, including
+# legacy shift logs of wrapped int64 Fibonacci values.
+
+import statistics
+
+import numpy as np
+import pytest
+
+from src.blackhole_v6 import calculate_drift_score
+from src.utils.drift_model import compute_drift_vector, drift_total, drift_volatility
+from tests.BlackHoleEntropyInspector import package_metrics
+
+
+def legacy_fibonacci_log(start=377, length=400):
+    # The pre-Pisano engine filled an int64 array with F(i) and let it wrap
+    a, b, values = 1, 1, []
+    for _ in range(start + length):
+        values.append(a)
+        a, b = b, (a + b) % 2**64
+    return [v - 2**64 if v >= 2**63 else v for v in values[start:]]
+
+def baseline_drift(shift_log):
+    """
+    The inspector's drift fields exactly as the baseline computed them.
+    """
+    entropy_score = sum(shift_log)
+    drift_range = max(shift_log) - min(shift_log) if shift_log else 1
+    return {
+        "drift_score": round((entropy_score / (drift_range + 1)) % 100, 2),
+        "drift_volatility": round(statistics.stdev(shift_log), 4) if len(shift_log) > 1 else 0.0,
+        "drift_bar": ''.join(['|' if s > 40 else ':' if s > 20 else '.' for s in shift_log[:60]])
+    }
+
+LOGS = {
+    "legacy": [3, 17, 25, 41] + legacy_fibonacci_log(),
+    "current": np.random.default_rng(6).integers(0, 60, 500).tolist(),
+    "short": [42],
+    "empty": []
+}
+
+
+@pytest.mark.parametrize("name", LOGS)
+def test_inspector_drift_matches_baseline(name):
+    shift_log = LOGS[name]
+    metrics = package_metrics({"cipher": "abc def", "shift_log": np.asarray(shift_log, dtype=np.int64)})
+    expected = baseline_drift(shift_log)
+    assert {key: metrics[key] for key in expected} == expected
+
+def test_legacy_total_does_not_wrap():
+    shift_log = LOGS["legacy"]
+    assert drift_total(np.asarray(shift_log, dtype=np.int64)) == sum(shift_log)
+    assert compute_drift_vector(shift_log)["entropy"] == sum(shift_log)
+    assert drift_volatility(shift_log) == statistics.stdev(shift_log)
+
+def test_engine_drift_score_uses_exact_spread():
+    shift_log = np.asarray(LOGS["legacy"], dtype=np.int64)
+    spread = max(LOGS["legacy"]) - min(LOGS["legacy"])
+    assert calculate_drift_score(1234, shift_log) == round(min((1234 / (spread + 1)) % 100, 100.0), 2)
+
+def test_rolling_drift_matches_direct_windows():
+    values = np.asarray(LOGS["current"], dtype=np.int64)
+    rolling = compute_drift_vector(values, window=16)["rolling"]
+    windows = [values[i:i + 16] for i in range(len(values) - 15)]
+    assert np.allclose(rolling["mean"], [w.mean() for w in windows], atol=1e-4)
+    assert np.allclose(rolling["volatility"], [w.std(ddof=1) for w in windows], atol=1e-3)
+    assert np.array_equal(rolling["spread"], [w.max() - w.min() for w in windows])
@@ -0,0 +1,133 @@
+# Run from the project root with:  python -m pytest -q tests
+# Headless Engine round trips: binary and JSON packages, legacy JSON
+# envelopes sealed with the bare SHA-256 password key, and streamed files.
+
+import base64
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src import blackhole_v6 as bh
+from src.utils.key_context import KDF_PBKDF2
+from src.utils.package_utils import encrypt_aes, generate_hmac, password_key
+
+PASSWORD = "event horizon"
+MESSAGES = {
+    "short": "Hello World",
+    "single": "a",
+    "digits": "The quick brown fox jumps over 13 lazy dogs, twice!",
+    "fusion": ("Entropy drift rotor oracle phantom memory " * 40).strip(),
+    "whitespace": "Fibonacci  drift\nengine\trotor",
+    "long": "x" * 5000
+}
+
+
+@pytest.fixture
+def engine(tmp_path):
+    # A cheap KDF cost keeps the suite fast; the pipeline is the same at any cost
+    return bh.Engine(str(tmp_path / "oracle_memory.db"), str(tmp_path / "parasite_memory.json"),
+                     kdf=KDF_PBKDF2, kdf_cost=1000)
+
+def legacy_envelope(message, password):
+    """
+    A package as the pre-KeyContext GUI sealed it: JSON shared_symbols
+    pairs, and one SHA-256 password digest for both AES and HMAC.
+    """
+    fibonacci = bh.generate_fibonacci_sequence(bh.FIBONACCI_DEPTH)
+    encrypted, shift_log = bh.encrypt_message(bh.convert_numbers_to_words(message), fibonacci, password)
+    cipher, shared_log = bh.encrypt_1to1(encrypted)
+    package = {
+        "cipher": cipher,
+        "shift_log": shift_log,
+        "shared_symbols": [list(pair) for pair in shared_log],
+        "key_hash": password_key(password).hex(),
+        "created_at": time.ctime()
+    }
+    key = password_key(password)
+    iv, encrypted_package = encrypt_aes(json.dumps(package).encode(), key)
+    return {
+        "iv": base64.b64encode(iv).decode(),
+        "cipher": base64.b64encode(encrypted_package).decode(),
+        "hmac": base64.b64encode(generate_hmac(encrypted_package, key)).decode()
+    }
+
+
+@pytest.mark.parametrize("name", MESSAGES)
+def test_binary_round_trip(engine, name):
+    message = MESSAGES[name]
+    package = engine.encrypt(message, PASSWORD)
+    assert isinstance(package, bytes)
+    # Runs of whitespace collapse to one space, as they always have
+    assert engine.decrypt(package, PASSWORD) == ' '.join(message.split())
+
+@pytest.mark.parametrize("name", ["short", "digits", "fusion"])
+def test_json_round_trip(tmp_path, name):
+    engine = bh.Engine(str(tmp_path / "oracle_memory.db"), str(tmp_path / "parasite_memory.json"),
+                       package_format=bh.FORMAT_JSON, kdf=KDF_PBKDF2, kdf_cost=1000)
+    package = engine.encrypt(MESSAGES[name], PASSWORD)
+    assert isinstance(package, dict)
+    assert engine.decrypt(package, PASSWORD) == MESSAGES[name]
+    assert engine.decrypt(json.dumps(package).encode(), PASSWORD) == MESSAGES[name]
+
+@pytest.mark.parametrize("name", ["short", "digits", "long"])
+def test_legacy_json_package_still_opens(engine, name):
+    envelope = legacy_envelope(MESSAGES[name], PASSWORD)
+    assert engine.decrypt(envelope, PASSWORD) == MESSAGES[name]
+    assert engine.decrypt(json.dumps(envelope), PASSWORD) == MESSAGES[name]
+    with pytest.raises(ValueError):
+        engine.decrypt(envelope, PASSWORD + "!")
+
+def test_wrong_password_is_rejected(engine):
+    package = engine.encrypt(MESSAGES["short"], PASSWORD)
+    with pytest.raises(ValueError):
+        engine.decrypt(package, PASSWORD + "!")
+
+def test_empty_message_and_key_are_rejected(engine):
+    with pytest.raises(ValueError):
+        engine.encrypt("   ", PASSWORD)
+    with pytest.raises(ValueError):
+        engine.encrypt(MESSAGES["short"], "")
+
+def test_encryptions_are_recorded_in_oracle_memory(engine):
+    for _ in range(3):
+        engine.encrypt(MESSAGES["short"], PASSWORD)
+    assert bh.load_oracle_memory(engine.oracle_path)["total_runs"] == 3
+
+@pytest.mark.parametrize("chunk_chars", [64, bh.STREAM_CHUNK_CHARS])
+def test_file_round_trip(engine, tmp_path, chunk_chars):
+    text = (MESSAGES["fusion"] + " " + "Fibonacci-rotor 42 " * 300).strip()
+    src, sealed, out = tmp_path / "in.txt", tmp_path / "in.txt.bhex", tmp_path / "out.txt"
+    src.write_text(text, encoding="utf-8")
+    engine.encrypt_file(str(src), str(sealed), PASSWORD, chunk_chars=chunk_chars)
+    engine.decrypt_file(str(sealed), str(out), PASSWORD)
+    assert out.read_text(encoding="utf-8") == text
+    assert not (tmp_path / "out.txt.part").exists()
+
+def test_failed_file_decrypt_leaves_no_output(engine, tmp_path):
+    src, sealed, out = tmp_path / "in.txt", tmp_path / "in.txt.bhex", tmp_path / "out.txt"
+    src.write_text("Fibonacci-rotor 42 " * 300, encoding="utf-8")
+    engine.encrypt_file(str(src), str(sealed), PASSWORD, chunk_chars=64)
+    # Every chunk still verifies; only the trailer is gone
+    sealed.write_bytes(sealed.read_bytes()[:-41])
+    with pytest.raises(ValueError):
+        engine.decrypt_file(str(sealed), str(out), PASSWORD)
+    assert not out.exists() and not (tmp_path / "out.txt.part").exists()
+    out.write_text("previous", encoding="utf-8")
+    with pytest.raises(ValueError):
+        engine.decrypt_file(str(sealed), str(out), PASSWORD + "!")
+    assert out.read_text(encoding="utf-8") == "previous"
+
+def test_concurrent_encryptions_share_one_engine(engine):
+    def encrypt_many(worker):
+        for i in range(40):
+            engine.encrypt(f"{MESSAGES['short']} {worker} {i}", PASSWORD)
+
+    with ThreadPoolExecutor(8) as pool:
+        # list() re-raises any worker exception
+        list(pool.map(encrypt_many, range(8)))
+    engine.state.flush()
+    assert bh.load_oracle_memory(engine.oracle_path)["total_runs"] == 320
+    with open(engine.parasite_path) as f:
+        assert json.load(f)["influence_count"] == 320
@@ -0,0 +1,129 @@
+# Run from the project root with:  python -m pytest -q tests
+# Streaming entropy accumulators against one-shot and brute-force references,
+# including empty input and input shorter than one window.
+
+import zlib
+
+import numpy as np
+import pytest
+
+from src.utils.entropy_tools import (
+    CipherMetrics, WindowedEntropy, calculate_shannon_entropy, entropy_from_counts,
+    entropy_profile, iter_chunks, score_chunks
+)
+
+rng = np.random.default_rng(9)
+SAMPLES = {
+    "random": rng.integers(0, 256, 20000, dtype=np.uint8).tobytes(),
+    "text": ("AxiomCore drift " * 900).encode(),
+    "skewed": rng.choice(np.arange(4, dtype=np.uint8), 9000, p=[0.7, 0.2, 0.05, 0.05]).tobytes(),
+    "single": b"\xa5",
+    "empty": b""
+}
+CHUNK_SIZES = [1, 7, 4096, 1 << 20]
+
+
+def reference_bits(data):
+    bits = np.unpackbits(np.frombuffer(data, dtype=np.uint8))
+    return int(bits.sum()), int(np.count_nonzero(bits[1:] != bits[:-1]))
+
+def reference_windows(data, window, hop):
+    raw = np.frombuffer(data, dtype=np.uint8)
+    starts = list(range(0, len(raw) - window + 1, hop))
+    if (starts and starts[-1] + window < len(raw)):
+        starts.append(len(raw) - window)
+    entropy = [entropy_from_counts(np.bincount(raw[s:s + window], minlength=256)) for s in starts]
+    ratio = [np.unpackbits(raw[s:s + window]).mean() for s in starts]
+    return starts, entropy, ratio
+
+
+# === Streaming vs One-Shot ===
+@pytest.mark.parametrize("name", SAMPLES)
+@pytest.mark.parametrize("chunk_size", CHUNK_SIZES)
+def test_streaming_metrics_match_one_shot(name, chunk_size):
+    data = SAMPLES[name]
+    one_shot = CipherMetrics().update(data).result()
+    streamed = score_chunks(iter_chunks(data, chunk_size))
+    assert streamed.keys() == one_shot.keys()
+    for key, value in one_shot.items():
+        assert streamed[key] == pytest.approx(value), key
+
+@pytest.mark.parametrize("name", SAMPLES)
+def test_metrics_match_direct_formulas(name):
+    data = SAMPLES[name]
+    report = score_chunks(iter_chunks(data, 7))
+    ones, runs = reference_bits(data)
+    assert report["bytes"] == len(data)
+    assert report["entropy"] == pytest.approx(entropy_from_counts(np.bincount(np.frombuffer(data, dtype=np.uint8), minlength=256)))
+    assert report["bit_ones"] == ones
+    assert report["bit_runs"] == runs
+    assert report["compression_ratio"] == pytest.approx(len(zlib.compress(data)) / len(data) if data else 1.0)
+
+def test_text_chunks_are_scored_as_utf8():
+    text = "黑洞 drift " * 50
+    assert score_chunks(iter_chunks(text, 5)) == score_chunks([text.encode("utf-8")])
+
+def test_shannon_entropy_bounds():
+    assert calculate_shannon_entropy(b"") == 0.0
+    assert calculate_shannon_entropy("aaaa") == 0.0
+    assert calculate_shannon_entropy(bytes(range(256)) * 3) == pytest.approx(8.0)
+
+
+# === Windowed Entropy ===
+@pytest.mark.parametrize("name", ["random", "text", "skewed"])
+@pytest.mark.parametrize("window, hop", [(4096, 2048), (1000, 250), (512, 512)])
+@pytest.mark.parametrize("chunk_size", [1 << 20, 333])
+def test_windowed_entropy_matches_brute_force(name, window, hop, chunk_size):
+    data = SAMPLES[name]
+    profile = WindowedEntropy(window, hop)
+    for chunk in iter_chunks(data, chunk_size):
+        profile.update(chunk)
+    result = profile.result()
+    starts, entropy, ratio = reference_windows(data, window, hop)
+    assert result["starts"].tolist() == starts
+    assert result["windows"] == len(starts)
+    assert np.allclose(result["entropy"], entropy, atol=1e-4)
+    assert np.allclose(result["bit_ratio"], ratio, atol=1e-5)
+    assert result["min_entropy"] == pytest.approx(min(entropy), abs=1e-4)
+    assert result["partial"] is None
+
+def test_tail_past_the_last_hop_is_scored():
+    # 4096 zero bytes then 100 random ones: only the end-aligned window sees them
+    data = bytes(4096) + SAMPLES["random"][:100]
+    result = entropy_profile(data, window=4096, hop=2048)
+    assert result["starts"].tolist() == [0, 100]
+    assert result["entropy"][0] == 0.0
+    assert result["entropy"][1] > 0.0
+    assert result["worst"][-1]["end"] == len(data)
+
+def test_empty_input_has_no_windows():
+    result = entropy_profile(b"", window=4096)
+    assert result["windows"] == 0
+    assert len(result["entropy"]) == 0
+    assert result["min_entropy"] is None
+    assert result["max_bit_bias"] is None
+    assert result["partial"] is None
+    assert result["worst"] == []
+
+@pytest.mark.parametrize("size", [1, 100, 4095])
+def test_input_shorter_than_one_window_is_scored_as_partial(size):
+    data = SAMPLES["random"][:size]
+    result = entropy_profile(data, window=4096)
+    assert result["windows"] == 0
+    assert result["min_entropy"] is None
+    assert result["max_bit_bias"] is None
+    assert result["partial"]["start"] == 0
+    assert result["partial"]["end"] == size
+    assert result["partial"]["entropy"] == round(calculate_shannon_entropy(data), 4)
+    assert result["partial"]["bit_ratio"] == round(reference_bits(data)[0] / (8 * size), 4)
+
+def test_exactly_one_window():
+    data = SAMPLES["random"][:4096]
+    result = entropy_profile(data, window=4096)
+    assert result["windows"] == 1
+    assert result["partial"] is None
+    assert result["min_entropy"] == pytest.approx(calculate_shannon_entropy(data), abs=1e-4)
+
+def test_window_must_be_a_multiple_of_hop():
+    with pytest.raises(ValueError):
+        WindowedEntropy(window=1000, hop=300)
@@ -0,0 +1,83 @@
+# Run from the project root with:  python -m pytest -q tests
+# Fusion stage registry: branch modules register themselves, plans follow
+# stage order and weights, and undeclared buffers stay read-only while a
+# stage runs.
+
+import numpy as np
+import pytest
+
+from src import blackhole_v6 as bh
+from src.fusion_branches import pipeline
+from src.fusion_branches.pipeline import load_branches, plan_fusion, register_stage, run_fusion
+
+BRANCHES = ["B1.1", "B1.2", "B3.1", "B4.1", "B2.4", "B3.3"]  # in stage order
+MESSAGE = "Entropy drift rotor oracle phantom memory"
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    # Test stages go into a copy, so the real registry is untouched
+    stages = dict(load_branches())
+    monkeypatch.setattr(pipeline, "_stages", stages)
+    return stages
+
+
+def test_every_branch_module_registers():
+    stages = load_branches()
+    assert sorted(stages) == sorted(BRANCHES)
+    assert all(set(stage.inputs) | set(stage.outputs) <= set(pipeline.BUFFERS) for stage in stages.values())
+
+def test_unknown_buffers_are_rejected():
+    with pytest.raises(ValueError):
+        register_stage("X9.9", inputs=("cipher",))
+    with pytest.raises(ValueError):
+        register_stage("X9.9", inputs=(), outputs=("shift_log",))
+    assert "X9.9" not in load_branches()
+
+def test_plan_follows_order_and_weights():
+    plan, missing = plan_fusion({branch: 0.5 for branch in reversed(BRANCHES)} | {"B9.9": 1, "B8.8": 0})
+    assert [stage.branch for stage in plan] == BRANCHES
+    assert missing == ["B9.9"]
+    plan, missing = plan_fusion({"B4.1": 0.2, "B1.2": "0.55", "B3.1": 0})
+    assert [stage.branch for stage in plan] == ["B1.2", "B4.1"] and missing == []
+
+def test_stages_share_buffers_and_see_their_weight(registry):
+    seen = []
+
+    @register_stage("T1", inputs=("is_alpha",), order=-2)
+    def first(buffers, state):
+        seen.append(("T1", state["weight"]))
+        buffers.add_shifts(buffers.is_alpha * 4, state["weight"])
+
+    @register_stage("T2", inputs=("shifts",), order=-1)
+    def second(buffers, state):
+        seen.append(("T2", state["weight"], buffers.shifts.copy()))
+        buffers.add_shifts(1, state["weight"], where=buffers.shifts > 0)
+
+    buffers = bh.fusion_buffers("ab c")
+    state = {}
+    assert run_fusion(buffers, {"T2": 1.0, "T1": 0.5, "T0": 1.0}, state) == ["T1", "T2"]
+    assert seen[0] == ("T1", 0.5)
+    assert seen[1][1] == 1.0 and seen[1][2].tolist() == [2, 2, 0, 2]
+    assert buffers.shifts.tolist() == [3, 3, 0, 3]
+    assert state == {"skipped": ["T0"]}
+
+def test_undeclared_outputs_are_read_only(registry):
+    @register_stage("T3", inputs=("codepoints",))
+    def writes_codepoints(buffers, state):
+        buffers.codepoints[0] = 0
+
+    buffers = bh.fusion_buffers("abc")
+    with pytest.raises(ValueError):
+        run_fusion(buffers, {"T3": 1.0}, {})
+    # Locks are released even when a stage fails
+    assert all(getattr(buffers, name).flags.writeable for name in pipeline.BUFFERS)
+    assert buffers.codepoints.tolist() == [ord(c) for c in "abc"]
+
+def test_engine_fusion_round_trip():
+    fusion_map = {"B1.2": 0.55, "B3.1": 0.25, "B4.1": 0.20}
+    encrypted, shifts = bh.invoke_fusion_logic(MESSAGE, "event horizon", fusion_map)
+    assert shifts.dtype == np.int64 and len(shifts) == len(MESSAGE)
+    assert bh.decrypt_message_array(encrypted, shifts) == MESSAGE
+    # The stage state is rebuilt per run, so the same inputs give the same shifts
+    assert bh.invoke_fusion_logic(MESSAGE, "event horizon", fusion_map)[1].tolist() == shifts.tolist()
@@ -0,0 +1,73 @@
+# Run from the project root with:  python -m pytest -q tests
+# KDF parameters from a package header are read before the HMAC can be
+# checked, so forged ids and costs must be rejected before any derivation.
+
+import io
+import threading
+import time
+
+import pytest
+
+from src.utils.key_context import (
+    KDF_PARAMS, KDF_PBKDF2, KDF_SCRYPT, MAX_COSTS, KeyContext, encryption_context, opening_context
+)
+from src.utils.package_utils import STREAM_MAGIC, open_bhex, read_stream, seal_binary, write_stream
+
+PASSWORD = "event horizon"
+# Header offsets of the packed KDF parameters: after magic, version, flags, iv, length / stream id
+BINARY_KDF_OFFSET = 4 + 1 + 1 + 16 + 4
+STREAM_KDF_OFFSET = len(STREAM_MAGIC) + 1 + 1 + 16
+FORGED = {
+    "pbkdf2_cost": (KDF_PBKDF2, 50_000_000),
+    "scrypt_cost": (KDF_SCRYPT, 30),
+    "zero_cost": (KDF_PBKDF2, 0),
+    "unknown_kdf": (7, 1000)
+}
+
+
+@pytest.fixture(scope="module")
+def context():
+    return encryption_context(PASSWORD, KDF_PBKDF2, 1000)
+
+def forge(blob, offset, kdf, cost):
+    salt = KDF_PARAMS.unpack_from(blob, offset)[2]
+    return blob[:offset] + KDF_PARAMS.pack(kdf, cost, salt) + blob[offset + KDF_PARAMS.size:]
+
+
+@pytest.mark.parametrize("name", FORGED)
+def test_forged_binary_header_is_rejected_before_deriving(context, name):
+    blob = forge(seal_binary({"cipher": "BCDE", "shift_log": [1]}, context), BINARY_KDF_OFFSET, *FORGED[name])
+    started = time.perf_counter()
+    with pytest.raises(ValueError):
+        open_bhex(blob, PASSWORD)
+    assert time.perf_counter() - started < 1.0
+
+@pytest.mark.parametrize("name", FORGED)
+def test_forged_stream_header_is_rejected_before_deriving(context, name):
+    blob = forge(b"".join(write_stream([b"chunk"], context)), STREAM_KDF_OFFSET, *FORGED[name])
+    started = time.perf_counter()
+    with pytest.raises(ValueError):
+        list(read_stream(io.BytesIO(blob), PASSWORD))
+    assert time.perf_counter() - started < 1.0
+
+def test_cost_bounds_apply_to_new_contexts():
+    for kdf, cost in FORGED.values():
+        if cost:
+            with pytest.raises(ValueError):
+                KeyContext(PASSWORD, kdf, cost)
+    with pytest.raises(ValueError):
+        opening_context(PASSWORD, KDF_PARAMS.pack(KDF_SCRYPT, MAX_COSTS[KDF_SCRYPT] + 1, bytes(16)))
+    assert KeyContext(PASSWORD, KDF_SCRYPT, 10).cost == 10
+
+def test_slow_derivation_does_not_block_the_cache(context):
+    slow = threading.Thread(target=encryption_context, args=("another password", KDF_PBKDF2, 3_000_000))
+    slow.start()
+    try:
+        time.sleep(0.05)
+        started = time.perf_counter()
+        assert encryption_context(PASSWORD, KDF_PBKDF2, 1000) is context
+        assert opening_context(PASSWORD, context.params) is context
+        elapsed = time.perf_counter() - started
+        assert slow.is_alive() and elapsed < 0.5
+    finally:
+        slow.join()
@@ -0,0 +1,55 @@
+# Run from the project root with:  python -m pytest -q tests
+# Oracle store: a legacy oracle_memory.json is imported exactly once, even
+# when several processes open the store at the same time.
+
+import json
+import multiprocessing
+
+import pytest
+
+from src.utils.oracle_store import OracleStore, get_oracle_store
+
+LEGACY_RUNS = [{"drift_score": float(i), "message_length": i} for i in range(40)]
+
+
+@pytest.fixture
+def paths(tmp_path):
+    db_path, legacy_path = tmp_path / "oracle_memory.db", tmp_path / "oracle_memory.json"
+    legacy_path.write_text(json.dumps({"runs": LEGACY_RUNS}))
+    return str(db_path), str(legacy_path)
+
+def open_and_count(db_path):
+    return get_oracle_store(db_path).count()
+
+
+def test_legacy_runs_are_imported_once(paths):
+    db_path, legacy_path = paths
+    store = OracleStore(db_path, legacy_path=legacy_path)
+    assert store.tail() == LEGACY_RUNS
+    assert store.count() == len(LEGACY_RUNS)
+    store.close()
+    # The renamed file is never picked up again
+    store = OracleStore(db_path, legacy_path=legacy_path)
+    assert store.count() == len(LEGACY_RUNS)
+    store.close()
+
+def test_missing_legacy_file_counts_as_migrated(paths):
+    db_path, legacy_path = paths
+    first = OracleStore(db_path)
+    second = OracleStore(db_path)
+    # Both saw the file before either took the lock; the loser finds it gone
+    first.migrate(legacy_path)
+    second.migrate(legacy_path)
+    assert second.count() == len(LEGACY_RUNS)
+    assert second.tail(3) == LEGACY_RUNS[-3:]
+    first.close()
+    second.close()
+
+def test_concurrent_processes_migrate_once(paths):
+    db_path, _ = paths
+    with multiprocessing.get_context("spawn").Pool(6) as pool:
+        counts = pool.map(open_and_count, [db_path] * 6)
+    assert counts == [len(LEGACY_RUNS)] * 6
+    store = OracleStore(db_path)
+    assert store.tail() == LEGACY_RUNS
+    store.close()
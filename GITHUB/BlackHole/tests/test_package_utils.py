@@ -0,0 +1,132 @@
+# Run from the project root with:  python -m pytest -q tests
+# .bhex containers: binary (BHX2), streaming (BHXS) and JSON envelopes must
+# round-trip, and any tampering or truncation must fail loudly.
+
+import io
+import json
+
+import pytest
+
+from src.utils.axiom_codec import build_symbol_table
+from src.utils.key_context import KDF_PARAMS, KDF_PBKDF2, encryption_context
+from src.utils.package_utils import (
+    BINARY_MAGIC, FORMAT_BINARY, FORMAT_JSON, FORMAT_STREAM, STREAM_MAGIC,
+    detect_format, open_bhex, open_package, read_stream, seal_binary, seal_package, write_stream
+)
+
+PASSWORD = "event horizon"
+
+
+@pytest.fixture(scope="module")
+def context():
+    # A cheap KDF cost keeps the suite fast; the container code is the same at any cost
+    return encryption_context(PASSWORD, KDF_PBKDF2, 1000)
+
+def sample_package(shift_log=(3, -5, 17, 40000)):
+    return {
+        "cipher": "BCDE XYZW QQQQ",
+        "shift_log": list(shift_log),
+        "key_hash": "abc123",
+        "created_at": "2025-01-01T00:00:00",
+        "subconscious": ["drift stable"],
+        "symbol_table": build_symbol_table([("h", "BCDE"), ("é", "XYZW"), ("黑", "unkn")])
+    }
+
+def flip(blob, offset):
+    tampered = bytearray(blob)
+    tampered[offset] ^= 0x01
+    return bytes(tampered)
+
+def stream_blob(payloads, context):
+    return b"".join(write_stream(payloads, context))
+
+
+# === Binary Envelope ===
+@pytest.mark.parametrize("shift_log", [(), (1, 2, 3), (-129, 127), (2**40, -2**40), (2**63 - 1, -2**63)])
+def test_binary_round_trip(context, shift_log):
+    package = sample_package(shift_log)
+    blob = seal_binary(package, context)
+    assert blob[:4] == BINARY_MAGIC
+    opened = open_bhex(blob, PASSWORD)
+    assert opened["cipher"] == package["cipher"]
+    assert [int(s) for s in opened["shift_log"]] == list(shift_log)
+    assert opened["key_hash"] == package["key_hash"]
+    assert opened["subconscious"] == package["subconscious"]
+    assert bytes(opened["symbol_table"]["chars"]) == package["symbol_table"]["chars"]
+    assert bytes(opened["symbol_table"]["symbols"]) == package["symbol_table"]["symbols"]
+
+def test_binary_tamper_is_rejected(context):
+    blob = seal_binary(sample_package(), context)
+    for offset in (5, 30, len(blob) // 2, len(blob) - 1):
+        with pytest.raises(ValueError):
+            open_bhex(flip(blob, offset), PASSWORD)
+    with pytest.raises(ValueError):
+        open_bhex(blob[:-1], PASSWORD)
+
+def test_binary_wrong_password_is_rejected(context):
+    blob = seal_binary(sample_package(), context)
+    with pytest.raises(ValueError):
+        open_bhex(blob, PASSWORD + "!")
+
+
+# === JSON Envelope ===
+def test_json_round_trip_and_tamper(context):
+    package = {"cipher": "BCDE", "shift_log": [1, 2, 3], "key_hash": "abc123"}
+    envelope = json.dumps(seal_package(package, context))
+    assert open_bhex(envelope.encode(), PASSWORD) == package
+    tampered = json.loads(envelope)
+    tampered["hmac"] = tampered["hmac"][::-1]
+    with pytest.raises(ValueError):
+        open_package(tampered, PASSWORD)
+
+
+# === Streaming Container ===
+STREAMS = {
+    "empty": [],
+    "single": [b"one chunk"],
+    "many": [bytes([i]) * (i * 37) for i in range(12)],
+    "large": [bytes(range(256)) * 512, b"", b"tail"]
+}
+
+@pytest.mark.parametrize("name", STREAMS)
+def test_stream_round_trip(context, name):
+    payloads = STREAMS[name]
+    blob = stream_blob(payloads, context)
+    assert blob[:4] == STREAM_MAGIC
+    assert list(read_stream(io.BytesIO(blob), PASSWORD)) == payloads
+
+def test_stream_tampered_chunk_is_rejected(context):
+    blob = stream_blob(STREAMS["many"], context)
+    for offset in (60, len(blob) // 2, len(blob) - 40):
+        with pytest.raises(ValueError):
+            list(read_stream(io.BytesIO(flip(blob, offset)), PASSWORD))
+
+def test_stream_truncation_is_rejected(context):
+    blob = stream_blob(STREAMS["many"], context)
+    # Cut mid-chunk, and drop the trailer entirely
+    for end in (len(blob) // 2, len(blob) - 41):
+        with pytest.raises(ValueError):
+            list(read_stream(io.BytesIO(blob[:end]), PASSWORD))
+
+def test_stream_chunks_cannot_be_spliced(context):
+    # Records from another stream carry a different stream id in their HMAC
+    first = stream_blob([b"alpha", b"beta"], context)
+    second = stream_blob([b"alpha", b"beta"], context)
+    header = len(STREAM_MAGIC) + 2 + 16 + KDF_PARAMS.size  # magic, version, flags, stream id, kdf
+    assert first[header:header + 1] == b"C"
+    with pytest.raises(ValueError):
+        list(read_stream(io.BytesIO(first[:header] + second[header:]), PASSWORD))
+
+def test_stream_wrong_password_is_rejected(context):
+    blob = stream_blob(STREAMS["single"], context)
+    with pytest.raises(ValueError):
+        list(read_stream(io.BytesIO(blob), PASSWORD + "!"))
+
+def test_stream_is_not_opened_as_a_single_package(context):
+    with pytest.raises(ValueError):
+        open_bhex(stream_blob(STREAMS["single"], context), PASSWORD)
+
+def test_detect_format():
+    assert detect_format(BINARY_MAGIC) == FORMAT_BINARY
+    assert detect_format(STREAM_MAGIC) == FORMAT_STREAM
+    assert detect_format(b'{"iv') == FORMAT_JSON
@@ -0,0 +1,77 @@
+# Run from the project root with:  python -m pytest -q tests
+# Vectorized drift kernels against the scalar encrypt_message /
+# decrypt_message reference implementation.
+
+import numpy as np
+import pytest
+
+from src import blackhole_v6 as bh
+from src.utils.key_context import KDF_PBKDF2, encryption_context
+
+MESSAGES = {
+    "cube_only": "abc def ghij",
+    "fibonacci": "The quick brown fox jumps over the lazy dog",
+    "special_end": "Strength under pressure holds",
+    "unicode": "Ünïcode naïve Ωmega straße 黑洞 dark",
+    "punctuation": "Drift, rotor; oracle! (phantom) [memory] __three__",
+    "single": "x",
+    "long": "Fibonacci entropy " * 2000
+}
+KEYS = {
+    "text": "event horizon",
+    "drift": encryption_context("event horizon", KDF_PBKDF2, 1000).drift_key("event horizon")
+}
+
+
+@pytest.mark.parametrize("key", KEYS)
+@pytest.mark.parametrize("name", MESSAGES)
+def test_array_encrypt_matches_scalar(name, key):
+    fibonacci = bh.generate_fibonacci_sequence(bh.FIBONACCI_DEPTH)
+    expected, expected_log = bh.encrypt_message(MESSAGES[name], fibonacci, KEYS[key])
+    encrypted, shift_log = bh.encrypt_message_array(MESSAGES[name], fibonacci, KEYS[key])
+    assert encrypted == expected
+    assert shift_log.dtype == np.int64
+    assert shift_log.tolist() == expected_log
+
+@pytest.mark.parametrize("runs", [0, 4, 11])
+def test_array_encrypt_matches_scalar_with_oracle_and_rotor(runs):
+    fibonacci = bh.generate_fibonacci_sequence(bh.FIBONACCI_DEPTH)
+    rotor = bh.RotorState(runs=runs, recent_runs=[{"drift_score": 40.5}, {"drift_score": 12.0}])
+    for bias in (-1, 0, 1):
+        oracle_bias = {"bias": bias}
+        for message in MESSAGES.values():
+            expected, expected_log = bh.encrypt_message(message, fibonacci, KEYS["text"], oracle_bias, rotor)
+            encrypted, shift_log = bh.encrypt_message_array(message, fibonacci, KEYS["text"], oracle_bias, rotor)
+            assert encrypted == expected
+            assert shift_log.tolist() == expected_log
+
+@pytest.mark.parametrize("name", MESSAGES)
+def test_array_decrypt_matches_scalar(name):
+    fibonacci = bh.generate_fibonacci_sequence(bh.FIBONACCI_DEPTH)
+    encrypted, shift_log = bh.encrypt_message(MESSAGES[name], fibonacci, KEYS["text"])
+    assert bh.decrypt_message_array(encrypted, shift_log) == bh.decrypt_message(encrypted, shift_log)
+    if MESSAGES[name].isascii():
+        # Non-ASCII letters have never survived the A-Z shift arithmetic
+        assert bh.decrypt_message_array(encrypted, np.asarray(shift_log)) == ' '.join(MESSAGES[name].split())
+
+def test_array_decrypt_handles_large_and_negative_shifts():
+    shifts = [2**62, -2**62, -1, 27, 0, 2**40 + 3]
+    text = "AbCdEf"
+    assert bh.decrypt_message_array(text, shifts) == bh.decrypt_message(text, shifts)
+
+def test_cube_shift_vector_matches_apply_shift_formula():
+    for y in (1, 6, 11):
+        for cube_mod, shift_mod in ((0, 0), (3, 2), (7, 1)):
+            expected = [bh.apply_shift_formula((y + i + shift_mod) ** 3, cube_mod) for i in range(500)]
+            assert bh.cube_shift_vector(500, y, cube_mod, shift_mod).tolist() == expected
+
+def test_boundary_blur_triggers_on_the_top_residue():
+    fibonacci = bh.generate_fibonacci_sequence(bh.FIBONACCI_DEPTH)
+    encrypted, shift_log = bh.encrypt_message(MESSAGES["fibonacci"], fibonacci, KEYS["text"])
+    blurred, triggered = bh.inject_boundary_blur(encrypted, shift_log)
+    assert triggered and blurred != encrypted
+    assert blurred[len(encrypted) // 2:] == encrypted[len(encrypted) // 2:]
+    # Raw cube shifts count by the rotation they apply, not their size
+    assert bh.inject_boundary_blur("abcd", [26, 52, 27, 0]) == ("abcd", False)
+    assert bh.inject_boundary_blur("abcd", [51, 0, 0, 0])[1]
+    assert bh.inject_boundary_blur("", []) == ("", False)
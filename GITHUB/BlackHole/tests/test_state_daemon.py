@@ -0,0 +1,69 @@
+# Run from the project root with:  python -m pytest -q tests
+# State daemon authentication: the daemon never listens without a shared
+# key, and a client with the wrong key is turned away without taking the
+# daemon down for everyone else.
+
+import os
+import stat
+import sys
+from multiprocessing import AuthenticationError
+
+import pytest
+
+from src.state_daemon import AUTHKEY_ENV, StateClient, StateDaemon
+
+AUTHKEY = "correct horse battery staple"
+
+pytestmark = pytest.mark.skipif(sys.platform == "win32", reason="Unix socket paths")
+
+
+@pytest.fixture
+def daemon(tmp_path):
+    daemon = StateDaemon(str(tmp_path / "state.sock"), str(tmp_path / "oracle.db"), str(tmp_path / "parasite.json"), authkey=AUTHKEY)
+    daemon.start()
+    yield daemon
+    daemon.stop()
+
+def commit_runs(client, count):
+    for i in range(count):
+        client.commit({"drift_score": float(i)}, {"run": i}, float(i), i)
+    client.flush()
+
+
+def test_missing_authkey_is_rejected(tmp_path, monkeypatch):
+    monkeypatch.delenv(AUTHKEY_ENV, raising=False)
+    with pytest.raises(ValueError):
+        StateDaemon(str(tmp_path / "state.sock"), str(tmp_path / "oracle.db"), str(tmp_path / "parasite.json"))
+    assert not (tmp_path / "state.sock").exists()
+    with pytest.raises(ValueError):
+        StateClient(str(tmp_path / "state.sock"))
+
+def test_socket_is_private(daemon):
+    assert stat.S_IMODE(os.stat(daemon.address).st_mode) == 0o600
+
+def test_wrong_authkey_is_rejected_and_daemon_keeps_serving(daemon):
+    client = StateClient(daemon.address, authkey=AUTHKEY)
+    commit_runs(client, 3)
+    for wrong in (AUTHKEY + "!", b"", "x"):
+        with pytest.raises((AuthenticationError, ValueError)):
+            StateClient(daemon.address, authkey=wrong)
+    commit_runs(client, 2)
+    assert client.oracle_window()["total_runs"] == 5
+    late = StateClient(daemon.address, authkey=AUTHKEY)
+    assert late.oracle_window()["total_runs"] == 5
+    late.close()
+    client.close()
+
+def test_authkey_from_environment(tmp_path, monkeypatch):
+    monkeypatch.setenv(AUTHKEY_ENV, AUTHKEY)
+    daemon = StateDaemon(str(tmp_path / "state.sock"), str(tmp_path / "oracle.db"), str(tmp_path / "parasite.json"))
+    daemon.start()
+    try:
+        client = StateClient(daemon.address)
+        commit_runs(client, 1)
+        assert client.oracle_window()["total_runs"] == 1
+        client.close()
+        with pytest.raises(AuthenticationError):
+            StateClient(daemon.address, authkey="other")
+    finally:
+        daemon.stop()
@@ -0,0 +1,127 @@
+# Run from the project root with:  python -m pytest -q tests
+# Pipeline tracing: sinks receive log and span records, a tracer without
+# sinks does no formatting at all, and the engine times each stage.
+
+import io
+import json
+
+import pytest
+
+from src import blackhole_v6 as bh
+from src.utils import trace
+from src.utils.key_context import KDF_PBKDF2
+from src.utils.trace import PREVIEW_CHARS, JsonLinesSink, PrintSink, RingBufferSink, Tracer, render
+
+ENCRYPT_STAGES = {"keys", "drift", "axiomcore", "blur", "foam", "fractal", "state", "packaging"}
+
+
+class Exploding:
+    def __str__(self):
+        raise AssertionError("formatted while tracing was off")
+
+    __repr__ = __str__
+
+
+@pytest.fixture
+def ring():
+    # Attached to the global tracer the engine uses, and always detached again
+    ring = trace.tracer.add_sink(RingBufferSink())
+    yield ring
+    trace.tracer.remove_sink(ring)
+
+
+def test_disabled_tracer_does_no_work():
+    tracer = Tracer()
+    assert not tracer.enabled
+    tracer.log("value %s", Exploding())
+    with tracer.span("stage", chars=3) as s:
+        s.set(extra=1)
+    assert s is trace._NULL_SPAN
+
+def test_ring_buffer_keeps_the_newest_records():
+    tracer = Tracer()
+    ring = tracer.add_sink(RingBufferSink(size=3))
+    for i in range(5):
+        tracer.log("run %d", i)
+    with tracer.span("foam", chars=7) as s:
+        s.set(drawn=7)
+    assert [r["msg"] for r in list(ring.records)[:2]] == ["run 3", "run 4"]
+    (record,) = ring.spans("foam")
+    assert record["fields"] == {"chars": 7, "drawn": 7} and record["ms"] >= 0
+    assert ring.spans("fractal") == []
+    ring.clear()
+    assert not ring.records
+
+def test_span_records_errors_and_reraises():
+    tracer = Tracer()
+    ring = tracer.add_sink(RingBufferSink())
+    with pytest.raises(KeyError):
+        with tracer.span("state"):
+            raise KeyError("x")
+    assert ring.spans("state")[0]["fields"] == {"error": "KeyError"}
+
+def test_json_lines_sink(tmp_path):
+    path = tmp_path / "trace.jsonl"
+    tracer = Tracer()
+    sink = tracer.add_sink(JsonLinesSink(str(path)))
+    tracer.log("drift %s", "Ωmega")
+    with tracer.span("packaging", bytes=12):
+        pass
+    tracer.remove_sink(sink)
+    assert sink.file.closed and not tracer.enabled
+    records = [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+    assert [r["type"] for r in records] == ["log", "span"]
+    assert records[0]["msg"] == "drift Ωmega"
+    assert records[1]["name"] == "packaging" and records[1]["fields"] == {"bytes": 12}
+    # A caller's file object is written to but left open
+    buffer = io.StringIO()
+    sink = tracer.add_sink(JsonLinesSink(buffer))
+    tracer.log("kept open")
+    tracer.remove_sink(sink)
+    assert not buffer.closed and json.loads(buffer.getvalue())["msg"] == "kept open"
+
+def test_print_sink_and_set_debug(capsys):
+    assert not any(isinstance(s, PrintSink) for s in trace.tracer.sinks)
+    trace.set_debug(True)
+    trace.set_debug(True)
+    try:
+        assert sum(isinstance(s, PrintSink) for s in trace.tracer.sinks) == 1
+        trace.log_debug("[ORACLE] %s", "stable")
+        with trace.span("blur", chars=4):
+            pass
+    finally:
+        trace.set_debug(False)
+    lines = capsys.readouterr().out.splitlines()
+    assert lines[0].startswith("[DEBUG] ") and lines[0].endswith(" - [ORACLE] stable")
+    assert "[SPAN] blur " in lines[1] and lines[1].endswith(" ms chars=4")
+    assert not trace.tracer.enabled
+
+def test_long_arguments_are_clipped():
+    text = render("cipher %s (%d)", ("x" * 10_000, 5))
+    assert text.startswith("cipher " + "x" * PREVIEW_CHARS + "...") and "(10000 chars)" in text
+    assert text.endswith("(5)")
+    assert render("no args %s", ()) == "no args %s"
+
+def test_configure_from_env(tmp_path, monkeypatch):
+    path = tmp_path / "env.jsonl"
+    monkeypatch.setenv(trace.TRACE_ENV, str(path))
+    trace.configure_from_env()
+    sink = trace.tracer.sinks[-1]
+    try:
+        assert isinstance(sink, JsonLinesSink)
+        trace.log_debug("from env")
+    finally:
+        trace.tracer.remove_sink(sink)
+    assert json.loads(path.read_text(encoding="utf-8"))["msg"] == "from env"
+    monkeypatch.setenv(trace.TRACE_ENV, "0")
+    trace.configure_from_env()
+    assert not trace.tracer.enabled
+
+def test_engine_emits_a_span_per_stage(tmp_path, ring):
+    engine = bh.Engine(str(tmp_path / "oracle_memory.db"), str(tmp_path / "parasite_memory.json"),
+                       kdf=KDF_PBKDF2, kdf_cost=1000)
+    package = engine.encrypt("Hello World", "event horizon")
+    assert ENCRYPT_STAGES <= {r["name"] for r in ring.spans()}
+    ring.clear()
+    engine.decrypt(package, "event horizon")
+    assert {"open", "axiomcore_decode", "unshift"} <= {r["name"] for r in ring.spans()}